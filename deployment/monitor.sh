@@ -7,7 +7,9 @@ RED='\033[0;31m'
 BLUE='\033[0;34m'
 NC='\033[0m'
 
-STATUS_FILE="/opt/nerdy-holder/nerdy_status.json"
+DIR="/opt/nerdy-holder"
+STATUS_BLOCK="/dev/shm/nerdy_status"
+STATUS_FILE="$DIR/nerdy_status.json"
 PARAMS_FILE="/opt/nerdy-holder/nerdy_params.json"
 
 clear
@@ -55,15 +57,24 @@ echo -e "${BLUE}═════════════════════
 echo -e "${BLUE}Holder Status${NC}"
 echo -e "${BLUE}════════════════════════════════════════════════════════════════${NC}"
 
-if [ -f "$STATUS_FILE" ]; then
-    # Parse JSON with python
-    python3 << EOF
+# Shared-memory status block (consistent snapshot), JSON file as fallback
+python3 << EOF
 import json
 import sys
 
+sys.path.insert(0, '$DIR')
+
+status = None
+try:
+    from nerdy_holder.status import StatusReader
+    status = StatusReader('$STATUS_BLOCK').read()
+except Exception:
+    pass
+
 try:
-    with open('$STATUS_FILE', 'r') as f:
-        status = json.load(f)
+    if status is None:
+        with open('$STATUS_FILE', 'r') as f:
+            status = json.load(f)
 
     target = status.get('current_target', 0)
     system_mem = status.get('system_memory', 0)
@@ -99,15 +110,13 @@ try:
     print(f"    Block rate:    {perf.get('block_rate', 0):.1%}")
     print(f"    Score:         {perf.get('score', 0):.1f}")
 
+except FileNotFoundError:
+    print("  \\033[91mNo status block ($STATUS_BLOCK) or file ($STATUS_FILE)\\033[0m")
 except Exception as e:
-    print(f"  Failed to parse status file: {e}", file=sys.stderr)
+    print(f"  Failed to read status: {e}", file=sys.stderr)
     sys.exit(1)
 EOF
 
-else
-    echo -e "  ${RED}Status file not found: $STATUS_FILE${NC}"
-fi
-
 echo
 echo -e "${BLUE}════════════════════════════════════════════════════════════════${NC}"
 echo -e "${BLUE}Parameters${NC}"
@@ -156,14 +156,19 @@ if systemctl is-active --quiet nerdy-holder.service; then
     echo
 
     # Show current status
-    if [ -f "$DIR/nerdy_status.json" ]; then
+    if [ -f /dev/shm/nerdy_status ] || [ -f "$DIR/nerdy_status.json" ]; then
         sleep 1
         echo -e "${Y}Current status:${NC}"
         python3 << 'PYEOF'
 import json
+import sys
+sys.path.insert(0, '/opt/nerdy-holder')
 try:
-    with open('/opt/nerdy-holder/nerdy_status.json', 'r') as f:
-        s = json.load(f)
+    from nerdy_holder.status import StatusReader
+    s = StatusReader('/dev/shm/nerdy_status').read()
+    if s is None:
+        with open('/opt/nerdy-holder/nerdy_status.json', 'r') as f:
+            s = json.load(f)
     print(f"  System memory: {s.get('system_memory', 0):.1f}%")
     print(f"  Holding:       {s.get('holding_mb', 0):.0f}MB")
     print(f"  Optimizations: {s.get('stats', {}).get('optimizations', 0)}")
@@ -0,0 +1,6 @@
+"""控制接口模块"""
+
+from .server import ControlServer, CONTROL_SOCKET
+from .client import ControlClient
+
+__all__ = ['ControlServer', 'ControlClient', 'CONTROL_SOCKET']
@@ -0,0 +1,46 @@
+"""控制接口客户端"""
+
+import json
+import socket
+
+from .server import CONTROL_SOCKET, encode
+
+
+class ControlClient:
+    """控制客户端 - 一个连接上顺序发送请求"""
+
+    def __init__(self, path=CONTROL_SOCKET, timeout=10.0):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(path)
+        self.lines = self.sock.makefile('rb')
+
+    def _read(self):
+        line = self.lines.readline()
+        if not line:
+            raise ConnectionError("控制连接已关闭")
+        return json.loads(line)
+
+    def request(self, cmd, **args):
+        """发送请求并等待应答"""
+        self.sock.sendall(encode(dict(args, cmd=cmd)))
+        return self._read()
+
+    def subscribe(self):
+        """订阅事件，逐个产出（该连接此后只能读取事件）"""
+        self.sock.settimeout(None)
+        reply = self.request('subscribe')
+        if not reply.get('ok'):
+            raise ConnectionError(reply.get('error'))
+        while True:
+            yield self._read()
+
+    def close(self):
+        self.lines.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
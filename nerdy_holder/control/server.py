@@ -0,0 +1,170 @@
+"""控制接口 - Unix socket 上逐行JSON(NDJSON)请求/应答，以及决策事件推送
+
+请求: {"cmd": "status"}
+      {"cmd": "set_target", "value": 80}          指标原生单位，切到固定目标
+      {"cmd": "set_range", "low": 70, "high": 85}  切到动态范围
+      {"cmd": "set_tolerance", "value": 0.5}
+      {"cmd": "release", "mb": 1024}               立即释放，绕过决策
+      {"cmd": "hold", "mb": 1024}                  立即追加持有
+      {"cmd": "subscribe"}                         之后该连接只推送事件
+应答: {"ok": true, ...} / {"ok": false, "error": "..."}
+"""
+
+import os
+import json
+import queue
+import socket
+import threading
+
+CONTROL_SOCKET = 'nerdy_control.sock'
+SUBSCRIBER_QUEUE = 1024
+
+
+def encode(message):
+    return (json.dumps(message, ensure_ascii=False) + '\n').encode()
+
+
+def socket_alive(path, kind=socket.SOCK_STREAM):
+    """路径上是否有进程在监听（遗留的socket文件连接会被拒绝）"""
+    with socket.socket(socket.AF_UNIX, kind) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+class ControlServer:
+    """控制服务 - 每个连接一个线程，订阅者各自一个有界事件队列"""
+
+    def __init__(self, holder, path=CONTROL_SOCKET):
+        self.holder = holder
+        self.path = path
+        if os.path.exists(path):
+            if socket_alive(path):
+                raise RuntimeError(f"控制socket正在使用: {path}")
+            os.remove(path)
+
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # 可以分配/释放内存，只允许属主连接：bind时即为0600，不留bind到chmod之间的窗口
+        umask = os.umask(0o177)
+        try:
+            self.sock.bind(path)
+        finally:
+            os.umask(umask)
+        os.chmod(path, 0o600)
+        self.sock.listen(8)
+        # 关闭时只删除自己绑定的socket（路径可能已被继任进程重新绑定）
+        self.inode = os.stat(path).st_ino
+
+        self.subscribers = []
+        self.lock = threading.Lock()
+        self.dropped_events = 0
+        self.running = True
+
+        self.thread = threading.Thread(target=self._accept, name='nerdy-control', daemon=True)
+        self.thread.start()
+
+    def _accept(self):
+        while self.running:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        try:
+            with conn, conn.makefile('rb') as lines:
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line)
+                        if request.get('cmd') == 'subscribe':
+                            self._stream(conn)
+                            return
+                        reply = self.handle(request)
+                    except Exception as e:
+                        reply = {'ok': False, 'error': str(e)}
+                    conn.sendall(encode(reply))
+        except OSError:
+            pass
+
+    def handle(self, request):
+        """执行一条请求，返回应答"""
+        holder = self.holder
+        cmd = request.get('cmd')
+
+        if cmd == 'status':
+            return {'ok': True, 'status': holder.build_status()}
+        if cmd == 'set_target':
+            holder.set_target(float(request['value']))
+            return {'ok': True, 'target': holder.current_target}
+        if cmd == 'set_range':
+            holder.set_range(float(request['low']), float(request['high']))
+            return {'ok': True, 'min_target': holder.min_target, 'max_target': holder.max_target,
+                    'target': holder.current_target}
+        if cmd == 'set_tolerance':
+            holder.set_tolerance(float(request['value']))
+            return {'ok': True, 'tolerance': holder.optimizer.params['tolerance']}
+        if cmd == 'release':
+            released = holder.force_release(float(request['mb']))
+            return {'ok': True, 'released_mb': released, 'holding_mb': holder.get_holding_mb()}
+        if cmd == 'hold':
+            allocated = holder.force_hold(int(request['mb']))
+            return {'ok': True, 'allocated_mb': allocated, 'holding_mb': holder.get_holding_mb()}
+        raise ValueError(f"未知命令: {cmd}")
+
+    def _stream(self, conn):
+        """订阅：推送事件直至对端关闭"""
+        events = queue.Queue(SUBSCRIBER_QUEUE)
+        with self.lock:
+            self.subscribers.append(events)
+        try:
+            conn.sendall(encode({'ok': True, 'subscribed': True}))
+            while self.running:
+                event = events.get()
+                if event is None:
+                    break
+                conn.sendall(encode(event))
+        except OSError:
+            pass
+        finally:
+            with self.lock:
+                self.subscribers.remove(events)
+
+    def publish(self, event):
+        """推送事件；订阅者跟不上时丢弃最旧的"""
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for events in subscribers:
+            try:
+                events.put_nowait(event)
+            except queue.Full:
+                self.dropped_events += 1
+                try:
+                    events.get_nowait()
+                    events.put_nowait(event)
+                except (queue.Empty, queue.Full):
+                    pass
+
+    def close(self):
+        """关闭监听和全部订阅"""
+        self.running = False
+        with self.lock:
+            for events in self.subscribers:
+                try:
+                    events.put_nowait(None)
+                except queue.Full:
+                    pass
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+        try:
+            if os.stat(self.path).st_ino == self.inode:
+                os.remove(self.path)
+        except FileNotFoundError:
+            pass
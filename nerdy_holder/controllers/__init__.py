@@ -2,5 +2,6 @@
 
 from .pid import EnhancedPIDController
 from .response import UnifiedResponseCalculator
+from .scheduler import TickScheduler
 
-__all__ = ['EnhancedPIDController', 'UnifiedResponseCalculator']
+__all__ = ['EnhancedPIDController', 'UnifiedResponseCalculator', 'TickScheduler']
@@ -6,7 +6,9 @@ import time
 class EnhancedPIDController:
     """增强型PID控制器 - 非对称策略"""
 
-    def __init__(self, Kp=2.2, Ki=0.25, Kd=0.6, target=80):
+    def __init__(self, Kp=2.2, Ki=0.25, Kd=0.6, target=80, clock=time):
+        # 时钟：默认系统时间，模拟时注入虚拟时钟
+        self.clock = clock
         self.Kp = Kp
         self.Ki = Ki
         self.Kd = Kd
@@ -14,23 +16,39 @@ class EnhancedPIDController:
 
         self.integral = 0
         self.last_error = 0
-        self.last_time = time.time()
+        self.last_time = clock.time()
 
         self.integral_max = 40
         self.integral_min = -40
 
         # 动作追踪
         self.last_action = None
-        self.action_change_time = time.time()
+        self.action_change_time = clock.time()
 
     def set_target(self, target):
         """更新目标"""
         self.target = target
         self.integral = 0
 
+    def get_state(self):
+        """导出运行状态"""
+        return {
+            'integral': self.integral,
+            'last_error': self.last_error,
+            'last_time': self.last_time,
+            'last_action': self.last_action,
+            'action_change_time': self.action_change_time
+        }
+
+    def load_state(self, state):
+        """恢复运行状态"""
+        for key in ('integral', 'last_error', 'last_time', 'last_action', 'action_change_time'):
+            if key in state:
+                setattr(self, key, state[key])
+
     def compute(self, current_value):
         """计算PID输出 - 非对称积分恢复"""
-        current_time = time.time()
+        current_time = self.clock.time()
         dt = max(0.1, current_time - self.last_time)
 
         error = self.target - current_value
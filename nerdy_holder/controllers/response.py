@@ -7,7 +7,8 @@ import math
 class UnifiedResponseCalculator:
     """统一响应计算器 - 非对称优化版"""
 
-    def __init__(self, total_memory_bytes):
+    def __init__(self, total_memory_bytes, clock=time):
+        self.clock = clock
         self.total_memory_bytes = total_memory_bytes
         self.total_memory_mb = total_memory_bytes / (1024*1024)
 
@@ -28,11 +29,29 @@ class UnifiedResponseCalculator:
 
         self.large_adj_threshold = 3000
 
-        self.last_adjustment_time = time.time()
+        # ★ 回收压力（0~1）：高压时释放更快，分配更谨慎
+        self.pressure_urgent_release = 0.7   # 释放：超过即紧急通过
+        self.pressure_block_allocate = 0.5   # 分配：超过即阻止
+
+        self.last_adjustment_time = clock.time()
         self.last_adjustment_size = 0
         self.last_was_release = False  # 追踪上次是否是释放
 
-    def calculate_response_size(self, error, pid_output, momentum, volatility):
+    def get_state(self):
+        """导出运行状态"""
+        return {
+            'last_adjustment_time': self.last_adjustment_time,
+            'last_adjustment_size': self.last_adjustment_size,
+            'last_was_release': self.last_was_release
+        }
+
+    def load_state(self, state):
+        """恢复运行状态"""
+        for key in ('last_adjustment_time', 'last_adjustment_size', 'last_was_release'):
+            if key in state:
+                setattr(self, key, state[key])
+
+    def calculate_response_size(self, error, pid_output, momentum, volatility, pressure=0.0):
         """核心方法：统一计算响应大小"""
 
         # 判断操作类型
@@ -67,15 +86,22 @@ class UnifiedResponseCalculator:
         volatility_factor = 1.0 / (1.0 + volatility / 15)
         volatility_factor = max(0.8, min(1.0, volatility_factor))
 
-        # 6. 统一计算
+        # 6. 回收压力修正
+        if is_release:
+            pressure_factor = 1.0 + pressure
+        else:
+            pressure_factor = 1.0 - 0.5 * pressure
+
+        # 7. 统一计算
         response_mb = (base_mb *
                       self.response_base *
                       urgency_factor *
                       pid_factor *
                       momentum_factor *
-                      volatility_factor)
+                      volatility_factor *
+                      pressure_factor)
 
-        # 7. 平滑限制
+        # 8. 平滑限制
         if abs(error) > 15:
             response_mb = max(1000, min(10000, response_mb))
         elif abs(error) > 8:
@@ -87,12 +113,53 @@ class UnifiedResponseCalculator:
 
         return response_mb
 
-    def should_adjust(self, error, response_mb, volatility):
+    def remaining_interval(self, error):
+        """距间隔保护解除的剩余秒数（误差大到不受保护时为0）"""
+        is_release = error > 0
+        protection_threshold = 6 if is_release else 10
+        if abs(error) >= protection_threshold:
+            return 0
+
+        large = self.last_adjustment_size > self.large_adj_threshold
+        if is_release:
+            min_interval = self.large_adj_interval_release if large else self.base_min_interval_release
+        else:
+            min_interval = self.large_adj_interval_allocate if large else self.base_min_interval_allocate
+
+        return max(0, min_interval - (self.clock.time() - self.last_adjustment_time))
+
+    def should_adjust(self, error, response_mb, volatility, pressure=0.0):
         """统一的调整决策 - 非对称策略"""
-        now = time.time()
+        now = self.clock.time()
         time_since_last = now - self.last_adjustment_time
 
         is_release = error > 0  # 需要释放内存
+        pressure = max(0.0, min(1.0, pressure))
+
+        # ★ 回收压力紧急释放
+        if is_release and pressure >= self.pressure_urgent_release:
+            self.last_adjustment_time = now
+            self.last_adjustment_size = response_mb
+            self.last_was_release = True
+            return {
+                'should_adjust': True,
+                'ratio': 999,
+                'threshold': 0,
+                'benefit': 999,
+                'cost': 0,
+                'reason': f"🔴 压力释放: 压力{pressure:.2f}"
+            }
+
+        # ★ 回收压力下暂停分配
+        if not is_release and pressure >= self.pressure_block_allocate:
+            return {
+                'should_adjust': False,
+                'ratio': 0,
+                'threshold': 0,
+                'benefit': 0,
+                'cost': 999,
+                'reason': f"🟡压力保护: 压力{pressure:.2f}"
+            }
 
         # ★ 释放紧急判断 - 误差>8%直接通过
         if is_release and abs(error) > 8:
@@ -120,6 +187,10 @@ class UnifiedResponseCalculator:
             else:
                 min_interval = self.base_min_interval_allocate
 
+        # 压力越高释放间隔越短
+        if is_release:
+            min_interval *= 1.0 - 0.5 * pressure
+
         # 间隔保护（释放几乎不保护）
         if time_since_last < min_interval:
             protection_threshold = 6 if is_release else 10  # 释放：6%才保护，分配：10%
@@ -185,6 +256,12 @@ class UnifiedResponseCalculator:
             else:
                 threshold = 1.3
 
+        # 压力修正阈值：释放降低，分配提高
+        if is_release:
+            threshold *= 1.0 - 0.5 * pressure
+        else:
+            threshold *= 1.0 + pressure
+
         ratio = benefit / max(0.1, cost)
         decision = ratio > threshold
 
@@ -0,0 +1,70 @@
+"""自适应节拍调度 - 按误差、波动、动量和平静时长选择下一次唤醒间隔"""
+
+
+class TickScheduler:
+    """节拍调度器 - 远离目标时约100ms，稳定后拉长到10~30s"""
+
+    def __init__(self, min_interval=0.1, max_interval=30.0, base_interval=3.0,
+                 settle_seconds=60.0, idle_after=3):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.base_interval = base_interval
+        self.settle_seconds = settle_seconds   # 每平静这么久，间隔再加一个基准
+        self.idle_after = idle_after           # 连续多少轮容差内视为空闲
+
+        self.interval = base_interval
+        self.quiet_ticks = 0
+        self.idle_ticks = 0
+
+    @property
+    def idle(self):
+        """空闲轮：跳过追踪器记录和参数优化"""
+        return self.quiet_ticks >= self.idle_after
+
+    def observe(self, in_tolerance):
+        """记录本轮是否在容差内"""
+        if in_tolerance:
+            if self.idle:
+                self.idle_ticks += 1
+            self.quiet_ticks += 1
+        else:
+            self.quiet_ticks = 0
+
+    def next_interval(self, error, tolerance, volatility=0, momentum=0,
+                      since_adjust=0, hold_off=0):
+        """下一次唤醒间隔(秒)
+
+        hold_off: 响应计算器的间隔保护剩余时间，提前醒来只会被阻止
+        """
+        excess = abs(error) / max(tolerance, 1e-3)
+
+        if excess > 1:
+            # 偏离越大越快
+            interval = self.base_interval / excess
+        else:
+            # 容差内：随平静时长拉长，越靠近容差边缘越短
+            interval = self.base_interval * (1 + since_adjust / self.settle_seconds)
+            interval *= 1 - 0.5 * excess
+
+        # 波动和动量大时缩短
+        interval /= 1 + volatility / 2 + abs(momentum) / 5
+
+        if excess > 1:
+            interval = max(interval, hold_off)
+
+        self.interval = max(self.min_interval, min(self.max_interval, interval))
+        return self.interval
+
+    def get_state(self):
+        """导出运行状态"""
+        return {
+            'interval': self.interval,
+            'quiet_ticks': self.quiet_ticks,
+            'idle_ticks': self.idle_ticks
+        }
+
+    def load_state(self, state):
+        """恢复运行状态"""
+        for key in ('interval', 'quiet_ticks', 'idle_ticks'):
+            if key in state:
+                setattr(self, key, state[key])
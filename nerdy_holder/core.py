@@ -2,39 +2,82 @@
 
 import os
 import time
-import psutil
 import random
 import json
 import math
 from datetime import datetime
 from collections import deque
 
-from .controllers import EnhancedPIDController, UnifiedResponseCalculator
+from .controllers import EnhancedPIDController, UnifiedResponseCalculator, TickScheduler
 from .predictors import AdaptiveEMAPredictor
-from .optimizers import ParameterOptimizer
-from .trackers import PerformanceTracker
-from .memory import MemoryChunk
+from .optimizers import get_optimizer, ShadowPool
+from .trackers import PerformanceTracker, TraceRecorder
+from .runtime import (
+    HandoverServer, AsyncHolderRuntime, EmergencyWatchdog, take_over,
+    set_oom_score_adj, get_oom_score_adj
+)
+from .sensors import get_sensor, get_waker, PressureSensor
+from .status import StatusWriter, STATUS_BLOCK
+from .control import ControlServer
+from .memory import (
+    MemoryChunk, ChunkLedger, ParallelPrefaulter, BackgroundActuator, get_backend,
+    get_rss_bytes, thp_status, get_anon_huge_bytes
+)
 
 
 class NerdyHolderPro:
     """Nerdy Holder Pro 🤓☝"""
 
-    def __init__(self, enable_benchmark=True, fixed_target=None, dynamic_range=None):
-        # 系统信息
-        mem = psutil.virtual_memory()
-        self.total_gb = mem.total / (1024**3)
-        self.total_bytes = mem.total
-
-        # 目标设置
+    def __init__(self, enable_benchmark=True, fixed_target=None, dynamic_range=None,
+                 backend='bytearray', commit_method='stride',
+                 prefault_workers=None, prefault_rate=None, fill_policy='zero',
+                 handover_socket=None, takeover_socket=None, sensor='used', waker=None,
+                 runtime='sync', slice_budget=None, watchdog=False, watchdog_floor_mb=None,
+                 watchdog_psi_full=10.0, oom_score_adj=None, status_block=STATUS_BLOCK,
+                 status_json=False, control_socket=None, config_file='nerdy_params.json',
+                 pressure=None, clock=None, rng=None, trace_file=None, optimizer=None,
+                 max_error=None, shadows=0):
+        # 时钟与随机源：默认系统时间和全局random，模拟时注入虚拟时钟和带种子的Random
+        self.clock = clock or time
+        self.rng = rng or random
+
+        # 交接socket与接管socket相同时会在接管前删掉旧进程的socket再连上自己
+        if handover_socket and takeover_socket and os.path.abspath(handover_socket) == os.path.abspath(takeover_socket):
+            raise ValueError(f"交接socket不能与接管socket相同: {handover_socket}")
+
+        # 系统信息：每轮采样一次，本轮所有读者共享快照
+        self.sensor = get_sensor(sensor)
+        self.total_gb = self.sensor.total / (1024**3)
+        # 控制刻度：1% 误差对应的字节数/100
+        self.total_bytes = self.sensor.scale_bytes
+
+        # 回收压力：高压时视为超出目标 pressure_bias 个百分点
+        self.pressure = pressure or PressureSensor()
+        self.pressure_bias = 5.0
+
+        # 唤醒源：PSI触发器在内存压力出现时立即唤醒主循环，否则等待超时
+        self.waker = get_waker(waker)
+
+        # 节拍调度：有PSI唤醒兜底时可以睡得更久
+        self.scheduler = TickScheduler(max_interval=30 if self.waker.event_driven else 10)
+        self.last_error = 0
+        self.cpu_start = time.process_time()
+
+        # 运行时：sync为单循环，async为并发任务（见 runtime/async_runtime.py）
+        self.runtime = runtime
+
+        # 目标设置（以指标原生单位给出，换算到控制刻度）
         if fixed_target:
+            fixed_target = self.sensor.to_percent(fixed_target)
             self.min_target = fixed_target
             self.max_target = fixed_target
             self.current_target = fixed_target
             self.test_mode = True
         elif dynamic_range:
-            self.min_target = dynamic_range[0]
-            self.max_target = dynamic_range[1]
-            self.current_target = (dynamic_range[0] + dynamic_range[1]) / 2
+            low, high = sorted(self.sensor.to_percent(x) for x in dynamic_range)
+            self.min_target = low
+            self.max_target = high
+            self.current_target = (low + high) / 2
             self.test_mode = False
         else:
             self.min_target = 25
@@ -43,10 +86,42 @@ class NerdyHolderPro:
             self.test_mode = False
 
         # 内存块
-        self.chunks = []
-
-        # 参数优化器
-        self.optimizer = ParameterOptimizer()
+        self.ledger = ChunkLedger()
+        # shm在线交接：旧进程仍持有目录锁，交接时传来
+        options = {'lock': False} if backend == 'shm' and takeover_socket else {}
+        self.backend = get_backend(backend, **options)
+        self.commit_method = commit_method
+        self.fill_policy = fill_policy
+        self.fill_rates = deque(maxlen=20)
+        self.release_latencies = deque(maxlen=50)
+        self.last_commit_check = None
+        self.thp = thp_status()
+        # 大页支撑量读 smaps_rollup（遍历页表，代价随RSS增长）：仅大页后端读取，低频刷新
+        self.anon_huge_mb = 0.0
+        self.anon_huge_refreshed = None
+        self.anon_huge_interval = 5.0
+
+        # 并行预提交：大块分配分段交给线程池
+        self.prefaulter = ParallelPrefaulter(prefault_workers, prefault_rate)
+        self.parallel_threshold_mb = 1000
+
+        # 后台分片分配：每片不超过 slice_budget 秒，片间可中止（None为一次性阻塞分配）
+        self.actuator = BackgroundActuator(self, slice_budget) if slice_budget else None
+
+        # 紧急释放看门狗：越过可用内存硬下限/PSI full上限时直接释放
+        self.watchdog = EmergencyWatchdog(self, watchdog_floor_mb, watchdog_psi_full) if watchdog else None
+        # 下限要低于最高目标处的可用内存，否则达标即越线
+        self.watchdog_clamped = None
+        if self.watchdog:
+            target_available_mb = self.total_bytes * (1 - self.max_target / 100) / (1024*1024)
+            self.watchdog_clamped = self.watchdog.fit_target(target_available_mb)
+        self.oom_score_adj = oom_score_adj
+
+        # 参数优化器：random为随机探索，bayesian为代理模型探索（max_error为其安全约束）
+        options = {'config_file': config_file, 'clock': self.clock, 'rng': self.rng}
+        if optimizer == 'bayesian' and max_error is not None:
+            options['max_error'] = max_error
+        self.optimizer = get_optimizer(optimizer, **options)
 
         # 算法组件
         self.ema_predictor = AdaptiveEMAPredictor(
@@ -58,39 +133,63 @@ class NerdyHolderPro:
             self.optimizer.params['pid_kp'],
             self.optimizer.params['pid_ki'],
             self.optimizer.params['pid_kd'],
-            self.current_target
+            self.current_target,
+            self.clock
         )
 
-        self.response_calculator = UnifiedResponseCalculator(self.total_bytes)
-        self.response_calculator.response_base = self.optimizer.params['response_base']
-        self.response_calculator.response_curve = self.optimizer.params['response_curve']
-        self.response_calculator.urgency_threshold = self.optimizer.params['urgency_threshold']
-        self.response_calculator.cost_decay_release = self.optimizer.params['cost_decay_release']
-        self.response_calculator.cost_decay_allocate = self.optimizer.params['cost_decay_allocate']
-        self.response_calculator.base_min_interval_release = self.optimizer.params['min_interval_release']
-        self.response_calculator.base_min_interval_allocate = self.optimizer.params['min_interval_allocate']
+        self.response_calculator = UnifiedResponseCalculator(self.total_bytes, self.clock)
+        self.apply_params()
+
+        # 影子控制器：候选参数只计算不执行，胜出者提升为现参数（代替线上探索）
+        self.shadows = ShadowPool(self, shadows) if shadows else None
 
-        self.performance_tracker = PerformanceTracker()
+        self.performance_tracker = PerformanceTracker(self.clock)
 
         # 历史数据
         self.memory_history = deque(maxlen=100)
 
-        # Benchmark支持
+        # 轨迹记录：每次读数连同持有量写入文件，供离线回放（见 simulation/replay.py）
+        self.trace = TraceRecorder(trace_file, self.total_bytes / (1024*1024)) if trace_file else None
+
+        # Benchmark支持：共享内存状态块（读者映射后直接读），JSON为可选慢路径
         self.enable_benchmark = enable_benchmark
+        self.status_block = status_block
+        self.status_writer = None
+        self.status_json = status_json
         self.status_file = 'nerdy_status.json'
+        self.export_interval = 0.1
+        self.idle_export_interval = 1.0     # 两轮之间的刷新周期（长节拍时不每100ms唤醒）
+        self.last_json_export = 0
 
         # 统计
         self.stats = {
-            'start_time': datetime.now(),
+            'start_time': self.now(),
             'decisions': 0,
             'adjustments': 0,
             'blocked': 0,
-            'optimizations': 0
+            'optimizations': 0,
+            'pressure_wakeups': 0
         }
 
+        # 在线交接
+        self.handover_server = HandoverServer(handover_socket) if handover_socket else None
+        self.takeover_socket = takeover_socket
+        self.handover_report = None
+        self.handed_over = False
+
         self.running = True
-        self.next_variation = time.time() + random.randint(180, 360)
-        self.last_optimization = time.time()
+        self.next_variation = self.clock.time() + self.rng.randint(180, 360)
+        self.last_optimization = self.clock.time()
+        self.last_status = self.clock.time()
+        self.last_export = self.clock.time()
+
+        # 控制接口（最后启动：连接线程会直接调用本对象）；在线交接时旧进程仍在监听，交接后再启动
+        self.control_socket = control_socket
+        self.control = ControlServer(self, control_socket) if control_socket and not takeover_socket else None
+
+    def now(self):
+        """当前时间（按注入的时钟）"""
+        return datetime.fromtimestamp(self.clock.time())
 
     def log(self, msg, level="INFO"):
         """日志"""
@@ -101,21 +200,36 @@ class NerdyHolderPro:
             "ALGO": "\033[96m",
             "OPT": "\033[95m"
         }
-        timestamp = datetime.now().strftime('%H:%M:%S')
+        timestamp = self.now().strftime('%H:%M:%S')
         color = colors.get(level, "")
         reset = "\033[0m" if color else ""
         print(f"{color}[{timestamp}] {msg}{reset}", flush=True)
 
+    def emit(self, event, **fields):
+        """向控制接口订阅者推送事件"""
+        if self.control is not None:
+            self.control.publish(dict(fields, event=event, time=self.clock.time()))
+
     def get_system_memory(self):
         """获取系统内存"""
-        mem_percent = psutil.virtual_memory().percent
-        self.memory_history.append((time.time(), mem_percent))
+        return self.observe_memory(self.sensor.sample().percent)
+
+    def observe_memory(self, mem_percent):
+        """记录一次读数（历史 + EMA）"""
+        now = self.clock.time()
+        self.memory_history.append((now, mem_percent))
         self.ema_predictor.update(mem_percent)
+        if self.trace:
+            self.trace.record(now, mem_percent, self.get_holding_mb())
         return mem_percent
 
     def get_holding_mb(self):
-        """获取持有量"""
-        return sum(c.size_mb for c in self.chunks)
+        """获取持有量（实际提交）"""
+        return self.ledger.holding_mb
+
+    def get_nominal_mb(self):
+        """获取名义持有量"""
+        return self.ledger.nominal_mb
 
     def calculate_volatility(self):
         """计算波动性"""
@@ -130,6 +244,13 @@ class NerdyHolderPro:
     def allocate_memory(self, target_mb):
         """分配内存"""
         allocated = 0
+        committed = 0
+        rss_before = get_rss_bytes()
+        start = time.perf_counter()
+
+        parallel = (target_mb >= self.parallel_threshold_mb and
+                    (self.prefaulter.workers > 1 or self.prefaulter.max_mb_per_sec))
+        pending = []
 
         while allocated < target_mb:
             remaining = target_mb - allocated
@@ -146,65 +267,365 @@ class NerdyHolderPro:
                 chunk_size = max(50, int(remaining))
 
             try:
-                chunk = MemoryChunk(chunk_size)
-                self.chunks.append(chunk)
+                if not parallel:
+                    self.prefaulter.throttle(chunk_size * 1024 * 1024)
+                chunk = MemoryChunk(chunk_size, self.backend, self.commit_method,
+                                    commit=not parallel, fill=self.fill_policy)
+                if parallel:
+                    pending.append(chunk)
+                else:
+                    self.ledger.add(chunk)
+                    committed += chunk.committed_bytes
                 allocated += chunk_size
+            except (MemoryError, OSError) as e:
+                # 严格过量提交下提交余量耗尽时在此失败
+                self.log(f"分配失败: {chunk_size}MB ({type(e).__name__}: {e}) | "
+                         f"已分配{allocated}/{target_mb}MB", "WARN")
+                break
             except Exception:
                 break
 
             if allocated >= target_mb * 0.95:
                 break
 
+        if pending:
+            try:
+                committed += self.prefaulter.commit(pending)
+            except BaseException:
+                # 尚未入账的块不释放就会泄漏
+                for chunk in pending:
+                    chunk.release()
+                raise
+            for chunk in pending:
+                self.ledger.add(chunk)
+
+        elapsed = time.perf_counter() - start
+        if committed > 0:
+            self.fill_rates.append(committed / (1024*1024) / max(elapsed, 1e-9))
+
+        self.verify_commit(committed, get_rss_bytes() - rss_before)
         return allocated
 
+    def verify_commit(self, committed_bytes, rss_delta_bytes):
+        """以进程RSS增量核对提交量"""
+        # 后端自行提交时（如模拟后端）RSS不反映提交量
+        if committed_bytes <= 0 or hasattr(self.backend, 'commit'):
+            return
+
+        ratio = rss_delta_bytes / committed_bytes
+        self.last_commit_check = {
+            'committed_mb': committed_bytes / (1024*1024),
+            'rss_delta_mb': rss_delta_bytes / (1024*1024),
+            'ratio': ratio
+        }
+
+        if ratio < 0.9:
+            self.log(f"提交核对: RSS仅增长{ratio:.0%} "
+                     f"({self.last_commit_check['rss_delta_mb']:.0f}/"
+                     f"{self.last_commit_check['committed_mb']:.0f}MB)", "WARN")
+
     def release_memory(self, target_mb):
         """释放内存"""
-        if not self.chunks:
+        if not len(self.ledger):
             return 0
 
-        self.chunks.sort(key=lambda x: x.size_mb, reverse=True)
+        start = time.perf_counter()
 
         released = 0
-        to_remove = []
+        with self.ledger.lock:
+            whole, partial, partial_mb = self.ledger.plan_release(target_mb)
+
+            for chunk in whole:
+                self.ledger.remove(chunk)
+                released += chunk.committed_mb
+                chunk.release()
+
+            if partial is not None:
+                freed = self.ledger.shrink(partial, partial_mb)
+                if freed > 0:
+                    released += freed / (1024*1024)
+                else:
+                    # 后端不支持区间归还，退回整块释放
+                    self.ledger.remove(partial)
+                    released += partial.committed_mb
+                    partial.release()
+
+        self.performance_tracker.record_release(target_mb, released)
+
+        self.release_latencies.append((time.perf_counter() - start) * 1000)
+        return released
 
-        for i, chunk in enumerate(self.chunks):
-            if released >= target_mb * 0.9:
-                break
-            to_remove.append(i)
-            released += chunk.size_mb
+    def get_release_latency(self):
+        """释放耗时统计(ms)"""
+        if not self.release_latencies:
+            return None
+        latencies = list(self.release_latencies)
+        return {
+            'last': latencies[-1],
+            'avg': sum(latencies) / len(latencies),
+            'max': max(latencies)
+        }
 
-        for i in reversed(to_remove):
-            self.chunks.pop(i)
+    def get_actuator_status(self):
+        """后台执行器状态（导出用）"""
+        if self.actuator is None:
+            return {}
+        latency = self.actuator.get_release_latency()
+        stats = self.actuator.get_stats()
+        return {
+            'slice_budget_s': float(self.actuator.slice_budget),
+            'busy': bool(self.actuator.busy),
+            'rate_mb_per_sec': float(self.actuator.rate or 0),
+            'plans': int(stats['plans']),
+            'slices': int(stats['slices']),
+            'aborted': int(stats['aborted']),
+            'preempted': int(stats['preempted']),
+            'release_start_latency_ms': {
+                'last': float(latency['last']) if latency else 0,
+                'avg': float(latency['avg']) if latency else 0,
+                'max': float(latency['max']) if latency else 0
+            }
+        }
 
-        return released
+    def get_watchdog_status(self):
+        """看门狗状态（导出用）"""
+        if self.watchdog is None:
+            return {}
+        latency = self.watchdog.get_latency()
+        return {
+            'floor_mb': float(self.watchdog.floor_mb),
+            'psi_full_limit': float(self.watchdog.psi_full),
+            'psi_full': float(self.watchdog.psi_rate),
+            'oom_score_adj': get_oom_score_adj(),
+            'breaches': int(self.watchdog.stats['breaches']),
+            'released_mb': float(self.watchdog.stats['released_mb']),
+            'breach_to_freed_ms': {
+                'last': float(latency['last']) if latency else 0,
+                'avg': float(latency['avg']) if latency else 0,
+                'max': float(latency['max']) if latency else 0
+            }
+        }
+
+    def adopt_segments(self):
+        """持久化后端：接管上一进程留下的段"""
+        if not hasattr(self.backend, 'adopt'):
+            return 0
+
+        start = time.perf_counter()
+        adopted = 0
+        for data in self.backend.adopt():
+            chunk = MemoryChunk.adopt(data, self.backend, self.backend.committed_bytes(data))
+            self.ledger.add(chunk)
+            adopted += 1
+
+        if adopted:
+            elapsed = time.perf_counter() - start
+            self.log(f"接管 {adopted} 段 {self.get_holding_mb():.0f}MB | 耗时{elapsed * 1000:.0f}ms", "SUCCESS")
+        return adopted
+
+    def restore_holding(self):
+        """在线交接时从旧进程接收段，否则接管重启前留下的段"""
+        if not self.takeover_socket:
+            return self.adopt_segments()
+
+        # 旧进程的段仍在使用中，只能经交接socket接收，不能按目录接管
+        self.log(f"从 {self.takeover_socket} 接管...", "INFO")
+        self.handover_report = take_over(self, self.takeover_socket)
+        report = self.handover_report
+        self.log(f"交接完成: {report['segments']}段 {report['holding_mb']:.0f}MB | "
+                 f"耗时{report['duration_ms']:.0f}ms | "
+                 f"偏离容差{report['outside_tolerance_s']:.2f}s", "SUCCESS")
+        if self.control_socket:
+            self.control = ControlServer(self, self.control_socket)
+        return report['segments']
+
+    def adopt_segment(self, fd, name):
+        """接管单个段（在线交接时由旧进程传来）"""
+        data = self.backend.adopt_fd(fd, name)
+        if data is None:
+            os.close(fd)
+            return None
+        chunk = MemoryChunk.adopt(data, self.backend, self.backend.committed_bytes(data))
+        self.ledger.add(chunk)
+        return chunk
+
+    def export_state(self):
+        """导出控制器状态（交接用）"""
+        return {
+            'current_target': self.current_target,
+            'next_variation': self.next_variation,
+            'pid': self.pid_controller.get_state(),
+            'ema': self.ema_predictor.get_state(),
+            'response': self.response_calculator.get_state(),
+            'params': self.optimizer.params,
+            'memory_history': list(self.memory_history),
+            'stats': {k: v for k, v in self.stats.items() if k != 'start_time'}
+        }
+
+    def load_state(self, state):
+        """恢复控制器状态"""
+        if not self.test_mode:
+            self.current_target = state['current_target']
+            self.next_variation = state['next_variation']
+            self.pid_controller.target = self.current_target
+
+        self.optimizer.params.update(state['params'])
+        self.apply_params()
+
+        self.pid_controller.load_state(state['pid'])
+        self.ema_predictor.load_state(state['ema'])
+        self.response_calculator.load_state(state['response'])
+        self.memory_history.extend(tuple(x) for x in state['memory_history'])
+        self.stats.update(state['stats'])
+
+    def apply_params(self):
+        """把优化器参数同步到算法组件"""
+        self.response_calculator.response_base = self.optimizer.params['response_base']
+        self.response_calculator.response_curve = self.optimizer.params['response_curve']
+        self.response_calculator.urgency_threshold = self.optimizer.params['urgency_threshold']
+        self.response_calculator.cost_decay_release = self.optimizer.params['cost_decay_release']
+        self.response_calculator.cost_decay_allocate = self.optimizer.params['cost_decay_allocate']
+        self.response_calculator.base_min_interval_release = self.optimizer.params['min_interval_release']
+        self.response_calculator.base_min_interval_allocate = self.optimizer.params['min_interval_allocate']
+        self.pid_controller.Kp = self.optimizer.params['pid_kp']
+        self.pid_controller.Ki = self.optimizer.params['pid_ki']
+        self.pid_controller.Kd = self.optimizer.params['pid_kd']
+        self.ema_predictor.fast_alpha = self.optimizer.params['ema_fast']
+        self.ema_predictor.slow_alpha = self.optimizer.params['ema_slow']
+
+    def hand_over(self):
+        """把持有量交给继任进程并退出"""
+        self.log("继任者已连接，开始交接...", "WARN")
+        if self.actuator:
+            self.actuator.cancel()
+            self.actuator.wait_idle()
+        if self.watchdog:
+            self.watchdog.stop()
+        self.optimizer.save_params(force=True)
+        segments = self.handover_server.hand_over(self)
+        self.handover_server = None
+
+        if segments:
+            self.handed_over = True
+            self.running = False
+            self.log(f"已交出 {segments} 段，退出", "SUCCESS")
+        else:
+            self.log("交接未完成，继续运行", "WARN")
+            if self.watchdog:
+                self.watchdog.start()
 
     def adjust_target(self):
         """随机变化目标"""
         if self.test_mode:
             return
 
-        if time.time() >= self.next_variation:
+        if self.clock.time() >= self.next_variation:
             old = self.current_target
-            self.current_target = random.uniform(self.min_target, self.max_target)
-            self.next_variation = time.time() + random.randint(180, 360)
+            self.current_target = self.rng.uniform(self.min_target, self.max_target)
+            self.next_variation = self.clock.time() + self.rng.randint(180, 360)
 
             self.pid_controller.set_target(self.current_target)
             self.log(f"目标变化: {old:.1f}% → {self.current_target:.1f}%", "SUCCESS")
+            self.emit('target', old=old, target=self.current_target)
+
+    def set_target(self, value):
+        """切到固定目标（指标原生单位）"""
+        target = self.sensor.to_percent(value)
+        if not 0 < target < 100:
+            raise ValueError(f"目标超出范围: {value}")
+
+        old = self.current_target
+        self.min_target = self.max_target = self.current_target = target
+        self.test_mode = True
+        self.pid_controller.set_target(target)
+        self.log(f"控制: 固定目标 {old:.1f}% → {target:.1f}%", "SUCCESS")
+        self.emit('target', old=old, target=target)
+
+    def set_range(self, low, high):
+        """切到动态范围（指标原生单位）"""
+        low, high = sorted(self.sensor.to_percent(x) for x in (low, high))
+        if not 0 < low <= high < 100:
+            raise ValueError(f"范围超出: {low:.1f}-{high:.1f}%")
+
+        old = self.current_target
+        self.min_target = low
+        self.max_target = high
+        self.test_mode = False
+        if not low <= self.current_target <= high:
+            self.current_target = (low + high) / 2
+            self.pid_controller.set_target(self.current_target)
+        self.next_variation = self.clock.time() + self.rng.randint(180, 360)
+        self.log(f"控制: 目标范围 {low:.1f}-{high:.1f}% | 当前{self.current_target:.1f}%", "SUCCESS")
+        self.emit('target', old=old, target=self.current_target, min_target=low, max_target=high)
+
+    def set_tolerance(self, tolerance):
+        """设置容差(%)"""
+        if tolerance <= 0:
+            raise ValueError(f"容差必须为正: {tolerance}")
+        self.optimizer.params['tolerance'] = tolerance
+        self.log(f"控制: 容差 {tolerance:.2f}%", "SUCCESS")
+
+    def force_release(self, size_mb):
+        """立即释放，绕过决策和间隔保护"""
+        if self.actuator:
+            self.actuator.cancel()
+        released = self.release_memory(min(size_mb, self.get_holding_mb()))
+        self.log(f"控制: 释放 {released:.0f}MB | 剩余{self.get_holding_mb():.0f}MB", "WARN")
+        self.emit('adjusted', action='release', size_mb=released, source='control')
+        return released
+
+    def force_hold(self, size_mb):
+        """立即追加持有（阻塞至分配完成）"""
+        allocated = self.allocate_memory(size_mb)
+        self.log(f"控制: 分配 {allocated}MB | 持有{self.get_holding_mb():.0f}MB", "SUCCESS")
+        self.emit('adjusted', action='allocate', size_mb=allocated, source='control')
+        return allocated
 
     def make_decision(self):
-        """统一决策流程"""
+        """统一决策流程，返回 'tolerance' / 'blocked' / 'adjusted'"""
+        plan = self.decide()
+        if plan['outcome'] != 'adjust':
+            return plan['outcome']
+
+        self.dispatch(plan)
+        return 'adjusted'
+
+    def decide(self, current_mem=None):
+        """决策：采样、预测控制、调整判断，返回调整计划（不执行）
+
+        current_mem 由外部采样器提供时不再重新采样
+        """
+        plan = self._decide(current_mem)
+        if self.control is not None:
+            self.emit('decision', **{k: v for k, v in plan.items() if k not in ('decided_at', 'response_state')})
+        return plan
+
+    def _decide(self, current_mem):
         self.stats['decisions'] += 1
+        decided_at = time.monotonic()
 
         # 获取状态
-        current_mem = self.get_system_memory()
+        if current_mem is None:
+            current_mem = self.get_system_memory()
+        else:
+            self.observe_memory(current_mem)
         target = self.current_target
-        error = current_mem - target
+        measured_error = current_mem - target
         volatility = self.calculate_volatility()
 
-        # 容差检查
+        # 回收压力：正在直接回收/抖动时，即使读数在容差内也释放
+        pressure = self.pressure.sample().score
+        error = measured_error + pressure * self.pressure_bias
+        self.last_error = error
+
+        if self.shadows:
+            self.shadows.observe(current_mem)
+
+        # 容差检查（空闲轮不记录）
         if abs(error) <= self.optimizer.params['tolerance']:
-            self.performance_tracker.record(abs(error), 0, False)
-            return
+            if not self.scheduler.idle:
+                self.performance_tracker.record(abs(measured_error), 0, False)
+            return {'outcome': 'tolerance', 'error': error}
 
         # 早期能力检查：需要释放但持有0MB，直接返回避免无用计算
         if error > 0:  # 系统高于目标，需要释放
@@ -212,8 +633,8 @@ class NerdyHolderPro:
             if holding == 0:
                 # 无能为力，记录并直接返回
                 self.stats['blocked'] += 1
-                self.performance_tracker.record(abs(error), 0, True)
-                return
+                self.performance_tracker.record(abs(measured_error), 0, True)
+                return {'outcome': 'blocked', 'error': error}
 
         # 预测和控制
         momentum = self.ema_predictor.get_momentum()
@@ -221,47 +642,115 @@ class NerdyHolderPro:
 
         # 计算响应大小
         response_mb = self.response_calculator.calculate_response_size(
-            error, pid_result['output'], momentum, volatility
+            error, pid_result['output'], momentum, volatility, pressure
         )
 
-        # 决策判断
-        decision = self.response_calculator.should_adjust(error, response_mb, volatility)
+        # 决策判断（执行器不接受计划时按状态回滚）
+        response_state = self.response_calculator.get_state()
+        decision = self.response_calculator.should_adjust(error, response_mb, volatility, pressure)
 
         if not decision['should_adjust']:
             self.stats['blocked'] += 1
-            self.performance_tracker.record(abs(error), response_mb, True)
+            self.performance_tracker.record(abs(measured_error), response_mb, True)
 
             if abs(error) > 3:
                 self.log(f"阻止: {decision['reason']}", "ALGO")
-            return
+            return {'outcome': 'blocked', 'error': error}
 
-        # 执行调整
         self.stats['adjustments'] += 1
-        self.performance_tracker.record(abs(error), response_mb, False)
+        self.performance_tracker.record(abs(measured_error), response_mb, False)
+
+        return {
+            'outcome': 'adjust',
+            'action': 'allocate' if error < 0 else 'release',
+            'size_mb': response_mb,
+            'error': error,
+            'current_mem': current_mem,
+            'pressure': pressure,
+            'decided_at': decided_at,
+            'response_state': response_state
+        }
+
+    def dispatch(self, plan):
+        """执行计划：有后台执行器时分配交给它，释放先中止进行中的分配再就地执行"""
+        if self.actuator is None:
+            return self.apply(plan)
 
-        if error < 0:
+        if plan['action'] == 'allocate':
+            if not self.actuator.submit(plan):
+                self.drop_plan(plan)
+            return 0
+
+        self.actuator.preempt(plan)
+        return self.apply(plan)
+
+    def drop_plan(self, plan):
+        """执行器未接受的分配计划（已有分配在进行）：改记为阻止"""
+        self.stats['adjustments'] -= 1
+        self.stats['blocked'] += 1
+        self.performance_tracker.mark_blocked()
+        self.response_calculator.load_state(plan['response_state'])
+
+    def allocating_in_background(self):
+        """后台分配进行中且读数未超出目标容差（此时只需等分配推进）"""
+        if self.actuator is None or not self.actuator.busy:
+            return False
+        error = self.sensor.sample().percent - self.current_target
+        return error <= self.optimizer.params['tolerance']
+
+    def apply(self, plan, report=True):
+        """执行调整计划，返回实际调整量(MB)
+
+        report: 调整后重新采样并记录效果（由外部采样器负责时关闭）
+        """
+        error = plan['error']
+        current_mem = plan['current_mem']
+        pressure = plan['pressure']
+        pressure_note = f" 压力{pressure:.2f}" if pressure >= 0.05 else ""
+
+        if plan['action'] == 'allocate':
             # 分配
-            self.log(f"分配 {int(response_mb)}MB (误差{error:.1f}%)", "SUCCESS")
-            allocated = self.allocate_memory(int(response_mb))
-            new_mem = self.get_system_memory()
-            self.log(f"   {current_mem:.1f}% → {new_mem:.1f}% | 持有{self.get_holding_mb():.0f}MB", "INFO")
+            self.log(f"分配 {int(plan['size_mb'])}MB (误差{error:.1f}%{pressure_note})", "SUCCESS")
+            adjusted = self.allocate_memory(int(plan['size_mb']))
+            if report:
+                new_mem = self.get_system_memory()
+                if self.shadows:
+                    self.shadows.learn(adjusted, new_mem - current_mem)
+                self.log(f"   {current_mem:.1f}% → {new_mem:.1f}% | 持有{self.get_holding_mb():.0f}MB", "INFO")
         else:
             # 释放
             holding = self.get_holding_mb()
-            release_size = min(int(response_mb), holding)
-            self.log(f"释放 {release_size}MB (误差{error:.1f}%)", "WARN")
-            released = self.release_memory(release_size)
-            new_mem = self.get_system_memory()
-            self.log(f"   {current_mem:.1f}% → {new_mem:.1f}% | 剩余{self.get_holding_mb():.0f}MB", "INFO")
+            release_size = min(plan['size_mb'], holding)
+            self.log(f"释放 {release_size:.0f}MB (误差{error:.1f}%{pressure_note})", "WARN")
+            if self.actuator:
+                self.actuator.release_started(plan)
+            adjusted = self.release_memory(release_size)
+            if report:
+                new_mem = self.get_system_memory()
+                if self.shadows:
+                    self.shadows.learn(-adjusted, new_mem - current_mem)
+                self.log(f"   {current_mem:.1f}% → {new_mem:.1f}% | 剩余{self.get_holding_mb():.0f}MB", "INFO")
+
+        self.emit('adjusted', action=plan['action'], size_mb=adjusted, error=error)
+        return adjusted
 
     def optimize_parameters(self):
         """优化参数"""
-        now = time.time()
+        now = self.clock.time()
         if now - self.last_optimization < 30:
             return
 
         self.last_optimization = now
 
+        if self.shadows:
+            promoted = self.shadows.maybe_promote(now)
+            if promoted:
+                self.optimizer.promote(promoted['params'])
+                self.apply_params()
+                self.stats['optimizations'] += 1
+                self.log(f"提升影子参数: 得分{promoted['score']:.1f} > 现参数{promoted['baseline']:.1f}", "OPT")
+            return
+
         stats = self.performance_tracker.get_stats()
         if not stats:
             return
@@ -297,83 +786,165 @@ class NerdyHolderPro:
                         f"误差{stats['avg_error']:.2f}% | "
                         f"稳定性{stats['error_volatility']:.2f}% | "
                         f"阻止率{stats['block_rate']:.1%}", "OPT")
-
-            # 更新算法组件参数
-            self.response_calculator.response_base = self.optimizer.params['response_base']
-            self.response_calculator.response_curve = self.optimizer.params['response_curve']
-            self.response_calculator.urgency_threshold = self.optimizer.params['urgency_threshold']
-            self.response_calculator.cost_decay_release = self.optimizer.params['cost_decay_release']
-            self.response_calculator.cost_decay_allocate = self.optimizer.params['cost_decay_allocate']
-            self.response_calculator.base_min_interval_release = self.optimizer.params['min_interval_release']
-            self.response_calculator.base_min_interval_allocate = self.optimizer.params['min_interval_allocate']
         elif result:
             self.log(f"{result}", "OPT")
 
-    def export_status(self):
-        """导出状态"""
-        try:
-            uptime = (datetime.now() - self.stats['start_time']).total_seconds()
-            stats = self.performance_tracker.get_stats()
-
-            status = {
-                'timestamp': time.time(),
-                'current_target': float(self.current_target),
-                'system_memory': float(psutil.virtual_memory().percent),
-                'holding_mb': int(self.get_holding_mb()),
-                'chunks_count': int(len(self.chunks)),
-
-                'params': {
-                    'pid_kp': float(self.optimizer.params['pid_kp']),
-                    'pid_ki': float(self.optimizer.params['pid_ki']),
-                    'pid_kd': float(self.optimizer.params['pid_kd']),
-                    'response_base': float(self.optimizer.params['response_base']),
-                    'response_curve': float(self.optimizer.params['response_curve']),
-                    'tolerance': float(self.optimizer.params['tolerance'])
-                },
-
-                'stats': {
-                    'uptime_seconds': float(uptime),
-                    'decisions': int(self.stats['decisions']),
-                    'adjustments': int(self.stats['adjustments']),
-                    'blocked': int(self.stats['blocked']),
-                    'optimizations': int(self.stats['optimizations'])
-                },
-
-                'performance': {
-                    'avg_error': float(stats['avg_error']) if stats else 0,
-                    'error_volatility': float(stats['error_volatility']) if stats else 0,
-                    'block_rate': float(stats['block_rate']) if stats else 0,
-                    'score': float(self.optimizer.params['best_score'])
-                }
+        # 探索开始/回滚同样改变参数，每次都同步到算法组件
+        self.apply_params()
+
+    def get_anon_huge_mb(self):
+        """大页支撑量(MB)，最多每 anon_huge_interval 秒读一次；非大页后端为0"""
+        if self.backend.name != 'hugepage':
+            return 0.0
+        now = self.clock.time()
+        if self.anon_huge_refreshed is None or now - self.anon_huge_refreshed >= self.anon_huge_interval:
+            self.anon_huge_mb = get_anon_huge_bytes() / (1024*1024)
+            self.anon_huge_refreshed = now
+        return self.anon_huge_mb
+
+    def build_status(self):
+        """当前状态快照"""
+        uptime = (self.now() - self.stats['start_time']).total_seconds()
+        stats = self.performance_tracker.get_stats()
+        latency = self.get_release_latency()
+
+        return {
+            'timestamp': self.clock.time(),
+            'current_target': float(self.current_target),
+            'system_memory': float(self.sensor.percent),
+            'sensor': {
+                'name': self.sensor.name,
+                'unit': self.sensor.unit,
+                'value': float(self.sensor.value),
+                'target': float(self.sensor.from_percent(self.current_target))
+            },
+            'holding_mb': int(self.get_holding_mb()),
+            'nominal_mb': int(self.get_nominal_mb()),
+            'rss_mb': float(get_rss_bytes() / (1024*1024)),
+            'commit_check': dict(self.last_commit_check or {}),
+            'handover': dict(self.handover_report or {}),
+            'fill': {
+                'policy': self.fill_policy,
+                'mb_per_sec': float(self.fill_rates[-1]) if self.fill_rates else 0
+            },
+            'hugepage': {
+                'thp_enabled': self.thp['enabled'],
+                'anon_huge_mb': float(self.get_anon_huge_mb())
+            },
+            'chunks_count': int(len(self.ledger)),
+            'backend': self.backend.name,
+            'backend_stats': self.backend.stats() if hasattr(self.backend, 'stats') else {},
+
+            'release_latency_ms': {
+                'last': float(latency['last']) if latency else 0,
+                'avg': float(latency['avg']) if latency else 0,
+                'max': float(latency['max']) if latency else 0
+            },
+            'actuator': self.get_actuator_status(),
+            'watchdog': self.get_watchdog_status(),
+
+            'params': {
+                'pid_kp': float(self.optimizer.params['pid_kp']),
+                'pid_ki': float(self.optimizer.params['pid_ki']),
+                'pid_kd': float(self.optimizer.params['pid_kd']),
+                'response_base': float(self.optimizer.params['response_base']),
+                'response_curve': float(self.optimizer.params['response_curve']),
+                'tolerance': float(self.optimizer.params['tolerance'])
+            },
+
+            'stats': {
+                'uptime_seconds': float(uptime),
+                'decisions': int(self.stats['decisions']),
+                'adjustments': int(self.stats['adjustments']),
+                'blocked': int(self.stats['blocked']),
+                'optimizations': int(self.stats['optimizations']),
+                'pressure_wakeups': int(self.stats['pressure_wakeups'])
+            },
+            'runtime': self.runtime,
+            'waker': self.waker.name,
+            'scheduler': {
+                'interval_s': float(self.scheduler.interval),
+                'idle': bool(self.scheduler.idle),
+                'idle_ticks': int(self.scheduler.idle_ticks)
+            },
+            'cpu_seconds_per_hour': float(self.get_cpu_seconds_per_hour()),
+            'pressure': {
+                'score': float(self.pressure.score),
+                'psi_some_avg10': float(self.pressure.psi['some']),
+                'psi_full_avg10': float(self.pressure.psi['full']),
+                'rates': {k: float(v) for k, v in self.pressure.rates.items()}
+            },
+
+            'performance': {
+                'avg_error': float(stats['avg_error']) if stats else 0,
+                'error_volatility': float(stats['error_volatility']) if stats else 0,
+                'block_rate': float(stats['block_rate']) if stats else 0,
+                'release_overshoot_mb': float(stats['release_overshoot']) if stats else 0,
+                'score': float(self.optimizer.params['best_score'])
             }
+        }
 
-            temp_file = self.status_file + '.tmp'
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(status, f, indent=2)
-
-            if os.path.exists(self.status_file):
-                os.remove(self.status_file)
-            os.rename(temp_file, self.status_file)
+    def export_status(self):
+        """导出状态：每次写状态块，JSON（启用时）每秒一次"""
+        try:
+            status = self.build_status()
+
+            if self.status_writer is None:
+                self.status_writer = StatusWriter(self.status_block)
+            self.status_writer.write(status)
+
+            if self.status_json and status['timestamp'] - self.last_json_export >= 1:
+                temp_file = self.status_file + '.tmp'
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump(status, f, indent=2)
+                os.replace(temp_file, self.status_file)
+                self.last_json_export = status['timestamp']
         except Exception:
             pass
 
     def print_status(self):
         """状态汇总"""
-        current = self.get_system_memory()
-        uptime = datetime.now() - self.stats['start_time']
+        current = self.sensor.percent
+        uptime = self.now() - self.stats['start_time']
         holding = self.get_holding_mb()
         volatility = self.calculate_volatility()
         momentum = self.ema_predictor.get_momentum()
         predicted = self.ema_predictor.predict()
 
         stats = self.performance_tracker.get_stats()
+        latency = self.get_release_latency()
 
         print("\n" + "=" * 80)
         print(f"Nerdy Holder Pro | 运行: {uptime}")
         print("=" * 80)
         print(f"系统: {current:.1f}% | 目标: {self.current_target:.1f}% | "
-              f"持有: {holding:.0f}MB ({len(self.chunks)}块)")
+              f"持有: {holding:.0f}/{self.get_nominal_mb():.0f}MB ({len(self.ledger)}块)")
         print(f"预测: {predicted:.1f}% | 动量: {momentum:+.1f} | 波动: {volatility:.2f}%")
+        if self.pressure.score >= 0.05:
+            print(f"压力: {self.pressure.score:.2f} | PSI some {self.pressure.psi['some']:.1f}% "
+                  f"full {self.pressure.psi['full']:.1f}% | "
+                  f"直接扫描{self.pressure.rates['pgscan_direct']:.0f}页/s")
+        if self.backend.name == 'hugepage':
+            print(f"大页: THP[{self.thp['enabled']}] | "
+                  f"大页支撑{self.get_anon_huge_mb():.0f}MB")
+        if self.fill_rates:
+            print(f"填充[{self.fill_policy}]: {self.fill_rates[-1]:.0f} MB/s")
+        if latency:
+            print(f"释放[{self.backend.name}]: 最近{latency['last']:.1f}ms | "
+                  f"平均{latency['avg']:.1f}ms | 最大{latency['max']:.1f}ms")
+        if self.actuator:
+            preempt = self.actuator.get_release_latency()
+            stats = self.actuator.get_stats()
+            line = (f"分片: {self.actuator.slice_budget * 1000:.0f}ms | "
+                    f"{stats['plans']}计划 {stats['slices']}片 | 中止{stats['aborted']}")
+            if preempt:
+                line += f" | 分配中释放延迟 平均{preempt['avg']:.1f}ms 最大{preempt['max']:.1f}ms"
+            print(line)
+        if self.watchdog and self.watchdog.stats['breaches']:
+            breach = self.watchdog.get_latency()
+            print(f"看门狗: 紧急释放{self.watchdog.stats['breaches']}次 "
+                  f"{self.watchdog.stats['released_mb']:.0f}MB | "
+                  f"越线到释放 平均{breach['avg']:.1f}ms 最大{breach['max']:.1f}ms")
 
         if stats:
             print(f"性能: 误差{stats['avg_error']:.2f}% | "
@@ -381,6 +952,9 @@ class NerdyHolderPro:
                   f"阻止率{stats['block_rate']:.1%} | "
                   f"得分{self.optimizer.params['best_score']:.1f}")
 
+        print(f"节拍: {self.scheduler.interval:.1f}s | 空闲轮{self.scheduler.idle_ticks} | "
+              f"CPU {self.get_cpu_seconds_per_hour():.1f}s/h")
+
         print("-" * 80)
         print(f"统计: 决策{self.stats['decisions']} | "
               f"调整{self.stats['adjustments']} | "
@@ -394,7 +968,18 @@ class NerdyHolderPro:
         print("🤓 Nerdy Holder Pro")
         print("=" * 80)
 
-        self.log(f"系统: {self.total_gb:.1f} GB", "INFO")
+        self.log(f"系统: {self.total_gb:.1f} GB | 后端: {self.backend.name} | 填充: {self.fill_policy}", "INFO")
+        self.log(f"运行时: {self.runtime} | 唤醒: {self.waker.name} | "
+                 f"节拍{self.scheduler.min_interval}~{self.scheduler.max_interval}s", "INFO")
+        if self.actuator:
+            self.log(f"后台分片分配: 每片{self.actuator.slice_budget * 1000:.0f}ms，片间可中止", "INFO")
+        if self.oom_score_adj is not None:
+            if set_oom_score_adj(self.oom_score_adj):
+                self.log(f"oom_score_adj: {get_oom_score_adj()}（OOM时优先结束holder）", "INFO")
+            else:
+                self.log(f"无法设置oom_score_adj为{self.oom_score_adj}", "WARN")
+        if self.backend.name == 'hugepage' and not self.thp['available']:
+            self.log(f"内核THP为{self.thp['enabled']}，大页请求不会生效", "WARN")
 
         if self.test_mode:
             self.log(f"固定模式: 目标 {self.current_target:.1f}%", "INFO")
@@ -403,64 +988,179 @@ class NerdyHolderPro:
 
         self.log(f"历史最佳得分: {self.optimizer.params['best_score']:.1f}", "OPT")
 
+        self.restore_holding()
+
         # 初始化内存
         current = self.get_system_memory()
         need = self.current_target - current
 
         if need > 0:
             need_mb = int(need * self.total_bytes / 100 / (1024*1024))
-            self.log(f"初始化分配: {need_mb}MB", "INFO")
+            self.log(f"初始化分配: {need_mb}MB ({self.prefaulter.workers}线程)", "INFO")
+            start = time.perf_counter()
             self.allocate_memory(need_mb)
+            elapsed = time.perf_counter() - start
             final = self.get_system_memory()
-            self.log(f"初始化完成: {final:.1f}%", "SUCCESS")
+            self.log(f"初始化完成: {final:.1f}% | 耗时{elapsed:.1f}s", "SUCCESS")
         else:
             self.log(f"系统内存已达标: {current:.1f}%", "SUCCESS")
 
+        if self.watchdog:
+            self.watchdog.start()
+            self.log(f"看门狗: 可用内存下限{self.watchdog.floor_mb:.0f}MB | "
+                     f"PSI full上限{self.watchdog.psi_full:.0f}% | "
+                     f"周期{self.watchdog.period * 1000:.0f}ms", "INFO")
+            if self.watchdog_clamped is not None:
+                self.log(f"看门狗下限{self.watchdog_clamped:.0f}MB高于目标{self.max_target:.1f}%处的可用内存，"
+                         f"已下调到{self.watchdog.floor_mb:.0f}MB", "WARN")
+
+    def tick(self):
+        """单轮：决策、优化、导出，返回下一次唤醒间隔"""
+        # 目标变化
+        self.adjust_target()
+
+        # 核心决策（后台分配进行中时只检查是否需要释放）
+        idle = self.scheduler.idle
+        if self.allocating_in_background():
+            outcome = 'allocating'
+        else:
+            outcome = self.make_decision()
+            self.scheduler.observe(outcome == 'tolerance')
+
+        # 参数优化（空闲轮跳过）
+        if not idle:
+            self.optimize_parameters()
+
+        # 导出状态
+        now = self.clock.time()
+        if self.enable_benchmark and now - self.last_export >= self.export_interval:
+            self.export_status()
+            self.last_export = now
+
+        # 状态汇总
+        if now - self.last_status >= 120:
+            self.print_status()
+            self.last_status = now
+
+        if outcome == 'allocating':
+            return self.actuator.slice_budget
+        return self.next_interval()
+
+    def wait(self, interval):
+        """等到下一轮，返回是否被压力唤醒
+
+        节拍最长 max_interval；导出状态时每 idle_export_interval 醒来重新采样并导出，
+        节拍本身不短于此周期时直接睡到下一轮
+        """
+        if not self.enable_benchmark or interval <= self.idle_export_interval:
+            return self.waker.wait(interval)
+
+        deadline = self.clock.time() + interval
+        while True:
+            remaining = deadline - self.clock.time()
+            if remaining <= 0:
+                return False
+            if self.waker.wait(min(remaining, self.idle_export_interval)):
+                return True
+            self.sensor.sample()
+            self.export_status()
+            self.last_export = self.clock.time()
+
+    def next_interval(self):
+        """按误差、波动、动量和平静时长选择下一次唤醒间隔"""
+        return self.scheduler.next_interval(
+            self.last_error,
+            self.optimizer.params['tolerance'],
+            self.calculate_volatility(),
+            self.ema_predictor.get_momentum(),
+            self.clock.time() - self.response_calculator.last_adjustment_time,
+            self.response_calculator.remaining_interval(self.last_error)
+        )
+
+    def get_cpu_seconds_per_hour(self):
+        """本进程CPU时间（秒/小时）"""
+        uptime = (self.now() - self.stats['start_time']).total_seconds()
+        return (time.process_time() - self.cpu_start) / max(uptime, 1) * 3600
+
+    def run_async(self):
+        """异步运行时；交接未完成时重新启动"""
+        while self.running:
+            runtime = AsyncHolderRuntime(self)
+            runtime.run()
+            if runtime.handover_requested:
+                self.running = True
+                self.hand_over()
+
     def run(self):
         """主循环"""
         self.initialize()
         print()
 
         if self.enable_benchmark:
-            self.log("Benchmark导出已启用", "INFO")
+            self.log(f"状态导出: {self.status_block}" +
+                     (f" + {self.status_file}" if self.status_json else ""), "INFO")
 
         self.log("开始运行...\n", "INFO")
 
-        last_status = time.time()
-        last_export = time.time()
+        self.last_status = self.clock.time()
+        self.last_export = self.clock.time()
 
         try:
-            while self.running:
-                # 目标变化
-                self.adjust_target()
-
-                # 核心决策
-                self.make_decision()
-
-                # 参数优化
-                self.optimize_parameters()
+            if self.runtime == 'async':
+                self.run_async()
 
-                # 导出状态
-                if self.enable_benchmark and time.time() - last_export >= 1:
-                    self.export_status()
-                    last_export = time.time()
-
-                # 状态汇总
-                if time.time() - last_status >= 120:
-                    self.print_status()
-                    last_status = time.time()
-
-                time.sleep(3)
+            while self.running:
+                # 在线交接
+                if self.handover_server and self.handover_server.pending:
+                    self.hand_over()
+                    break
+
+                interval = self.tick()
+
+                if self.wait(interval):
+                    self.stats['pressure_wakeups'] += 1
+
+            if self.handed_over:
+                runtime_hours = (self.now() - self.stats['start_time']).total_seconds() / 3600
+                self.optimizer.params['total_runtime_hours'] += runtime_hours
+                self.optimizer.save_params(force=True)
+                if self.actuator:
+                    self.actuator.stop()
+                if self.watchdog:
+                    self.watchdog.close()
+                if self.status_writer:
+                    self.status_writer.close()
+                if self.control:
+                    self.control.close()
+                if self.trace:
+                    self.trace.close()
+                self.prefaulter.shutdown()
 
         except KeyboardInterrupt:
             print("\n")
             self.log("停止中...", "WARN")
             self.running = False
 
-            runtime_hours = (datetime.now() - self.stats['start_time']).total_seconds() / 3600
+            runtime_hours = (self.now() - self.stats['start_time']).total_seconds() / 3600
             self.optimizer.params['total_runtime_hours'] += runtime_hours
             self.optimizer.save_params(force=True)
 
-            self.chunks.clear()
+            if self.watchdog:
+                self.watchdog.close()
+            if self.actuator:
+                self.actuator.stop()
+            self.ledger.clear()
+            self.prefaulter.shutdown()
+            if hasattr(self.backend, 'close'):
+                self.backend.close()
             self.print_status()
+            self.sensor.close()
+            self.pressure.close()
+            self.waker.close()
+            if self.status_writer:
+                self.status_writer.close()
+            if self.control:
+                self.control.close()
+            if self.trace:
+                self.trace.close()
             self.log("已停止", "SUCCESS")
@@ -1,5 +1,40 @@
 """内存管理模块"""
 
 from .chunk import MemoryChunk
+from .backends import BytearrayBackend, MmapBackend, BACKENDS, get_backend
+from .commit import touch_pages, get_rss_bytes, COMMIT_METHODS, PAGE_SIZE
+from .ledger import ChunkLedger
+from .arena import ArenaBackend, IntervalMap
+from .persistent import ShmBackend, MemfdBackend, cleanup_segments
+from .hugepage import HugepageBackend, thp_status, get_anon_huge_bytes
+from .prefault import ParallelPrefaulter, benchmark_prefault, default_workers
+from .fill import fill_pages, benchmark_fill, FILL_POLICIES
+from .actuator import BackgroundActuator
 
-__all__ = ['MemoryChunk']
+__all__ = [
+    'MemoryChunk',
+    'ChunkLedger',
+    'BytearrayBackend',
+    'MmapBackend',
+    'HugepageBackend',
+    'ArenaBackend',
+    'IntervalMap',
+    'ShmBackend',
+    'MemfdBackend',
+    'cleanup_segments',
+    'thp_status',
+    'get_anon_huge_bytes',
+    'BACKENDS',
+    'get_backend',
+    'touch_pages',
+    'get_rss_bytes',
+    'COMMIT_METHODS',
+    'PAGE_SIZE',
+    'ParallelPrefaulter',
+    'benchmark_prefault',
+    'default_workers',
+    'fill_pages',
+    'benchmark_fill',
+    'FILL_POLICIES',
+    'BackgroundActuator'
+]
@@ -0,0 +1,210 @@
+"""后台执行器 - 分配计划按时间片分批执行，片间检查是否需要中止
+
+大块分配不再一次阻塞到底：每片控制在时间预算内，片间重新采样，
+误差反向（已高于目标）、被释放抢占或取消时立即停止
+"""
+
+import time
+import threading
+from collections import deque
+
+
+class BackgroundActuator:
+    """后台分配线程 - 驱动一个 holder
+
+    使用 holder 的 allocate_memory / sensor / current_target / log / emit
+    """
+
+    def __init__(self, holder, slice_budget=0.1, min_slice_mb=50, max_slice_mb=500):
+        self.holder = holder
+        self.slice_budget = slice_budget    # 每片时间预算(秒)
+        self.min_slice_mb = min_slice_mb
+        self.max_slice_mb = max_slice_mb
+        self.rate = None                    # 分配速率估计(MB/s)
+
+        self.cond = threading.Condition()
+        self.pending = None                 # 待执行的分配计划
+        self.active = False
+        self.cancelled = threading.Event()
+        self.running = True
+        self.thread = None
+
+        # 分配途中"需要释放"到"释放开始"的延迟(ms)
+        self.release_latencies = deque(maxlen=50)
+        self.last_result = None
+        self.stats = {'plans': 0, 'slices': 0, 'aborted': 0, 'preempted': 0}
+
+    @property
+    def busy(self):
+        """是否有分配在进行或等待"""
+        return self.active or self.pending is not None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._loop, name='nerdy-actuator', daemon=True)
+            self.thread.start()
+
+    def submit(self, plan):
+        """提交分配计划；已有分配在进行时丢弃，返回是否接受"""
+        with self.cond:
+            if self.busy:
+                return False
+            self.cancelled.clear()
+            self.pending = plan
+            self.start()
+            self.cond.notify()
+        return True
+
+    def preempt(self, plan):
+        """释放计划到来：中止进行中的分配，返回分配是否在进行"""
+        if not self.busy:
+            return False
+        with self.cond:
+            self.stats['preempted'] += 1
+        plan['during_allocation'] = True
+        self.cancel()
+        return True
+
+    def release_started(self, plan):
+        """释放开始：记录从决策到开始的延迟"""
+        if plan.get('during_allocation') and 'decided_at' in plan:
+            self.release_latencies.append((time.monotonic() - plan['decided_at']) * 1000)
+
+    def cancel(self):
+        """取消等待中的计划，并让进行中的分配在下一片前停止"""
+        with self.cond:
+            self.pending = None
+            self.cancelled.set()
+
+    def wait_idle(self, timeout=None):
+        """等待进行中的分配结束"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.cond:
+            while self.busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.cond.wait(remaining)
+        return True
+
+    def stop(self):
+        """取消分配并结束线程"""
+        self.cancel()
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def next_slice(self, remaining):
+        """按估计速率把一片控制在时间预算内"""
+        if self.rate is None:
+            size = self.min_slice_mb
+        else:
+            size = self.rate * self.slice_budget
+        size = max(self.min_slice_mb, min(self.max_slice_mb, size))
+        return int(min(size, remaining))
+
+    def _loop(self):
+        while True:
+            with self.cond:
+                while self.running and self.pending is None:
+                    self.cond.wait()
+                if not self.running:
+                    return
+                plan = self.pending
+                self.pending = None
+                self.active = True
+
+            try:
+                self.last_result = self.run_plan(plan)
+            finally:
+                with self.cond:
+                    self.active = False
+                    self.cond.notify_all()
+
+    def check(self):
+        """片间检查，返回中止原因（None为继续）"""
+        if self.cancelled.is_set():
+            return 'cancelled'
+        holder = self.holder
+        if holder.sensor.sample().percent - holder.current_target > 0:
+            return 'reversed'
+        return None
+
+    def run_plan(self, plan):
+        """分片执行分配计划"""
+        holder = self.holder
+        target = int(plan['size_mb'])
+        allocated = 0
+        slices = 0
+        reason = None
+        start = time.perf_counter()
+        with self.cond:
+            self.stats['plans'] += 1
+
+        holder.log(f"分配 {target}MB (误差{plan['error']:.1f}%，"
+                   f"后台分片{self.slice_budget * 1000:.0f}ms)", "SUCCESS")
+
+        while allocated < target:
+            if slices:
+                reason = self.check()
+                if reason:
+                    break
+            elif self.cancelled.is_set():
+                reason = 'cancelled'
+                break
+
+            size = self.next_slice(target - allocated)
+            slice_start = time.perf_counter()
+            got = holder.allocate_memory(size)
+            elapsed = time.perf_counter() - slice_start
+            if got <= 0:
+                reason = 'failed'
+                break
+
+            rate = got / max(elapsed, 1e-6)
+            self.rate = rate if self.rate is None else 0.7 * self.rate + 0.3 * rate
+            allocated += got
+            slices += 1
+            if allocated >= target * 0.95:
+                break
+
+        with self.cond:
+            self.stats['slices'] += slices
+            if reason:
+                self.stats['aborted'] += 1
+        result = {
+            'target_mb': target,
+            'allocated_mb': allocated,
+            'slices': slices,
+            'seconds': time.perf_counter() - start,
+            'aborted': reason
+        }
+
+        if reason:
+            reasons = {'cancelled': '被抢占', 'reversed': '误差反向', 'failed': '分配失败'}
+            holder.log(f"   分配中止({reasons[reason]}): {allocated}/{target}MB | "
+                       f"{slices}片 | 持有{holder.get_holding_mb():.0f}MB", "WARN")
+        else:
+            holder.log(f"   分配完成: {allocated}MB | {slices}片 {result['seconds']:.1f}s | "
+                       f"持有{holder.get_holding_mb():.0f}MB", "INFO")
+        holder.emit('allocation', **result)
+        return result
+
+    def get_stats(self):
+        """计数快照（执行线程、主线程、看门狗都会更新）"""
+        with self.cond:
+            return dict(self.stats)
+
+    def get_release_latency(self):
+        """分配途中释放开始延迟统计(ms)"""
+        if not self.release_latencies:
+            return None
+        latencies = list(self.release_latencies)
+        return {
+            'last': latencies[-1],
+            'avg': sum(latencies) / len(latencies),
+            'max': max(latencies)
+        }
@@ -0,0 +1,161 @@
+"""虚拟内存竞技场 - 启动时一次性预留，运行时只做区间提交/归还"""
+
+import os
+import mmap
+import bisect
+import ctypes
+import threading
+import psutil
+
+from .backends import BACKENDS
+from .commit import page_align, buffer_address
+
+PROT_NONE = 0
+PROT_RW = mmap.PROT_READ | mmap.PROT_WRITE
+MAP_NORESERVE = getattr(mmap, 'MAP_NORESERVE', 0x4000)
+MAP_FAILED = ctypes.c_void_p(-1).value
+
+try:
+    _libc = ctypes.CDLL(None, use_errno=True)
+    _libc.mmap.restype = ctypes.c_void_p
+    _libc.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int,
+                           ctypes.c_int, ctypes.c_int, ctypes.c_long]
+    _libc.munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+    _libc.mprotect.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int]
+    _libc.madvise.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int]
+except (OSError, AttributeError):
+    _libc = None
+
+
+class IntervalMap:
+    """空闲区间表 - 首次适配分配，释放时合并相邻区间"""
+
+    def __init__(self, size):
+        self.size = size
+        self.starts = [0]
+        self.lengths = {0: size}
+        self.free_bytes = size
+
+    def __len__(self):
+        return len(self.starts)
+
+    def allocate(self, length):
+        """分配区间，返回起始偏移；无可用区间返回None"""
+        for idx, start in enumerate(self.starts):
+            free = self.lengths[start]
+            if free < length:
+                continue
+
+            del self.starts[idx]
+            del self.lengths[start]
+            if free > length:
+                self.starts.insert(idx, start + length)
+                self.lengths[start + length] = free - length
+
+            self.free_bytes -= length
+            return start
+        return None
+
+    def free(self, start, length):
+        """归还区间并与相邻空闲区间合并"""
+        idx = bisect.bisect_left(self.starts, start)
+        self.free_bytes += length
+
+        # 与后一个合并
+        if idx < len(self.starts) and start + length == self.starts[idx]:
+            length += self.lengths.pop(self.starts.pop(idx))
+
+        # 与前一个合并
+        if idx > 0:
+            prev = self.starts[idx - 1]
+            if prev + self.lengths[prev] == start:
+                self.lengths[prev] += length
+                return
+
+        self.starts.insert(idx, start)
+        self.lengths[start] = length
+
+
+class ArenaBackend:
+    """竞技场后端 - 单次PROT_NONE/MAP_NORESERVE预留，分配=mprotect+触页，释放=madvise+mprotect"""
+
+    name = 'arena'
+
+    def __init__(self, size_bytes=None):
+        if _libc is None:
+            raise OSError("竞技场后端需要libc")
+
+        self.size = page_align(int(size_bytes or psutil.virtual_memory().total))
+        addr = _libc.mmap(None, self.size, PROT_NONE,
+                          mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS | MAP_NORESERVE, -1, 0)
+        if addr is None or addr == MAP_FAILED:
+            err = ctypes.get_errno()
+            raise OSError(err, f"预留失败: {os.strerror(err)}")
+
+        self.base = addr
+        self.view = memoryview((ctypes.c_char * self.size).from_address(addr)).cast('B')
+        self.intervals = IntervalMap(self.size)
+        self.lock = threading.Lock()
+
+    def _check(self, ret, what):
+        if ret != 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"{what}失败: {os.strerror(err)}")
+
+    def _offset(self, buf):
+        return buffer_address(buf) - self.base
+
+    def allocate(self, size_bytes):
+        """切出区间并开放读写（严格过量提交模式下此时计入提交量）"""
+        length = page_align(size_bytes)
+        with self.lock:
+            start = self.intervals.allocate(length)
+        if start is None:
+            raise MemoryError("竞技场空间不足")
+
+        if _libc.mprotect(self.base + start, length, PROT_RW) != 0:
+            with self.lock:
+                self.intervals.free(start, length)
+            raise MemoryError("竞技场区间提交失败")
+
+        return self.view[start:start + length]
+
+    def decommit(self, buf, offset, length):
+        """归还区间物理页，保持可写以便原地重新提交"""
+        if length <= 0:
+            return 0
+        start = self._offset(buf) + offset
+        self._check(_libc.madvise(self.base + start, length, mmap.MADV_DONTNEED), "madvise")
+        return length
+
+    def release(self, buf):
+        """归还物理页并恢复PROT_NONE，区间回到空闲表"""
+        start = self._offset(buf)
+        length = len(buf)
+        self._check(_libc.madvise(self.base + start, length, mmap.MADV_DONTNEED), "madvise")
+        self._check(_libc.mprotect(self.base + start, length, PROT_NONE), "mprotect")
+        try:
+            buf.release()
+        except BufferError:
+            pass
+        with self.lock:
+            self.intervals.free(start, length)
+
+    def close(self):
+        """解除整个预留（须在所有块释放后调用）"""
+        if self.view is None:
+            return
+        self.view.release()
+        self.view = None
+        _libc.munmap(self.base, self.size)
+
+    def stats(self):
+        """竞技场状态"""
+        return {
+            'reserved_mb': self.size / (1024*1024),
+            'allocated_mb': (self.size - self.intervals.free_bytes) / (1024*1024),
+            'free_intervals': len(self.intervals)
+        }
+
+
+BACKENDS[ArenaBackend.name] = ArenaBackend
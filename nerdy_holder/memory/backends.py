@@ -0,0 +1,72 @@
+"""内存块后端"""
+
+import mmap
+
+from .commit import madvise_buffer
+
+
+class BytearrayBackend:
+    """bytearray后端 - 整块依赖引用计数归还，区间可madvise归还"""
+
+    name = 'bytearray'
+
+    def allocate(self, size_bytes):
+        """分配缓冲区"""
+        return bytearray(size_bytes)
+
+    def decommit(self, buf, offset, length):
+        """归还区间内整页，返回归还字节数"""
+        return madvise_buffer(buf, offset, length)
+
+    def release(self, buf):
+        """释放 - 由引用计数归还，仍有引用时不会释放"""
+        pass
+
+
+class MmapBackend:
+    """匿名mmap后端 - madvise归还物理页，耗时与引用无关"""
+
+    name = 'mmap'
+
+    def __init__(self, advice='dontneed'):
+        # DONTNEED立即归还；FREE延迟到内存压力时由内核回收
+        self.advice = mmap.MADV_FREE if advice == 'free' else mmap.MADV_DONTNEED
+
+    def allocate(self, size_bytes):
+        """分配匿名映射"""
+        return mmap.mmap(-1, size_bytes, flags=mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS)
+
+    def decommit(self, buf, offset, length):
+        """归还区间物理页，虚拟地址保留，可原地重新提交，返回归还字节数"""
+        if length <= 0:
+            return 0
+        buf.madvise(self.advice, offset, length)
+        return length
+
+    def release(self, buf):
+        """释放 - 先madvise归还物理页，再解除映射"""
+        if buf.closed:
+            return
+        self.decommit(buf, 0, len(buf))
+        try:
+            buf.close()
+        except BufferError:
+            # 仍有导出引用，物理页已归还，虚拟区间随引用一起释放
+            pass
+
+
+BACKENDS = {
+    'bytearray': BytearrayBackend,
+    'mmap': MmapBackend,
+}
+
+
+def get_backend(backend, **options):
+    """按名称获取后端实例（options传给构造函数）"""
+    if backend is None:
+        return BytearrayBackend()
+    if isinstance(backend, str):
+        if backend not in BACKENDS:
+            raise ValueError(f"未知后端: {backend}")
+        return BACKENDS[backend](**options)
+    return backend
@@ -1,15 +1,76 @@
 """内存块"""
 
-import random
 from datetime import datetime
 
+from .backends import get_backend
+from .commit import PAGE_SIZE
+from .fill import fill_pages
+
 
 class MemoryChunk:
     """内存块"""
 
-    def __init__(self, size_mb):
+    def __init__(self, size_mb, backend=None, commit_method='stride', commit=True, fill='zero'):
         self.size_mb = size_mb
         self.created_at = datetime.now()
-        self.data = bytearray(size_mb * 1024 * 1024)
-        for i in range(0, len(self.data), 1024*1024):
-            self.data[i] = random.randint(0, 255)
+        self.backend = get_backend(backend)
+        self.commit_method = commit_method
+        self.fill = fill
+        self.data = self.backend.allocate(size_mb * 1024 * 1024)
+        self.committed_bytes = 0
+        if commit:
+            self.commit()
+
+    @classmethod
+    def adopt(cls, data, backend, committed_bytes):
+        """接管已存在的缓冲区（如重启前留下的共享段）"""
+        chunk = cls.__new__(cls)
+        chunk.size_mb = len(data) // (1024*1024)
+        chunk.created_at = datetime.now()
+        chunk.backend = backend
+        chunk.commit_method = 'stride'
+        chunk.fill = 'zero'
+        chunk.data = data
+        chunk.committed_bytes = committed_bytes
+        return chunk
+
+    @property
+    def committed(self):
+        return self.committed_bytes > 0
+
+    @property
+    def committed_mb(self):
+        """实际提交量(MB)"""
+        return self.committed_bytes / (1024*1024)
+
+    def commit(self):
+        """按填充策略逐页提交（可在decommit后原地重新提交）"""
+        if hasattr(self.backend, 'commit'):
+            # 后端自行提交（如模拟后端，不触碰真实页）
+            self.committed_bytes = self.backend.commit(self.data)
+        else:
+            self.committed_bytes = fill_pages(self.data, policy=self.fill, method=self.commit_method)
+        return self.committed_bytes
+
+    def decommit(self):
+        """归还物理页，保留虚拟区间"""
+        freed = self.backend.decommit(self.data, 0, len(self.data))
+        self.committed_bytes = max(0, self.committed_bytes - freed)
+
+    def shrink(self, mb):
+        """从已提交区尾部原地归还约mb（按页对齐），返回实际归还字节数"""
+        length = min(int(mb * 1024 * 1024) // PAGE_SIZE * PAGE_SIZE, self.committed_bytes)
+        if length <= 0:
+            return 0
+
+        freed = self.backend.decommit(self.data, self.committed_bytes - length, length)
+        self.committed_bytes -= freed
+        return freed
+
+    def release(self):
+        """释放内存块"""
+        if self.data is None:
+            return
+        self.backend.release(self.data)
+        self.data = None
+        self.committed_bytes = 0
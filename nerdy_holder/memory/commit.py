@@ -0,0 +1,86 @@
+"""页级提交引擎"""
+
+import os
+import mmap
+import ctypes
+import psutil
+
+PAGE_SIZE = mmap.PAGESIZE
+
+COMMIT_METHODS = ('stride', 'memset')
+
+try:
+    _libc = ctypes.CDLL(None, use_errno=True)
+    _libc.madvise.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int]
+except (OSError, AttributeError):
+    _libc = None
+
+
+def page_align(size):
+    """向上对齐到页"""
+    return (size + PAGE_SIZE - 1) // PAGE_SIZE * PAGE_SIZE
+
+
+def touch_pages(buf, offset=0, length=None, method='stride'):
+    """逐页写入，确保区间内每一页都被内核实际提交
+
+    stride: 步长切片赋值，每页写一个字节（C层向量化）
+    memset: ctypes memset整段写入，调用期间释放GIL
+
+    返回提交的字节数（按页计）
+    """
+    if length is None:
+        length = len(buf) - offset
+    if length <= 0:
+        return 0
+
+    if method == 'memset':
+        region = (ctypes.c_char * length).from_buffer(buf, offset)
+        try:
+            ctypes.memset(region, 0xA5, length)
+        finally:
+            del region
+    elif method == 'stride':
+        pages = (length + PAGE_SIZE - 1) // PAGE_SIZE
+        view = memoryview(buf)
+        try:
+            view[offset:offset + length:PAGE_SIZE] = os.urandom(pages)
+        finally:
+            view.release()
+    else:
+        raise ValueError(f"未知提交方式: {method}")
+
+    return min(page_align(length), len(buf) - offset)
+
+
+def buffer_address(buf):
+    """缓冲区起始地址"""
+    region = (ctypes.c_char * 1).from_buffer(buf)
+    try:
+        return ctypes.addressof(region)
+    finally:
+        del region
+
+
+def madvise_buffer(buf, offset, length, advice=mmap.MADV_DONTNEED):
+    """对任意可写缓冲区内的整页区间调用madvise，返回作用字节数
+
+    区间按地址向内对齐到页，不足一页的首尾不处理
+    """
+    if _libc is None or length <= 0:
+        return 0
+
+    start = buffer_address(buf) + offset
+    aligned_start = page_align(start)
+    aligned_end = (start + length) // PAGE_SIZE * PAGE_SIZE
+    if aligned_end <= aligned_start:
+        return 0
+
+    if _libc.madvise(aligned_start, aligned_end - aligned_start, advice) != 0:
+        return 0
+    return aligned_end - aligned_start
+
+
+def get_rss_bytes():
+    """当前进程RSS"""
+    return psutil.Process().memory_info().rss
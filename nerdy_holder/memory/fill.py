@@ -0,0 +1,128 @@
+"""填充策略 - 防止持有页被zswap/zram压缩或被KSM合并
+
+zero:   只提交页（每页一个字节），内容几乎全零，最便宜但可被压缩/合并
+header: 每页开头写入8字节全局唯一序号，防KSM合并，仍可被压缩
+random: 平铺随机种子块 + 每页唯一序号，不可压缩也不可合并
+"""
+
+import os
+import time
+import zlib
+import array
+import ctypes
+import threading
+
+from .commit import touch_pages, page_align, PAGE_SIZE
+
+FILL_POLICIES = ('zero', 'header', 'random')
+SEED_BYTES = 1024 * 1024
+
+_serial_lock = threading.Lock()
+_next_serial = int.from_bytes(os.urandom(8), 'little') >> 16
+
+
+def _reserve_serials(count):
+    """预留一段页序号（进程内唯一，起点随机以区分进程）"""
+    global _next_serial
+    with _serial_lock:
+        start = _next_serial
+        _next_serial += count
+    return start
+
+
+def write_headers(buf, offset=0, length=None):
+    """每页开头写入唯一的64位序号，返回写入页数
+
+    以'Q'视图的步长切片一次写完，不逐页循环
+    """
+    if length is None:
+        length = len(buf) - offset
+    length -= length % 8
+    if length <= 0:
+        return 0
+
+    view = memoryview(buf)
+    try:
+        words = view[offset:offset + length].cast('B').cast('Q')
+        stride = PAGE_SIZE // 8
+        pages = (len(words) + stride - 1) // stride
+        start = _reserve_serials(pages)
+        words[::stride] = array.array('Q', range(start, start + pages))
+        words.release()
+    finally:
+        view.release()
+    return pages
+
+
+def fill_random(buf, offset=0, length=None, seed=None):
+    """平铺随机种子块（ctypes memmove，调用期间释放GIL）再写页序号"""
+    if length is None:
+        length = len(buf) - offset
+    if length <= 0:
+        return 0
+
+    if seed is None:
+        seed = os.urandom(min(SEED_BYTES, length))
+
+    region = (ctypes.c_char * length).from_buffer(buf, offset)
+    try:
+        base = ctypes.addressof(region)
+        pos = 0
+        while pos < length:
+            n = min(len(seed), length - pos)
+            ctypes.memmove(base + pos, seed, n)
+            pos += n
+    finally:
+        del region
+
+    # 种子块按周期重复，序号保证每页内容不同
+    write_headers(buf, offset, length)
+    return min(page_align(length), len(buf) - offset)
+
+
+def fill_pages(buf, offset=0, length=None, policy='zero', method='stride'):
+    """按填充策略提交区间，返回提交字节数（按页计）"""
+    if length is None:
+        length = len(buf) - offset
+    if length <= 0:
+        return 0
+
+    if policy == 'zero':
+        return touch_pages(buf, offset, length, method)
+    if policy == 'header':
+        write_headers(buf, offset, length)
+        return min(page_align(length), len(buf) - offset)
+    if policy == 'random':
+        return fill_random(buf, offset, length)
+    raise ValueError(f"未知填充策略: {policy}")
+
+
+def compress_ratio(buf, sample_pages=64):
+    """抽样页的zlib压缩比（压缩后/原始），接近1表示不可压缩"""
+    sample = bytes(memoryview(buf)[:sample_pages * PAGE_SIZE])
+    if not sample:
+        return 1.0
+    return len(zlib.compress(sample, 1)) / len(sample)
+
+
+def benchmark_fill(size_mb, policies=FILL_POLICIES, backend='mmap'):
+    """各填充策略的吞吐量与抽样压缩比"""
+    from .chunk import MemoryChunk
+
+    results = []
+    for policy in policies:
+        chunk = MemoryChunk(size_mb, backend, commit=False, fill=policy)
+        start = time.perf_counter()
+        committed = chunk.commit()
+        elapsed = time.perf_counter() - start
+        ratio = compress_ratio(chunk.data)
+        chunk.release()
+
+        results.append({
+            'policy': policy,
+            'seconds': elapsed,
+            'mb_per_sec': committed / (1024*1024) / max(elapsed, 1e-9),
+            'compress_ratio': ratio
+        })
+
+    return results
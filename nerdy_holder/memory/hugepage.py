@@ -0,0 +1,102 @@
+"""透明大页(THP)支持"""
+
+import mmap
+from pathlib import Path
+
+from .backends import MmapBackend, BACKENDS
+from .commit import buffer_address
+
+THP_ROOT = '/sys/kernel/mm/transparent_hugepage'
+
+
+def _read_choice(path):
+    """读取形如 'always [madvise] never' 的选项"""
+    try:
+        text = Path(path).read_text().strip()
+    except OSError:
+        return None
+    for word in text.split():
+        if word.startswith('[') and word.endswith(']'):
+            return word[1:-1]
+    return text or None
+
+
+def get_hugepage_size(root=THP_ROOT):
+    """PMD大页大小"""
+    try:
+        return int(Path(root, 'hpage_pmd_size').read_text().strip())
+    except (OSError, ValueError):
+        return 2 * 1024 * 1024
+
+
+def thp_status(root=THP_ROOT):
+    """内核THP策略"""
+    enabled = _read_choice(Path(root, 'enabled'))
+    return {
+        'enabled': enabled or 'unsupported',
+        'defrag': _read_choice(Path(root, 'defrag')) or 'unsupported',
+        'available': enabled in ('always', 'madvise'),
+        'hugepage_size': get_hugepage_size(root)
+    }
+
+
+def get_anon_huge_bytes(pid='self'):
+    """进程中由大页支撑的匿名内存（smaps AnonHugePages）"""
+    for name in ('smaps_rollup', 'smaps'):
+        try:
+            with open(f'/proc/{pid}/{name}', 'r') as f:
+                total_kb = 0
+                for line in f:
+                    if line.startswith('AnonHugePages:'):
+                        total_kb += int(line.split()[1])
+                return total_kb * 1024
+        except OSError:
+            continue
+    return 0
+
+
+class HugepageBackend(MmapBackend):
+    """大页后端 - 按大页对齐的匿名映射 + MADV_HUGEPAGE"""
+
+    name = 'hugepage'
+
+    def __init__(self, advice='dontneed'):
+        super().__init__(advice)
+        self.hugepage_size = get_hugepage_size()
+
+    def allocate(self, size_bytes):
+        """多映射一个大页，取对齐后的区间"""
+        hp = self.hugepage_size
+        size = (size_bytes + hp - 1) // hp * hp
+        region = mmap.mmap(-1, size + hp, flags=mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS)
+
+        offset = -buffer_address(region) % hp
+        try:
+            region.madvise(mmap.MADV_HUGEPAGE, offset, size)
+        except OSError:
+            # 内核不支持THP，退化为普通页
+            pass
+        return memoryview(region)[offset:offset + size]
+
+    def decommit(self, buf, offset, length):
+        """归还区间物理页"""
+        if length <= 0:
+            return 0
+        base = buffer_address(buf) - buffer_address(buf.obj)
+        buf.obj.madvise(self.advice, base + offset, length)
+        return length
+
+    def release(self, buf):
+        """释放 - 归还整个映射后解除"""
+        region = buf.obj
+        if region.closed:
+            return
+        region.madvise(self.advice)
+        buf.release()
+        try:
+            region.close()
+        except BufferError:
+            pass
+
+
+BACKENDS[HugepageBackend.name] = HugepageBackend
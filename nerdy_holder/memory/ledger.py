@@ -0,0 +1,136 @@
+"""内存块账本 - 运行总量 + 按大小分桶"""
+
+import bisect
+import threading
+from itertools import islice
+
+MB = 1024 * 1024
+
+
+class ChunkLedger:
+    """内存块账本
+
+    维护提交量/名义量/块数的运行总量，按提交MB分桶（桶数受块大小上限约束），
+    查询与挑选释放集合的代价与块总数无关。修改操作持有可重入锁。
+    """
+
+    def __init__(self):
+        self.buckets = {}          # 大小级(MB) -> {id: chunk}
+        self.size_classes = []     # 有序大小级
+        self.committed_bytes = 0
+        self.nominal_mb = 0
+        self.count = 0
+        # 分配与释放可能在不同线程（异步运行时/看门狗）
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def size_class(chunk):
+        """块所属大小级"""
+        return chunk.committed_bytes // MB
+
+    @property
+    def holding_mb(self):
+        """实际提交量(MB)"""
+        return self.committed_bytes / MB
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        with self.lock:
+            chunks = [c for cls in self.size_classes for c in self.buckets[cls].values()]
+        return iter(chunks)
+
+    def add(self, chunk):
+        """登记内存块"""
+        with self.lock:
+            cls = self.size_class(chunk)
+            bucket = self.buckets.get(cls)
+            if bucket is None:
+                bucket = self.buckets[cls] = {}
+                bisect.insort(self.size_classes, cls)
+            bucket[id(chunk)] = chunk
+            chunk.ledger_class = cls
+
+            self.committed_bytes += chunk.committed_bytes
+            self.nominal_mb += chunk.size_mb
+            self.count += 1
+
+    def remove(self, chunk):
+        """注销内存块"""
+        with self.lock:
+            cls = chunk.ledger_class
+            bucket = self.buckets[cls]
+            del bucket[id(chunk)]
+            if not bucket:
+                del self.buckets[cls]
+                self.size_classes.pop(bisect.bisect_left(self.size_classes, cls))
+
+            self.committed_bytes -= chunk.committed_bytes
+            self.nominal_mb -= chunk.size_mb
+            self.count -= 1
+
+    def clear(self):
+        """清空并释放所有块"""
+        with self.lock:
+            for chunk in self:
+                chunk.release()
+            self.buckets.clear()
+            self.size_classes.clear()
+            self.committed_bytes = 0
+            self.nominal_mb = 0
+            self.count = 0
+
+    def shrink(self, chunk, mb):
+        """原地缩小块并更新总量/大小级，返回归还字节数"""
+        with self.lock:
+            self.remove(chunk)
+            freed = chunk.shrink(mb)
+            if chunk.committed_bytes > 0:
+                self.add(chunk)
+            else:
+                chunk.release()
+            return freed
+
+    def plan_release(self, target_mb):
+        """规划精确释放：整块取不超过target_mb的部分，余量由一个块尾部归还
+
+        返回 (整块列表, 部分释放块, 部分释放MB)
+        """
+        with self.lock:
+            if target_mb <= 0 or not self.count:
+                return [], None, 0
+
+            whole = []
+            taken = {}
+            remaining = target_mb
+
+            for cls in reversed(self.size_classes):
+                if remaining < cls:
+                    continue
+                bucket = self.buckets[cls]
+                # 不足1MB的尾块（部分释放后留下）按1MB计数，保证不超过target_mb
+                batch = list(islice(bucket.values(), min(len(bucket), int(remaining // max(cls, 1)))))
+                whole.extend(batch)
+                taken[cls] = len(batch)
+                remaining -= sum(c.committed_mb for c in batch)
+                if remaining <= 0:
+                    return whole, None, 0
+
+            for cls in self.size_classes[bisect.bisect_left(self.size_classes, remaining):]:
+                bucket = self.buckets[cls]
+                if len(bucket) > taken.get(cls, 0):
+                    partial = next(islice(bucket.values(), taken.get(cls, 0), None))
+                    return whole, partial, remaining
+
+            return whole, None, 0
+
+    def select_for_release(self, target_mb):
+        """挑选整块释放集合：覆盖target_mb且超出最少
+
+        复杂度 O(大小级数 + 选中块数)
+        """
+        whole, partial, _ = self.plan_release(target_mb)
+        if partial is not None:
+            whole.append(partial)
+        return whole
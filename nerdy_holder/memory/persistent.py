@@ -0,0 +1,246 @@
+"""持久化后端 - 持有量保存在tmpfs文件或memfd中，可跨进程重启接管"""
+
+import os
+import mmap
+import uuid
+import fcntl
+import socket
+import array
+from pathlib import Path
+
+from .backends import BACKENDS
+
+SHM_DIR = '/dev/shm'
+SEGMENT_PREFIX = 'nerdy-holder-'
+LOCK_NAME = 'nerdy-holder.lock'
+
+
+def sd_notify(state, fds=None):
+    """向systemd发送通知（可附带文件描述符），无NOTIFY_SOCKET时返回False"""
+    path = os.environ.get('NOTIFY_SOCKET')
+    if not path:
+        return False
+    if path.startswith('@'):
+        path = '\0' + path[1:]
+
+    ancillary = []
+    if fds:
+        ancillary.append((socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', fds).tobytes()))
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.connect(path)
+            sock.sendmsg([state.encode()], ancillary)
+        return True
+    except OSError:
+        return False
+
+
+def listen_fds():
+    """systemd传回的文件描述符 [(fd, name)]"""
+    if os.environ.get('LISTEN_PID') != str(os.getpid()):
+        return []
+    count = int(os.environ.get('LISTEN_FDS', '0'))
+    names = os.environ.get('LISTEN_FDNAMES', '').split(':')
+    names += [''] * (count - len(names))
+    return [(3 + i, names[i]) for i in range(count)]
+
+
+class SegmentBackend:
+    """基于共享文件段的后端基类 - 每块一个段，保持fd打开"""
+
+    name = 'segment'
+    persistent = True
+
+    def __init__(self):
+        self.segments = {}   # id(buf) -> (fd, name)
+
+    def _map(self, fd, size, name):
+        buf = mmap.mmap(fd, size, flags=mmap.MAP_SHARED)
+        self.segments[id(buf)] = (fd, name)
+        return buf
+
+    def _create(self, size_bytes):
+        """创建段，返回 (fd, name)"""
+        raise NotImplementedError
+
+    def _forget(self, fd, name):
+        """段被释放"""
+        pass
+
+    def allocate(self, size_bytes):
+        """创建共享段并映射"""
+        fd, name = self._create(size_bytes)
+        os.ftruncate(fd, size_bytes)
+        return self._map(fd, size_bytes, name)
+
+    def fileno(self, buf):
+        """段的文件描述符"""
+        return self.segments[id(buf)][0]
+
+    def segment_name(self, buf):
+        """段名"""
+        return self.segments[id(buf)][1]
+
+    def detach(self, buf):
+        """解除本进程映射但保留段（已交给其他进程）"""
+        fd, _ = self.segments.pop(id(buf))
+        try:
+            buf.close()
+        except BufferError:
+            pass
+        os.close(fd)
+
+    def committed_bytes(self, buf):
+        """段实际占用（按已分配块计）"""
+        return os.fstat(self.fileno(buf)).st_blocks * 512
+
+    def decommit(self, buf, offset, length):
+        """打洞归还共享页（MADV_DONTNEED对共享映射不释放页）"""
+        if length <= 0:
+            return 0
+        buf.madvise(mmap.MADV_REMOVE, offset, length)
+        return length
+
+    def release(self, buf):
+        """删除段"""
+        fd, name = self.segments.pop(id(buf))
+        self._forget(fd, name)
+        try:
+            buf.close()
+        except BufferError:
+            buf.madvise(mmap.MADV_REMOVE)
+        os.close(fd)
+
+    def adopt_fd(self, fd, name):
+        """接管已有段，返回缓冲区"""
+        size = os.fstat(fd).st_size
+        if size <= 0:
+            return None
+        return self._map(fd, size, name)
+
+
+class ShmBackend(SegmentBackend):
+    """tmpfs后端 - 段为/dev/shm下的命名文件，进程退出后仍保留
+
+    lock=False 用于在线交接的继任者：旧进程仍持有目录锁，锁的fd随段一起传来（adopt_lock）
+    """
+
+    name = 'shm'
+
+    def __init__(self, directory=SHM_DIR, prefix=SEGMENT_PREFIX, lock=True):
+        super().__init__()
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.lock_fd = None
+        if lock:
+            self.lock_fd = acquire_lock(self.directory)
+            if self.lock_fd is None:
+                raise RuntimeError(f"另一个holder正在使用 {self.directory}")
+
+    def adopt_lock(self, fd):
+        """接管旧进程的目录锁（flock属于打开的文件，旧进程退出后锁仍由本进程持有）"""
+        if self.lock_fd is not None:
+            os.close(self.lock_fd)
+        self.lock_fd = fd
+
+    def _create(self, size_bytes):
+        path = self.directory / f"{self.prefix}{uuid.uuid4().hex}"
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+        return fd, str(path)
+
+    def _forget(self, fd, name):
+        try:
+            os.unlink(name)
+        except FileNotFoundError:
+            pass
+
+    def adopt(self):
+        """接管目录中遗留的段"""
+        adopted = []
+        for path in sorted(self.directory.glob(f"{self.prefix}*")):
+            fd = os.open(path, os.O_RDWR)
+            buf = self.adopt_fd(fd, str(path))
+            if buf is None:
+                os.close(fd)
+                os.unlink(path)
+                continue
+            adopted.append(buf)
+        return adopted
+
+
+class MemfdBackend(SegmentBackend):
+    """memfd后端 - 匿名段，通过systemd fd存储跨重启保留"""
+
+    name = 'memfd'
+
+    def __init__(self, prefix=SEGMENT_PREFIX):
+        super().__init__()
+        self.prefix = prefix
+
+    def _create(self, size_bytes):
+        name = f"{self.prefix}{uuid.uuid4().hex}"
+        fd = os.memfd_create(name)
+        # 交给systemd保管，重启后由LISTEN_FDS传回
+        sd_notify(f"FDSTORE=1\nFDNAME={name}", [fd])
+        return fd, name
+
+    def _forget(self, fd, name):
+        sd_notify(f"FDSTOREREMOVE=1\nFDNAME={name}")
+
+    def adopt_fd(self, fd, name):
+        """接管段并交给本进程的systemd fd存储"""
+        buf = super().adopt_fd(fd, name)
+        if buf is not None:
+            sd_notify(f"FDSTORE=1\nFDNAME={name}", [fd])
+        return buf
+
+    def adopt(self):
+        """接管systemd传回的段"""
+        adopted = []
+        for fd, name in listen_fds():
+            if not name.startswith(self.prefix):
+                continue
+            buf = self.adopt_fd(fd, name)
+            if buf is None:
+                sd_notify(f"FDSTOREREMOVE=1\nFDNAME={name}")
+                os.close(fd)
+                continue
+            adopted.append(buf)
+        return adopted
+
+
+def acquire_lock(directory=SHM_DIR):
+    """获取目录锁（非阻塞），已被占用返回None"""
+    fd = os.open(Path(directory) / LOCK_NAME, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def cleanup_segments(directory=SHM_DIR, prefix=SEGMENT_PREFIX):
+    """清理无主段，返回 (段数, MB)；有holder运行时返回None"""
+    lock_fd = acquire_lock(directory)
+    if lock_fd is None:
+        return None
+
+    try:
+        count = 0
+        total = 0
+        for path in Path(directory).glob(f"{prefix}*"):
+            try:
+                total += path.stat().st_blocks * 512
+                path.unlink()
+                count += 1
+            except FileNotFoundError:
+                continue
+        return count, total / (1024*1024)
+    finally:
+        os.close(lock_fd)
+
+
+BACKENDS[ShmBackend.name] = ShmBackend
+BACKENDS[MemfdBackend.name] = MemfdBackend
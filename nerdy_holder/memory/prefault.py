@@ -0,0 +1,115 @@
+"""并行预提交 - 多线程分段提交大块内存"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from .commit import PAGE_SIZE
+from .fill import fill_pages
+
+
+def default_workers():
+    """按CPU数确定线程数"""
+    return max(1, os.cpu_count() or 1)
+
+
+class ParallelPrefaulter:
+    """并行预提交器 - 线程池中用memset分段提交（释放GIL）"""
+
+    def __init__(self, workers=None, max_mb_per_sec=None, segment_mb=64):
+        self.workers = workers or default_workers()
+        self.max_mb_per_sec = max_mb_per_sec
+        self.segment_bytes = max(PAGE_SIZE, segment_mb * 1024 * 1024 // PAGE_SIZE * PAGE_SIZE)
+
+        self.executor = ThreadPoolExecutor(max_workers=self.workers,
+                                           thread_name_prefix='nerdy-prefault')
+
+        # 限速：全局令牌桶，按字节预约时间片
+        self._rate_lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def throttle(self, nbytes):
+        """限速等待（串行提交前也调用，--prefault-rate 对所有提交路径生效）"""
+        if not self.max_mb_per_sec:
+            return
+
+        with self._rate_lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot)
+            self._next_slot = start + nbytes / (self.max_mb_per_sec * 1024 * 1024)
+
+        if start > now:
+            time.sleep(start - now)
+
+    def _touch(self, buf, offset, length, policy):
+        self.throttle(length)
+        return fill_pages(buf, offset, length, policy, method='memset')
+
+    def commit(self, chunks):
+        """并行提交多个内存块，返回提交字节数
+
+        任一分段失败时取消未开始的分段、等待进行中的分段结束后再抛出，
+        调用方此时可以安全释放这些块
+        """
+        jobs = []
+        for chunk in chunks:
+            size = len(chunk.data)
+            for offset in range(0, size, self.segment_bytes):
+                length = min(self.segment_bytes, size - offset)
+                jobs.append((chunk, self.executor.submit(self._touch, chunk.data, offset, length, chunk.fill)))
+
+        committed = {}
+        try:
+            for chunk, future in jobs:
+                committed[id(chunk)] = committed.get(id(chunk), 0) + future.result()
+        except BaseException:
+            for _, future in jobs:
+                future.cancel()
+            wait([future for _, future in jobs])
+            raise
+
+        total = 0
+        for chunk in chunks:
+            chunk.committed_bytes = committed.get(id(chunk), 0)
+            total += chunk.committed_bytes
+        return total
+
+    def shutdown(self):
+        """关闭线程池"""
+        self.executor.shutdown(wait=True)
+
+
+def benchmark_prefault(size_mb, worker_counts=None, backend='mmap', chunk_mb=500):
+    """启动基准 - 不同线程数下达到目标的耗时"""
+    from .chunk import MemoryChunk
+
+    if worker_counts is None:
+        worker_counts = sorted({1, 2, 4, default_workers()})
+
+    results = []
+    for workers in worker_counts:
+        chunks = []
+        remaining = size_mb
+        while remaining > 0:
+            chunk_size = min(chunk_mb, remaining)
+            chunks.append(MemoryChunk(chunk_size, backend, commit=False))
+            remaining -= chunk_size
+
+        prefaulter = ParallelPrefaulter(workers)
+        start = time.perf_counter()
+        committed = prefaulter.commit(chunks)
+        elapsed = time.perf_counter() - start
+        prefaulter.shutdown()
+
+        for chunk in chunks:
+            chunk.release()
+
+        results.append({
+            'workers': workers,
+            'seconds': elapsed,
+            'committed_mb': committed / (1024*1024),
+            'mb_per_sec': committed / (1024*1024) / max(elapsed, 1e-9)
+        })
+
+    return results
@@ -1,5 +1,14 @@
 """优化器模块"""
 
 from .parameter import ParameterOptimizer
+from .bayesian import GaussianProcess, BayesianOptimizer, OPTIMIZERS, get_optimizer
+from .shadow import ShadowPool
 
-__all__ = ['ParameterOptimizer']
+__all__ = [
+    'ParameterOptimizer',
+    'GaussianProcess',
+    'BayesianOptimizer',
+    'OPTIMIZERS',
+    'get_optimizer',
+    'ShadowPool'
+]
@@ -0,0 +1,198 @@
+"""代理模型探索 - 高斯过程拟合 参数向量 → 得分/最大误差，按期望提升选下一组参数"""
+
+import math
+import time
+import random
+from collections import deque
+
+from .parameter import ParameterOptimizer
+
+
+class GaussianProcess:
+    """高斯过程回归（RBF核，纯Python，样本数几十以内）
+
+    输入为归一化到[0,1]的参数向量，多个输出共用同一核矩阵
+    """
+
+    def __init__(self, lengthscale, noise=0.1):
+        self.lengthscale = lengthscale
+        self.noise = noise
+        self.points = []
+        self.chol = []
+        self.weights = []
+        self.scales = []
+
+    def kernel(self, a, b):
+        distance = sum((x - y) ** 2 for x, y in zip(a, b))
+        return math.exp(-0.5 * distance / self.lengthscale ** 2)
+
+    def _solve_lower(self, b):
+        """解 L x = b"""
+        L = self.chol
+        x = []
+        for i, row in enumerate(L):
+            x.append((b[i] - sum(row[j] * x[j] for j in range(i))) / row[i])
+        return x
+
+    def _solve_upper(self, b):
+        """解 L^T x = b"""
+        L = self.chol
+        n = len(L)
+        x = [0.0] * n
+        for i in reversed(range(n)):
+            x[i] = (b[i] - sum(L[j][i] * x[j] for j in range(i + 1, n))) / L[i][i]
+        return x
+
+    def fit(self, points, outputs):
+        """points: [向量]；outputs: 每个输出一列观测值，内部按均值/标准差标准化"""
+        self.points = [list(p) for p in points]
+        n = len(points)
+
+        # Cholesky分解 K + noise*I
+        L = [[0.0] * n for _ in range(n)]
+        for i in range(n):
+            for j in range(i + 1):
+                value = self.kernel(points[i], points[j]) - sum(L[i][k] * L[j][k] for k in range(j))
+                if i == j:
+                    L[i][i] = math.sqrt(max(value + self.noise, 1e-12))
+                else:
+                    L[i][j] = value / L[j][j]
+        self.chol = L
+
+        self.weights = []
+        self.scales = []
+        for values in outputs:
+            mean = sum(values) / n
+            std = math.sqrt(sum((v - mean) ** 2 for v in values) / n) or 1.0
+            normalized = [(v - mean) / std for v in values]
+            self.weights.append(self._solve_upper(self._solve_lower(normalized)))
+            self.scales.append((mean, std))
+
+    def predict(self, point):
+        """返回每个输出的 (均值, 标准差)"""
+        k = [self.kernel(point, p) for p in self.points]
+        v = self._solve_lower(k)
+        variance = max(1e-12, 1.0 - sum(x * x for x in v))
+        result = []
+        for weights, (mean, std) in zip(self.weights, self.scales):
+            mu = sum(a * b for a, b in zip(k, weights))
+            result.append((mean + mu * std, math.sqrt(variance) * std))
+        return result
+
+
+def expected_improvement(mu, sigma, best):
+    """期望提升（最大化）"""
+    if sigma <= 0:
+        return max(0.0, mu - best)
+    z = (mu - best) / sigma
+    cdf = 0.5 * (1 + math.erf(z / math.sqrt(2)))
+    pdf = math.exp(-0.5 * z * z) / math.sqrt(2 * math.pi)
+    return (mu - best) * cdf + sigma * pdf
+
+
+class BayesianOptimizer(ParameterOptimizer):
+    """代理模型探索 - 覆盖完整参数向量（含PID增益和EMA系数）
+
+    每次评估（探索开始时的现参数、探索期满时的候选参数）记为一个样本；
+    探索时在现参数附近和全范围内采样候选，排除预测最大误差可能超过 max_error 的，
+    取期望提升最大的一组。评估与回滚沿用 ParameterOptimizer.maybe_optimize。
+    """
+
+    name = 'bayesian'
+
+    MIN_TRIALS = 4          # 样本不足时在现参数附近随机扰动
+    SAFETY_SIGMA = 1.0      # 最大误差约束：均值 + SAFETY_SIGMA × 标准差 <= max_error
+
+    def __init__(self, config_file='nerdy_params.json', clock=time, rng=random,
+                 max_error=5.0, candidates=100, history=30, radius=0.15):
+        super().__init__(config_file, clock, rng)
+        self.max_error = max_error
+        self.candidates = candidates
+        self.radius = radius
+        self.names = tuple(self.PARAM_LIMITS)
+        self.trials = deque(maxlen=history)
+
+        # 每次评估都有建模价值：提高探索频率，放宽连续失败暂停
+        self.exploration_rate = 0.5
+        self.max_consecutive_worse = 8
+
+    def encode(self, params):
+        """参数 → [0,1]向量"""
+        vector = []
+        for name in self.names:
+            low, high = self.PARAM_LIMITS[name]
+            vector.append(min(1.0, max(0.0, (params[name] - low) / (high - low))))
+        return vector
+
+    def decode(self, vector):
+        """[0,1]向量 → 参数"""
+        params = {}
+        for name, x in zip(self.names, vector):
+            low, high = self.PARAM_LIMITS[name]
+            params[name] = round(low + min(1.0, max(0.0, x)) * (high - low), 4)
+        return params
+
+    def exploration_backup(self):
+        return {name: self.params[name] for name in self.names}
+
+    def record_trial(self, score, stats):
+        self.trials.append((self.encode(self.params), score, stats.get('max_error', stats['avg_error'])))
+
+    def perturb(self, vector, radius):
+        return [min(1.0, max(0.0, x + self.rng.gauss(0, radius))) for x in vector]
+
+    def propose(self):
+        """选择下一组参数向量，没有安全候选时返回None"""
+        current = self.encode(self.params)
+        if len(self.trials) < self.MIN_TRIALS:
+            return self.perturb(current, self.radius)
+
+        points = [t[0] for t in self.trials]
+        scores = [t[1] for t in self.trials]
+        errors = [t[2] for t in self.trials]
+        gp = GaussianProcess(lengthscale=0.2 * math.sqrt(len(self.names)))
+        gp.fit(points, [scores, errors])
+
+        # 候选：多数在现参数/最佳样本附近，少数在全范围
+        best_point = points[max(range(len(scores)), key=scores.__getitem__)]
+        pool = []
+        for i in range(self.candidates):
+            if i % 4 == 3:
+                pool.append([self.rng.random() for _ in self.names])
+            else:
+                pool.append(self.perturb(best_point if i % 2 else current, self.radius))
+
+        best_score = max(scores)
+        proposal, best_gain = None, -1.0
+        for point in pool:
+            (score_mu, score_sd), (error_mu, error_sd) = gp.predict(point)
+            if error_mu + self.SAFETY_SIGMA * error_sd > self.max_error:
+                continue
+            gain = expected_improvement(score_mu, score_sd, best_score)
+            if gain > best_gain:
+                proposal, best_gain = point, gain
+        return proposal
+
+    def explore(self, stats):
+        proposal = self.propose()
+        if proposal is None:
+            return False
+        self.params.update(self.decode(proposal))
+        return True
+
+
+OPTIMIZERS = {
+    ParameterOptimizer.name: ParameterOptimizer,
+    BayesianOptimizer.name: BayesianOptimizer,
+}
+
+
+def get_optimizer(optimizer=None, **options):
+    """按名称或实例获取优化器（options传给构造函数）"""
+    if optimizer is None:
+        return ParameterOptimizer(**options)
+    if isinstance(optimizer, str):
+        if optimizer not in OPTIMIZERS:
+            raise ValueError(f"未知优化器: {optimizer}")
+        return OPTIMIZERS[optimizer](**options)
+    return optimizer
@@ -9,13 +9,35 @@ from pathlib import Path
 class ParameterOptimizer:
     """参数优化器 - 带智能探索和回滚"""
 
-    def __init__(self, config_file='nerdy_params.json'):
+    name = 'random'
+
+    # 可探索参数的取值范围（在线探索与离线调参共用）
+    PARAM_LIMITS = {
+        'pid_kp': (1.0, 4.0),
+        'pid_ki': (0.05, 0.6),
+        'pid_kd': (0.2, 1.2),
+        'ema_fast': (0.2, 0.6),
+        'ema_slow': (0.03, 0.15),
+        'response_base': (1.0, 2.5),
+        'response_curve': (1.3, 2.5),
+        'urgency_threshold': (2.0, 5.0),
+        'cost_decay_release': (0.2, 0.5),
+        'cost_decay_allocate': (0.5, 1.2),
+        'min_interval_release': (1.0, 3.0),
+        'min_interval_allocate': (2.5, 5.0),
+    }
+
+    def __init__(self, config_file='nerdy_params.json', clock=time, rng=random):
+        # config_file为None时不读写参数文件（模拟/离线评估用）
         self.config_file = config_file
+        self.clock = clock
+        self.rng = rng
         self.params = self.load_params()
-        self.last_save = time.time()
+        self.last_save = clock.time()
 
         # 探索控制
         self.exploration_rate = 0.08
+        self.max_consecutive_worse = 3
         self.last_params_backup = None
         self.last_score = 0
         self.exploration_start_time = None
@@ -61,9 +83,11 @@ class ParameterOptimizer:
         }
 
         try:
-            if Path(self.config_file).exists():
+            if self.config_file and Path(self.config_file).exists():
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     loaded = json.load(f)
+                    # 早期离线调参把排名写在参数文件里，不是参数
+                    loaded.pop('tuning', None)
                     defaults.update(loaded)
         except Exception:
             pass
@@ -72,7 +96,10 @@ class ParameterOptimizer:
 
     def save_params(self, force=False):
         """保存参数"""
-        now = time.time()
+        if not self.config_file:
+            return
+
+        now = self.clock.time()
         if not force and (now - self.last_save) < 60:
             return
 
@@ -199,9 +226,10 @@ class ParameterOptimizer:
 
         # 检查探索状态
         if self.exploration_start_time:
-            time_in_exploration = time.time() - self.exploration_start_time
+            time_in_exploration = self.clock.time() - self.exploration_start_time
 
             if time_in_exploration > 60:
+                self.record_trial(current_score, stats)
                 if current_score < self.last_score - 3:
                     # 探索失败，回滚
                     if self.last_params_backup:
@@ -241,56 +269,66 @@ class ParameterOptimizer:
             return True, (current_score, scenario, scenario_improved)
 
         # 连续失败则暂停
-        if self.consecutive_worse >= 3:
+        if self.consecutive_worse >= self.max_consecutive_worse:
             return False, None
 
         # 尝试探索
-        if random.random() < self.exploration_rate:
-            self.last_params_backup = {
-                'response_base': self.params['response_base'],
-                'response_curve': self.params['response_curve'],
-                'urgency_threshold': self.params['urgency_threshold'],
-                'cost_decay_release': self.params['cost_decay_release'],
-                'cost_decay_allocate': self.params['cost_decay_allocate'],
-            }
+        if self.rng.random() < self.exploration_rate:
+            self.last_params_backup = self.exploration_backup()
             self.last_score = current_score
+            self.record_trial(current_score, stats)
 
-            self.explore_parameter_smart(stats)
-            self.exploration_start_time = time.time()
+            if not self.explore(stats):
+                return False, None
+            self.exploration_start_time = self.clock.time()
             return False, "开始探索"
 
         return False, None
 
+    def promote(self, params):
+        """采用在线下/影子中评估胜出的参数"""
+        self.params.update(params)
+        self.params['optimization_count'] += 1
+        self.save_params(force=True)
+
+    def exploration_backup(self):
+        """探索前备份的参数（回滚时恢复）"""
+        return {
+            'response_base': self.params['response_base'],
+            'response_curve': self.params['response_curve'],
+            'urgency_threshold': self.params['urgency_threshold'],
+            'cost_decay_release': self.params['cost_decay_release'],
+            'cost_decay_allocate': self.params['cost_decay_allocate'],
+        }
+
+    def record_trial(self, score, stats):
+        """记录当前参数下的一次评估（随机探索不使用）"""
+
+    def explore(self, stats):
+        """生成探索参数，返回是否开始探索"""
+        self.explore_parameter_smart(stats)
+        return True
+
     def explore_parameter_smart(self, stats):
         """智能探索 - 根据瓶颈调整"""
         if stats['avg_error'] > 3:
             # 误差大 → 增强响应
-            param = random.choice(['response_base', 'urgency_threshold'])
-            change = random.uniform(0.05, 0.15) * self.params[param]
+            param = self.rng.choice(['response_base', 'urgency_threshold'])
+            change = self.rng.uniform(0.05, 0.15) * self.params[param]
         elif stats['error_volatility'] > 2:
             # 波动大 → 增强阻尼
-            param = random.choice(['cost_decay_release', 'cost_decay_allocate'])
-            change = random.uniform(0.05, 0.15) * self.params[param]
+            param = self.rng.choice(['cost_decay_release', 'cost_decay_allocate'])
+            change = self.rng.uniform(0.05, 0.15) * self.params[param]
         elif stats['block_rate'] < 0.1:
             # 阻止太少 → 增强成本
-            param = random.choice(['cost_decay_allocate', 'min_interval_allocate'])
-            change = random.uniform(0.1, 0.2) * self.params[param]
+            param = self.rng.choice(['cost_decay_allocate', 'min_interval_allocate'])
+            change = self.rng.uniform(0.1, 0.2) * self.params[param]
         else:
             # 状态良好，小幅调整
-            param = random.choice(list(self.last_params_backup.keys()))
-            change = random.uniform(-0.08, 0.08) * self.params[param]
+            param = self.rng.choice(list(self.last_params_backup.keys()))
+            change = self.rng.uniform(-0.08, 0.08) * self.params[param]
 
         # 应用调整
         current = self.params[param]
-        limits = {
-            'response_base': (1.0, 2.5),
-            'response_curve': (1.3, 2.5),
-            'urgency_threshold': (2.0, 5.0),
-            'cost_decay_release': (0.2, 0.5),
-            'cost_decay_allocate': (0.5, 1.2),
-            'min_interval_release': (1.0, 3.0),
-            'min_interval_allocate': (2.5, 5.0),
-        }
-
-        min_val, max_val = limits.get(param, (0.1, 10))
+        min_val, max_val = self.PARAM_LIMITS.get(param, (0.1, 10))
         self.params[param] = max(min_val, min(max_val, current + change))
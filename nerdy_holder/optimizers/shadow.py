@@ -0,0 +1,145 @@
+"""影子控制器 - N组候选参数与线上控制器看到同一读数，只计算不执行
+
+每轮在现参数附近采样 count-1 组候选（第0组为现参数本身），从线上控制器的运行状态
+（PID、EMA、读数历史、上次调整）出发，用 BatchPipeline 的向量化决策流程逐轮推进：
+读数 = 估计的租户负载 + 各影子自己的持有量 × 对象增益。
+对象增益（每MB持有量对应的读数变化）由线上调整前后的读数按调整量加权最小二乘学习
+（带遗忘，先验为名义值 100/总量），每轮开始时固定。
+线上目标变化时所有影子同步换目标，一轮跨越目标变化继续累计。
+一轮满 window 秒后按 calculate_score 比较，最好的影子超过现参数 margin 分即提升。
+
+需要 numpy。
+"""
+
+MIN_RECORDS = 30         # 一轮至少的决策数
+MIN_LEARN_MB = 100       # 小于此调整量的读数变化主要是噪声
+GAIN_RANGE = 4.0         # 增益样本偏离名义值超过此倍数视为负载同时变化，丢弃
+PRIOR_MB = 2000          # 先验相当于一次这么大的名义调整
+
+
+class ShadowPool:
+    """影子控制器池
+
+    使用 holder 的 optimizer（现参数、参数范围、随机源）、算法组件状态和持有量
+    count:  影子数（含现参数），每次决策代价为一次 (count,) 数组运算
+    window: 每轮评估时长(秒)；margin: 提升所需的得分优势
+    """
+
+    def __init__(self, holder, count=16, window=1800, margin=3.0, radius=0.1, forgetting=0.98):
+        # simulation包依赖core，延迟导入
+        from ..simulation.replay import BatchPipeline, PARAM_NAMES, np
+        if np is None:
+            raise RuntimeError("影子评估需要numpy")
+        if count < 2:
+            raise ValueError(f"影子数至少为2: {count}")
+
+        self.pipeline_class = BatchPipeline
+        self.param_names = PARAM_NAMES
+        self.holder = holder
+        self.optimizer = holder.optimizer
+        self.total_mb = holder.total_bytes / (1024*1024)
+        self.count = count
+        self.window = window
+        self.margin = margin
+        self.radius = radius
+        self.forgetting = forgetting
+
+        # 加权最小二乘：gain = Σ(ΔMB·Δ%) / Σ(ΔMB²)
+        self.nominal_gain = 100 / self.total_mb
+        self.sxx = PRIOR_MB ** 2
+        self.sxy = self.nominal_gain * self.sxx
+        self.pipeline = None
+        self.started = None
+        self.stats = {'rounds': 0, 'ticks': 0, 'promotions': 0, 'gain_samples': 0}
+
+    def candidates(self):
+        """现参数 + 范围内高斯扰动的候选"""
+        live = {name: self.optimizer.params[name] for name in self.param_names}
+        candidates = [live]
+        for _ in range(self.count - 1):
+            candidate = dict(live)
+            for name, (low, high) in self.optimizer.PARAM_LIMITS.items():
+                value = live[name] + self.optimizer.rng.gauss(0, self.radius * (high - low))
+                candidate[name] = round(min(high, max(low, value)), 4)
+            candidates.append(candidate)
+        return candidates
+
+    def start(self, now, target, holding):
+        """开始新一轮：所有影子从线上持有量和控制器状态出发"""
+        holder = self.holder
+        pipeline = self.pipeline_class(self.candidates(), self.total_mb, target, plant_mb=100 / self.gain)
+        pipeline.holding[:] = holding
+        pipeline.load_state(
+            holder.pid_controller.get_state(),
+            holder.response_calculator.get_state(),
+            holder.ema_predictor.get_state(),
+            [value for _, value in holder.memory_history]
+        )
+        self.pipeline = pipeline
+        self.started = now
+        self.stats['rounds'] += 1
+
+    def observe(self, current):
+        """每次决策（线上已记录本轮读数、尚未计算PID时）：推进所有影子一步"""
+        holder = self.holder
+        now = holder.clock.time()
+        target = holder.current_target
+        holding = holder.get_holding_mb()
+
+        # 新一轮的第一步读数已在载入的历史和EMA中
+        observed = self.pipeline is None
+        if observed:
+            self.start(now, target, holding)
+        elif target != self.pipeline.target:
+            self.pipeline.set_target(target)
+        load = current - holding / self.pipeline.plant_mb * 100
+        self.pipeline.step(now, load, observed=observed)
+        self.stats['ticks'] += 1
+
+    def learn(self, delta_mb, delta_percent):
+        """线上调整 delta_mb(分配为正) 后读数变化 delta_percent，更新对象增益"""
+        if abs(delta_mb) < MIN_LEARN_MB:
+            return
+        sample = delta_percent / delta_mb
+        if not self.nominal_gain / GAIN_RANGE <= sample <= self.nominal_gain * GAIN_RANGE:
+            return
+        self.sxx = self.forgetting * self.sxx + delta_mb * delta_mb
+        self.sxy = self.forgetting * self.sxy + delta_mb * delta_percent
+        self.stats['gain_samples'] += 1
+
+    @property
+    def gain(self):
+        """对象增益（读数%/MB）"""
+        return self.sxy / self.sxx
+
+    def maybe_promote(self, now):
+        """一轮结束时返回应提升的影子 {'params', 'score', 'baseline'}，否则None"""
+        pipeline = self.pipeline
+        if pipeline is None or now - self.started < self.window or pipeline.records < MIN_RECORDS:
+            return None
+
+        # 下一轮在（可能更新的）现参数附近重新采样
+        self.pipeline = None
+        results = pipeline.results(pipeline.records)
+        baseline = results[0]['score']
+        best = max(results[1:], key=lambda result: result['score'])
+        if best['score'] < baseline + self.margin:
+            return None
+
+        self.stats['promotions'] += 1
+        return {
+            'params': {name: best['params'][name] for name in self.optimizer.PARAM_LIMITS},
+            'score': best['score'],
+            'baseline': baseline
+        }
+
+    def get_status(self):
+        """状态（导出用）"""
+        return {
+            'count': self.count,
+            'gain_ratio': float(self.gain / self.nominal_gain),
+            'rounds': int(self.stats['rounds']),
+            'ticks': int(self.stats['ticks']),
+            'promotions': int(self.stats['promotions']),
+            'gain_samples': int(self.stats['gain_samples'])
+        }
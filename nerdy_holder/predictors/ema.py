@@ -23,6 +23,20 @@ class AdaptiveEMAPredictor:
             self.fast_ema = self.fast_alpha * value + (1 - self.fast_alpha) * self.fast_ema
             self.slow_ema = self.slow_alpha * value + (1 - self.slow_alpha) * self.slow_ema
 
+    def get_state(self):
+        """导出运行状态"""
+        return {
+            'fast_ema': self.fast_ema,
+            'slow_ema': self.slow_ema,
+            'history': list(self.history)
+        }
+
+    def load_state(self, state):
+        """恢复运行状态"""
+        self.fast_ema = state.get('fast_ema', self.fast_ema)
+        self.slow_ema = state.get('slow_ema', self.slow_ema)
+        self.history.extend(state.get('history', []))
+
     def predict(self, seconds_ahead=5):
         """预测未来值"""
         if self.fast_ema is None:
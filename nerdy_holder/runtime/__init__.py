@@ -0,0 +1,16 @@
+"""运行时模块"""
+
+from .handover import HandoverServer, HandoverMonitor, take_over, HANDOVER_SOCKET
+from .async_runtime import AsyncHolderRuntime
+from .watchdog import EmergencyWatchdog, set_oom_score_adj, get_oom_score_adj
+
+__all__ = [
+    'HandoverServer',
+    'HandoverMonitor',
+    'take_over',
+    'HANDOVER_SOCKET',
+    'AsyncHolderRuntime',
+    'EmergencyWatchdog',
+    'set_oom_score_adj',
+    'get_oom_score_adj'
+]
@@ -0,0 +1,184 @@
+"""异步运行时 - 采样、决策、执行、导出、优化拆成并发任务
+
+sampler   高频采样，写入容量1的队列（只保留最新读数），紧急时唤醒决策
+pressure  在线程中等待PSI唤醒源，事件到来时唤醒决策（仅事件驱动的唤醒源）
+decider   按节拍（或被唤醒时）取最新读数决策，计划放入有界队列
+actuator  分配交给后台分片执行器，释放先中止进行中的分配再在独立执行器中运行
+exporter  每100ms写状态块（JSON启用时每秒一次），定期打印汇总
+optimizer 定期参数优化
+"""
+
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from ..memory import BackgroundActuator
+
+URGENT_ERROR = 8
+
+
+class AsyncHolderRuntime:
+    """异步运行时 - 驱动一个 NerdyHolderPro"""
+
+    def __init__(self, holder, sample_interval=0.1, export_interval=0.1,
+                 status_interval=120, optimize_interval=30, plan_queue_size=4):
+        self.holder = holder
+        self.sample_interval = sample_interval
+        self.export_interval = export_interval
+        self.status_interval = status_interval
+        self.optimize_interval = optimize_interval
+        self.plan_queue_size = plan_queue_size
+
+        self.samples = None
+        self.plans = None
+        self.wakeup = None
+
+        # 持有者未启用后台分片时补上（异步运行时总是分片分配）
+        if holder.actuator is None:
+            holder.actuator = BackgroundActuator(holder)
+
+        self.release_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='nerdy-release')
+        self.wait_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='nerdy-wake')
+
+        self.handover_requested = False
+        self.dropped_plans = 0
+
+    @property
+    def allocating(self):
+        """是否有分配在进行"""
+        return self.holder.actuator.busy
+
+    def _put_latest(self, queue, item):
+        """有界队列满时丢弃最旧的"""
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(item)
+
+    async def sampler(self):
+        holder = self.holder
+        while holder.running:
+            percent = holder.sensor.sample().percent
+            self._put_latest(self.samples, percent)
+
+            error = percent - holder.current_target
+            tolerance = holder.optimizer.params['tolerance']
+            if holder.get_holding_mb() > 0 and (
+                    error > URGENT_ERROR or (self.allocating and error > tolerance)):
+                # 越线或分配途中已超出目标：立即决策
+                self.wakeup.set()
+
+            await asyncio.sleep(self.sample_interval)
+
+    async def pressure(self):
+        holder = self.holder
+        loop = asyncio.get_running_loop()
+        while holder.running:
+            woke = await loop.run_in_executor(self.wait_executor, holder.waker.wait, 1.0)
+            if woke:
+                holder.stats['pressure_wakeups'] += 1
+                self.wakeup.set()
+
+    async def decider(self):
+        holder = self.holder
+        interval = 0
+        while holder.running:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+
+            if holder.handover_server and holder.handover_server.pending:
+                self.handover_requested = True
+                holder.running = False
+                break
+
+            holder.adjust_target()
+
+            if self.samples.empty():
+                current = holder.sensor.sample().percent
+            else:
+                current = self.samples.get_nowait()
+
+            # 分配途中只关心是否需要释放
+            if self.allocating and current - holder.current_target <= holder.optimizer.params['tolerance']:
+                interval = self.sample_interval
+                continue
+
+            plan = holder.decide(current)
+            holder.scheduler.observe(plan['outcome'] == 'tolerance')
+
+            if plan['outcome'] == 'adjust':
+                if self.plans.full():
+                    self.dropped_plans += 1
+                self._put_latest(self.plans, plan)
+
+            interval = holder.next_interval()
+
+    async def actuator(self):
+        holder = self.holder
+        loop = asyncio.get_running_loop()
+        while holder.running or not self.plans.empty():
+            try:
+                plan = await asyncio.wait_for(self.plans.get(), timeout=self.sample_interval)
+            except asyncio.TimeoutError:
+                continue
+
+            if plan['action'] == 'release':
+                # 释放不等正在进行的分配，分配在下一片前停止
+                holder.actuator.preempt(plan)
+                await loop.run_in_executor(self.release_executor, holder.apply, plan, False)
+            elif not holder.actuator.submit(plan):
+                holder.drop_plan(plan)
+                self.dropped_plans += 1
+
+    async def exporter(self):
+        holder = self.holder
+        last_status = time.time()
+        while holder.running:
+            if holder.enable_benchmark:
+                holder.export_status()
+            if time.time() - last_status >= self.status_interval:
+                holder.print_status()
+                last_status = time.time()
+            await asyncio.sleep(self.export_interval)
+
+    async def optimizer(self):
+        holder = self.holder
+        while holder.running:
+            await asyncio.sleep(self.optimize_interval)
+            if not holder.scheduler.idle:
+                holder.optimize_parameters()
+
+    async def main(self):
+        self.samples = asyncio.Queue(maxsize=1)
+        self.plans = asyncio.Queue(maxsize=self.plan_queue_size)
+        self.wakeup = asyncio.Event()
+
+        coros = [self.sampler(), self.decider(), self.actuator(), self.exporter(), self.optimizer()]
+        if self.holder.waker.event_driven:
+            coros.append(self.pressure())
+        tasks = [asyncio.create_task(coro) for coro in coros]
+        try:
+            # 任一任务结束（停止或异常）即收尾
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def run(self):
+        """运行至 holder.running 为False"""
+        try:
+            asyncio.run(self.main())
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """关闭执行器（中止进行中的分配，等待释放完成）"""
+        self.holder.actuator.cancel()
+        self.holder.actuator.wait_idle()
+        for executor in (self.release_executor, self.wait_executor):
+            executor.shutdown(wait=True)
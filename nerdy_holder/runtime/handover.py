@@ -0,0 +1,225 @@
+"""在线交接 - 通过Unix socket(SCM_RIGHTS)把持有的段和控制器状态交给新进程"""
+
+import os
+import json
+import time
+import array
+import socket
+import threading
+
+from ..sensors import MeminfoSensor
+from ..control.server import socket_alive
+
+HANDOVER_SOCKET = 'nerdy_handover.sock'
+MAX_FDS = 250
+MAX_MESSAGE = 1 << 20
+
+
+def send_message(sock, payload, fds=()):
+    """发送一条消息（SEQPACKET保留边界），可附带fd"""
+    ancillary = []
+    if fds:
+        ancillary.append((socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', fds).tobytes()))
+    sock.sendmsg([json.dumps(payload).encode()], ancillary)
+
+
+def recv_message(sock):
+    """接收一条消息，返回 (payload, fds)；对端关闭返回 (None, [])"""
+    data, ancdata, flags, _ = sock.recvmsg(MAX_MESSAGE, socket.CMSG_SPACE(MAX_FDS * 4))
+    fds = array.array('i')
+    for level, kind, cmsg in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(cmsg[:len(cmsg) - len(cmsg) % fds.itemsize])
+    if flags & socket.MSG_CTRUNC:
+        for fd in fds:
+            os.close(fd)
+        raise OSError("交接消息的fd被截断")
+    if not data:
+        return None, list(fds)
+    return json.loads(data.decode()), list(fds)
+
+
+class HandoverServer:
+    """旧进程侧 - 等待继任者连接，在主循环中完成交接"""
+
+    def __init__(self, path=HANDOVER_SOCKET):
+        self.path = path
+        if os.path.exists(path):
+            if socket_alive(path, socket.SOCK_SEQPACKET):
+                raise RuntimeError(f"交接socket正在使用: {path}")
+            os.remove(path)
+
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        self.sock.bind(path)
+        self.sock.listen(1)
+        # 关闭时只删除自己绑定的socket
+        self.inode = os.stat(path).st_ino
+
+        self.pending = None
+        self.thread = threading.Thread(target=self._accept, daemon=True)
+        self.thread.start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+
+            # 只有发来接管请求的连接才是继任者（存活探测连上即关闭）
+            try:
+                conn.settimeout(5)
+                message, fds = recv_message(conn)
+                conn.settimeout(None)
+            except (OSError, ValueError):
+                message, fds = None, []
+            for fd in fds:
+                os.close(fd)
+            if message and message.get('take_over'):
+                self.pending = conn
+                return
+            conn.close()
+
+    def hand_over(self, holder):
+        """发送段和状态，继任者确认后放弃本进程映射；返回交出的段数"""
+        conn = self.pending
+        self.pending = None
+
+        try:
+            if not hasattr(holder.backend, 'detach'):
+                send_message(conn, {'error': f"后端{holder.backend.name}不支持交接"})
+                return 0
+
+            chunks = list(holder.ledger)
+            for i in range(0, len(chunks), MAX_FDS):
+                batch = chunks[i:i + MAX_FDS]
+                send_message(conn, {
+                    'segments': [holder.backend.segment_name(c.data) for c in batch]
+                }, [holder.backend.fileno(c.data) for c in batch])
+
+            # shm目录锁随交接转给继任者，期间没有第三个进程能按目录接管段
+            lock_fd = getattr(holder.backend, 'lock_fd', None)
+            if lock_fd is not None:
+                send_message(conn, {'lock': True}, [lock_fd])
+
+            send_message(conn, {'state': holder.export_state()})
+
+            reply, _ = recv_message(conn)
+            if not reply or not reply.get('ack'):
+                return 0
+
+            # 继任者已映射全部段，本进程只解除映射，不删除段
+            for chunk in chunks:
+                holder.ledger.remove(chunk)
+                holder.backend.detach(chunk.data)
+                chunk.data = None
+                chunk.committed_bytes = 0
+
+            # 继任者在连接关闭后绑定控制socket，此前交出路径
+            if holder.control:
+                holder.control.close()
+                holder.control = None
+            return len(chunks)
+        finally:
+            conn.close()
+            self.close()
+
+    def close(self):
+        """关闭监听"""
+        try:
+            self.sock.close()
+        finally:
+            try:
+                if os.stat(self.path).st_ino == self.inode:
+                    os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+
+class HandoverMonitor:
+    """交接期间采样系统内存，统计偏离容差的时长"""
+
+    def __init__(self, target, tolerance, interval=0.05, sensor=None):
+        self.sensor = sensor
+        self.owns_sensor = sensor is None
+        self.target = target
+        self.tolerance = tolerance
+        self.interval = interval
+        self.outside_seconds = 0
+        self.max_error = 0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        if self.sensor is None:
+            self.sensor = MeminfoSensor()
+        self.started = time.monotonic()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def _loop(self):
+        last = time.monotonic()
+        while self.running:
+            error = abs(self.sensor.sample().percent - self.target)
+            now = time.monotonic()
+            if error > self.tolerance:
+                self.outside_seconds += now - last
+            self.max_error = max(self.max_error, error)
+            last = now
+            time.sleep(self.interval)
+
+    def stop(self):
+        """停止采样，返回报告"""
+        self.running = False
+        if self.thread:
+            self.thread.join()
+        if self.owns_sensor and self.sensor:
+            self.sensor.close()
+        return {
+            'duration_ms': (time.monotonic() - self.started) * 1000,
+            'outside_tolerance_s': self.outside_seconds,
+            'max_error': self.max_error
+        }
+
+
+def take_over(holder, path=HANDOVER_SOCKET):
+    """新进程侧 - 接管旧进程的段和控制器状态，返回交接报告"""
+    # 交接期间主线程阻塞在接收上，监控线程可独占holder的传感器
+    monitor = HandoverMonitor(holder.current_target, holder.optimizer.params['tolerance'],
+                              sensor=holder.sensor)
+    monitor.start()
+
+    segments = 0
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    try:
+        sock.connect(path)
+        send_message(sock, {'take_over': True})
+        while True:
+            message, fds = recv_message(sock)
+            if message is None:
+                break
+            if 'error' in message:
+                raise RuntimeError(message['error'])
+
+            if 'segments' in message:
+                for name, fd in zip(message['segments'], fds):
+                    holder.adopt_segment(fd, name)
+                    segments += 1
+            elif 'lock' in message:
+                if hasattr(holder.backend, 'adopt_lock'):
+                    holder.backend.adopt_lock(fds[0])
+                else:
+                    os.close(fds[0])
+            elif 'state' in message:
+                holder.load_state(message['state'])
+                send_message(sock, {'ack': True})
+
+        # 旧进程关闭连接即已放弃映射
+    finally:
+        sock.close()
+        report = monitor.stop()
+
+    report['segments'] = segments
+    report['holding_mb'] = holder.get_holding_mb()
+    return report
@@ -0,0 +1,206 @@
+"""紧急释放看门狗 - 独立线程周期检查硬下限，越线时绕过决策流程直接释放
+
+MemAvailable 低于下限，或 PSI full（所有任务同时因内存停顿）占比超限时，
+中止进行中的分配并立即释放，不经过 should_adjust 的间隔保护。
+同时调高本进程 oom_score_adj，真到OOM时先杀holder而不是其他租户。
+"""
+
+import os
+import time
+import threading
+from collections import deque
+
+from ..sensors import MeminfoSensor
+
+MB = 1024 * 1024
+PSI_MEMORY = '/proc/pressure/memory'
+OOM_SCORE_ADJ = '/proc/self/oom_score_adj'
+
+
+def set_oom_score_adj(value=1000, path=OOM_SCORE_ADJ):
+    """设置本进程 oom_score_adj，返回是否成功（调高无需特权）"""
+    try:
+        with open(path, 'w') as f:
+            f.write(str(int(value)))
+        return True
+    except OSError:
+        return False
+
+
+def get_oom_score_adj(path=OOM_SCORE_ADJ):
+    try:
+        with open(path, 'r') as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+class EmergencyWatchdog:
+    """紧急释放看门狗 - 驱动一个 holder
+
+    使用 holder 的 release_memory / get_holding_mb / actuator / log / emit
+    floor_mb:  MemAvailable 硬下限（None为内存总量的2%，至少256MB）
+    psi_full:  PSI full 停顿占比上限(%)，在 psi_window 秒内计算
+    period:    检查周期(s)，兜底用，不必跟主循环抢CPU
+    """
+
+    def __init__(self, holder, floor_mb=None, psi_full=10.0, period=0.25,
+                 psi_window=1.0, cooldown=1.0, meminfo_path='/proc/meminfo', psi_path=PSI_MEMORY):
+        self.holder = holder
+        self.period = period
+        self.psi_full = psi_full
+        self.psi_window = psi_window
+        self.cooldown = cooldown    # PSI越线后的冷却：停顿占比是窗口均值，释放后不会立刻回落
+
+        # 独立fd，不和主循环抢传感器锁
+        self.meminfo = MeminfoSensor(meminfo_path, fields=('MemTotal', 'MemAvailable'))
+        if floor_mb is None:
+            floor_mb = max(256, self.meminfo.total / MB * 0.02)
+        self.floor_mb = floor_mb
+        self.headroom_mb = floor_mb     # 越线后释放到下限之上再留这么多
+
+        try:
+            self.psi_fd = os.open(psi_path, os.O_RDONLY)
+        except OSError:
+            self.psi_fd = None
+        self.psi_history = deque()
+        self.psi_rate = 0.0             # 窗口内 full 停顿占比(%)
+        self.last_psi_release = 0
+
+        self.latencies = deque(maxlen=50)   # 越线到释放完成(ms)
+        self.stats = {'checks': 0, 'breaches': 0, 'released_mb': 0.0}
+        self.last_breach = None
+
+        self.running = False
+        self.thread = None
+
+    def fit_target(self, available_mb, share=0.5):
+        """下限不超过目标对应可用内存的 share 倍，返回被下调前的下限（未下调为None）
+
+        下限高于目标处的可用内存时，主循环每次达标都会触发紧急释放，两者来回拉扯
+        """
+        limit = max(0.0, available_mb * share)
+        if self.floor_mb <= limit:
+            return None
+        previous = self.floor_mb
+        self.floor_mb = limit
+        self.headroom_mb = limit
+        return previous
+
+    def _read_psi_total(self):
+        """full 行累计停顿时间(us)"""
+        data = os.pread(self.psi_fd, 256, 0)
+        for line in data.splitlines():
+            if line.startswith(b'full'):
+                return int(line.rsplit(b'total=', 1)[1])
+        return None
+
+    def sample_psi(self, now):
+        """更新窗口内 full 停顿占比"""
+        if self.psi_fd is None:
+            return 0.0
+        total = self._read_psi_total()
+        if total is None:
+            return 0.0
+
+        history = self.psi_history
+        history.append((now, total))
+        while len(history) > 2 and now - history[1][0] >= self.psi_window:
+            history.popleft()
+
+        start, start_total = history[0]
+        if now - start > 0:
+            self.psi_rate = (total - start_total) / ((now - start) * 1e6) * 100
+        return self.psi_rate
+
+    def check(self):
+        """检查一次，越线时释放，返回释放量(MB)"""
+        now = time.monotonic()
+        self.stats['checks'] += 1
+        available_mb = self.meminfo.sample().available / MB
+        psi_rate = self.sample_psi(now)
+
+        reason = None
+        if available_mb < self.floor_mb:
+            reason = 'floor'
+            release_mb = self.floor_mb - available_mb + self.headroom_mb
+        elif psi_rate > self.psi_full and now - self.last_psi_release >= self.cooldown:
+            reason = 'psi'
+            release_mb = self.headroom_mb
+        else:
+            return 0
+
+        holder = self.holder
+        holding = holder.get_holding_mb()
+        if holding <= 0:
+            return 0
+
+        # 先让进行中的分配停下，再直接释放
+        if holder.actuator is not None:
+            holder.actuator.cancel()
+        released = holder.release_memory(min(release_mb, holding))
+        elapsed = (time.monotonic() - now) * 1000
+
+        if reason == 'psi':
+            self.last_psi_release = now
+        self.stats['breaches'] += 1
+        self.stats['released_mb'] += released
+        self.latencies.append(elapsed)
+        self.last_breach = {
+            'reason': reason,
+            'available_mb': available_mb,
+            'psi_full': psi_rate,
+            'released_mb': released,
+            'latency_ms': elapsed,
+            'timestamp': time.time()
+        }
+
+        detail = f"可用{available_mb:.0f}MB < {self.floor_mb:.0f}MB" if reason == 'floor' \
+            else f"PSI full {psi_rate:.1f}% > {self.psi_full:.1f}%"
+        holder.log(f"🚨 紧急释放 {released:.0f}MB ({detail}) | 耗时{elapsed:.1f}ms", "WARN")
+        holder.emit('emergency', **self.last_breach)
+        return released
+
+    def _loop(self):
+        # 尽量提高本线程调度优先级（需要CAP_SYS_NICE，失败则保持默认）
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), -10)
+        except (OSError, AttributeError):
+            pass
+
+        while self.running:
+            try:
+                self.check()
+            except Exception as e:
+                self.holder.log(f"看门狗检查失败: {e}", "WARN")
+            time.sleep(self.period)
+
+    def start(self):
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self._loop, name='nerdy-watchdog', daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def close(self):
+        self.stop()
+        self.meminfo.close()
+        if self.psi_fd is not None:
+            os.close(self.psi_fd)
+            self.psi_fd = None
+
+    def get_latency(self):
+        """越线到释放完成的耗时统计(ms)"""
+        if not self.latencies:
+            return None
+        latencies = list(self.latencies)
+        return {
+            'last': latencies[-1],
+            'avg': sum(latencies) / len(latencies),
+            'max': max(latencies)
+        }
@@ -0,0 +1,27 @@
+"""传感器模块"""
+
+from .meminfo import MeminfoSensor
+from .metrics import (
+    MetricSensor, UsedPercentSensor, AvailableFloorSensor, CommitHeadroomSensor,
+    CgroupSensor, SENSORS, get_sensor
+)
+from .pressure import PressureSensor
+from .psi import DEFAULT_TRIGGER, TimerWaker, PsiWaker, PipeWaker, create_waker, get_waker
+
+__all__ = [
+    'MeminfoSensor',
+    'MetricSensor',
+    'UsedPercentSensor',
+    'AvailableFloorSensor',
+    'CommitHeadroomSensor',
+    'CgroupSensor',
+    'SENSORS',
+    'get_sensor',
+    'PressureSensor',
+    'DEFAULT_TRIGGER',
+    'TimerWaker',
+    'PsiWaker',
+    'PipeWaker',
+    'create_waker',
+    'get_waker'
+]
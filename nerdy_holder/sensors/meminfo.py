@@ -0,0 +1,116 @@
+"""/proc/meminfo 传感器 - 常驻fd + pread，每轮一次快照"""
+
+import os
+import time
+import array
+import threading
+import psutil
+
+MEMINFO_PATH = '/proc/meminfo'
+FIELDS = ('MemTotal', 'MemFree', 'MemAvailable', 'CommitLimit', 'Committed_AS')
+BUFFER_SIZE = 4096
+
+
+class MeminfoSensor:
+    """内存传感器 - 只解析需要的字段，写入预分配存储
+
+    sample() 读取一次并更新快照，同一轮内所有读者共享该快照
+    """
+
+    def __init__(self, path=MEMINFO_PATH, fields=FIELDS):
+        self.path = path
+        self.fields = tuple(fields)
+        self.keys = [f"{name}:".encode() for name in self.fields]
+        self.index = {name: i for i, name in enumerate(self.fields)}
+
+        # 预分配：读缓冲、字段值(字节)、上次字段偏移（行序固定，用于加速查找）
+        self.buf = bytearray(BUFFER_SIZE)
+        self.values = array.array('Q', [0] * len(self.fields))
+        self.offsets = [0] * len(self.fields)
+        self.timestamp = 0
+        self.samples = 0
+        # 后台执行器线程也会采样
+        self.lock = threading.Lock()
+
+        try:
+            self.fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            # 无procfs（非Linux），退回psutil
+            self.fd = None
+
+        self.sample()
+
+    def _read(self):
+        """pread整个文件到缓冲区，缓冲区不够时扩容"""
+        while True:
+            n = os.preadv(self.fd, [self.buf], 0)
+            if n < len(self.buf):
+                return n
+            self.buf = bytearray(len(self.buf) * 2)
+
+    def _parse(self, n):
+        data = self.buf
+        for i, key in enumerate(self.keys):
+            pos = data.find(key, self.offsets[i], n)
+            if pos < 0:
+                pos = data.find(key, 0, n)
+                if pos < 0:
+                    self.values[i] = 0
+                    continue
+            self.offsets[i] = pos
+
+            start = pos + len(key)
+            end = data.find(b'\n', start, n)
+            if end < 0:
+                end = n
+            if data[end - 2:end] == b'kB':
+                self.values[i] = int(data[start:end - 2]) * 1024
+            else:
+                self.values[i] = int(data[start:end])
+
+    def _sample_psutil(self):
+        mem = psutil.virtual_memory()
+        fallback = {'MemTotal': mem.total, 'MemFree': mem.free, 'MemAvailable': mem.available}
+        for i, name in enumerate(self.fields):
+            self.values[i] = fallback.get(name, 0)
+
+    def sample(self):
+        """读取新快照"""
+        with self.lock:
+            if self.fd is None:
+                self._sample_psutil()
+            else:
+                self._parse(self._read())
+            self.timestamp = time.time()
+            self.samples += 1
+        return self
+
+    def get(self, name):
+        """快照中的字段值（字节）"""
+        return self.values[self.index[name]]
+
+    @property
+    def total(self):
+        return self.get('MemTotal')
+
+    @property
+    def available(self):
+        return self.get('MemAvailable')
+
+    @property
+    def used(self):
+        return self.total - self.available
+
+    @property
+    def percent(self):
+        """已用百分比（与psutil.virtual_memory().percent同口径）"""
+        total = self.total
+        if not total:
+            return 0.0
+        return round((total - self.available) / total * 100, 1)
+
+    def close(self):
+        """关闭fd"""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
@@ -0,0 +1,185 @@
+"""可插拔内存指标 - 控制器统一工作在百分比刻度上
+
+每个指标给出 used_bytes / scale_bytes（百分比 = used / scale），
+目标可用指标的原生单位表示，经 to_percent() 换算到控制刻度
+"""
+
+import os
+import threading
+from pathlib import Path
+
+from .meminfo import MeminfoSensor
+
+MB = 1024 * 1024
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+
+class MetricSensor:
+    """指标基类"""
+
+    name = 'metric'
+    unit = '%'
+
+    def __init__(self, meminfo=None):
+        self.meminfo = meminfo or MeminfoSensor()
+        self.used_bytes = 0
+        self.scale_bytes = 0
+        self.lock = threading.Lock()
+        self.sample()
+
+    def _read(self):
+        """返回 (used_bytes, scale_bytes)"""
+        raise NotImplementedError
+
+    def sample(self):
+        """读取新快照"""
+        with self.lock:
+            self.meminfo.sample()
+            self.used_bytes, self.scale_bytes = self._read()
+        return self
+
+    @property
+    def total(self):
+        return self.meminfo.total
+
+    @property
+    def percent(self):
+        """控制刻度上的读数"""
+        if not self.scale_bytes:
+            return 0.0
+        return self.used_bytes / self.scale_bytes * 100
+
+    @property
+    def value(self):
+        """原生单位读数"""
+        return self.from_percent(self.percent)
+
+    def to_percent(self, native):
+        """原生单位目标 → 控制刻度"""
+        return native
+
+    def from_percent(self, percent):
+        """控制刻度 → 原生单位"""
+        return percent
+
+    def close(self):
+        self.meminfo.close()
+
+
+class UsedPercentSensor(MetricSensor):
+    """主机已用百分比（与psutil同口径）"""
+
+    name = 'used'
+    unit = '%'
+
+    def _read(self):
+        return self.meminfo.used, self.meminfo.total
+
+    @property
+    def percent(self):
+        return self.meminfo.percent
+
+
+class AvailableFloorSensor(MetricSensor):
+    """MemAvailable下限 - 目标为保留的可用内存(MB)"""
+
+    name = 'available'
+    unit = 'MB'
+
+    def _read(self):
+        return self.meminfo.used, self.meminfo.total
+
+    def to_percent(self, native):
+        return (self.scale_bytes - native * MB) / self.scale_bytes * 100
+
+    def from_percent(self, percent):
+        return self.scale_bytes * (1 - percent / 100) / MB
+
+
+class CommitHeadroomSensor(MetricSensor):
+    """提交余量 CommitLimit - Committed_AS - 目标为保留的余量(MB)
+
+    严格过量提交（vm.overcommit_memory=2）下，余量耗尽即分配失败
+    """
+
+    name = 'commit'
+    unit = 'MB'
+
+    def _read(self):
+        return self.meminfo.get('Committed_AS'), self.meminfo.get('CommitLimit')
+
+    def to_percent(self, native):
+        return (self.scale_bytes - native * MB) / self.scale_bytes * 100
+
+    def from_percent(self, percent):
+        return self.scale_bytes * (1 - percent / 100) / MB
+
+
+def own_cgroup(proc_path='/proc/self/cgroup'):
+    """本进程所在的cgroup v2路径"""
+    try:
+        with open(proc_path, 'r') as f:
+            for line in f:
+                if line.startswith('0::'):
+                    return line[3:].strip()
+    except OSError:
+        pass
+    return '/'
+
+
+class CgroupSensor(MetricSensor):
+    """cgroup v2 memory.current / memory.max - 目标为cgroup用量(MB)
+
+    memory.max 为 max（不限）时以主机内存为刻度
+    """
+
+    name = 'cgroup'
+    unit = 'MB'
+
+    def __init__(self, root=CGROUP_ROOT, group=None, meminfo=None):
+        if group is None:
+            group = own_cgroup()
+        self.path = Path(root) / group.lstrip('/')
+        self.current_fd = os.open(self.path / 'memory.current', os.O_RDONLY)
+        self.max_fd = os.open(self.path / 'memory.max', os.O_RDONLY)
+        super().__init__(meminfo)
+
+    @staticmethod
+    def _pread(fd):
+        return os.pread(fd, 64, 0).strip()
+
+    def _read(self):
+        current = int(self._pread(self.current_fd))
+        limit = self._pread(self.max_fd)
+        scale = self.meminfo.total if limit == b'max' else int(limit)
+        return current, scale
+
+    def to_percent(self, native):
+        return native * MB / self.scale_bytes * 100
+
+    def from_percent(self, percent):
+        return self.scale_bytes * percent / 100 / MB
+
+    def close(self):
+        os.close(self.current_fd)
+        os.close(self.max_fd)
+        super().close()
+
+
+SENSORS = {
+    UsedPercentSensor.name: UsedPercentSensor,
+    AvailableFloorSensor.name: AvailableFloorSensor,
+    CommitHeadroomSensor.name: CommitHeadroomSensor,
+    CgroupSensor.name: CgroupSensor,
+}
+
+
+def get_sensor(sensor=None):
+    """按名称或实例获取指标"""
+    if sensor is None:
+        return UsedPercentSensor()
+    if isinstance(sensor, str):
+        if sensor not in SENSORS:
+            raise ValueError(f"未知指标: {sensor}")
+        return SENSORS[sensor]()
+    return sensor
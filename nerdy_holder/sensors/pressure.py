@@ -0,0 +1,127 @@
+"""回收压力传感器 - 融合PSI均值与/proc/vmstat计数器速率
+
+区分"满但从容"和"正在直接回收/抖动"的主机，输出0~1的压力分数
+"""
+
+import os
+import time
+
+PSI_MEMORY = '/proc/pressure/memory'
+VMSTAT_PATH = '/proc/vmstat'
+BUFFER_SIZE = 16384
+
+# 计数器 -> vmstat中参与求和的字段（不同内核字段名不同）
+COUNTERS = {
+    'pgscan_direct': ('pgscan_direct',),
+    'pgsteal_direct': ('pgsteal_direct',),
+    'workingset_refault': ('workingset_refault', 'workingset_refault_anon', 'workingset_refault_file'),
+    'pgsteal_kswapd': ('pgsteal_kswapd',),
+    'pgmajfault': ('pgmajfault',),
+}
+
+# 各信号的饱和点：达到即视为满压力
+# PSI为stall百分比，计数器为每秒页数
+# 只融合直接回收与stall信号；kswapd后台回收和major fault在满而从容的主机上
+# 也会持续不断，只记录速率不参与打分
+SCALES = {
+    'psi_some': 10.0,
+    'psi_full': 5.0,
+    'pgscan_direct': 2560.0,         # 10MB/s直接扫描
+    'pgsteal_direct': 2560.0,        # 10MB/s直接回收
+    'workingset_refault': 12800.0,   # 50MB/s重新缺页
+}
+
+
+class PressureSensor:
+    """回收压力 - 各信号按饱和点归一化后做noisy-OR融合"""
+
+    def __init__(self, psi_path=PSI_MEMORY, vmstat_path=VMSTAT_PATH, scales=None):
+        self.scales = dict(SCALES)
+        if scales:
+            self.scales.update(scales)
+
+        self.psi_fd = self._open(psi_path)
+        self.vmstat_fd = self._open(vmstat_path)
+        self.buf = bytearray(BUFFER_SIZE)
+        self.fields = {f.encode(): name for name, fields in COUNTERS.items() for f in fields}
+
+        self.psi = {'some': 0.0, 'full': 0.0}
+        self.counters = {}
+        self.rates = {name: 0.0 for name in COUNTERS}
+        self.components = {name: 0.0 for name in self.scales}
+        self.score = 0.0
+        self.last_time = None
+
+        self.sample()
+
+    @staticmethod
+    def _open(path):
+        try:
+            return os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+
+    @property
+    def available(self):
+        return self.psi_fd is not None or self.vmstat_fd is not None
+
+    def _read(self, fd):
+        while True:
+            n = os.preadv(fd, [self.buf], 0)
+            if n < len(self.buf):
+                return bytes(self.buf[:n])
+            self.buf = bytearray(len(self.buf) * 2)
+
+    def _read_psi(self):
+        """some/full 的 avg10"""
+        for line in self._read(self.psi_fd).splitlines():
+            kind, _, rest = line.partition(b' ')
+            for item in rest.split():
+                if item.startswith(b'avg10='):
+                    self.psi[kind.decode()] = float(item[6:])
+                    break
+
+    def _read_vmstat(self):
+        """关心的计数器（同组字段求和）"""
+        counters = dict.fromkeys(COUNTERS, 0)
+        for line in self._read(self.vmstat_fd).splitlines():
+            key, _, value = line.partition(b' ')
+            name = self.fields.get(key)
+            if name is not None:
+                counters[name] += int(value)
+        return counters
+
+    def sample(self):
+        """读取新快照并更新压力分数"""
+        now = time.monotonic()
+
+        if self.psi_fd is not None:
+            self._read_psi()
+
+        if self.vmstat_fd is not None:
+            counters = self._read_vmstat()
+            if self.last_time is not None:
+                dt = max(now - self.last_time, 1e-3)
+                for name, value in counters.items():
+                    # 计数器回绕/重置时按0处理
+                    self.rates[name] = max(0, value - self.counters.get(name, value)) / dt
+            self.counters = counters
+        self.last_time = now
+
+        signals = {'psi_some': self.psi['some'], 'psi_full': self.psi['full']}
+        signals.update(self.rates)
+
+        relaxed = 1.0
+        for name, scale in self.scales.items():
+            level = min(1.0, signals.get(name, 0.0) / scale)
+            self.components[name] = level
+            relaxed *= 1.0 - level
+        self.score = 1.0 - relaxed
+        return self
+
+    def close(self):
+        for fd in (self.psi_fd, self.vmstat_fd):
+            if fd is not None:
+                os.close(fd)
+        self.psi_fd = None
+        self.vmstat_fd = None
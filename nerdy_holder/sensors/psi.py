@@ -0,0 +1,132 @@
+"""PSI触发唤醒 - 主循环阻塞在poll()上，内存压力出现时立即醒来
+
+PsiWaker:    /proc/pressure/memory 触发器（POLLPRI）
+TimerWaker:  无PSI的内核，纯超时
+PipeWaker:   管道触发源，测试和外部唤醒用
+"""
+
+import os
+import time
+import select
+
+PSI_MEMORY = '/proc/pressure/memory'
+DEFAULT_TRIGGER = 'some 50000 1000000'
+
+
+class TimerWaker:
+    """纯超时等待"""
+
+    name = 'timer'
+    event_driven = False
+
+    def __init__(self):
+        self.wakeups = 0
+        self.events = 0
+
+    def wait(self, timeout):
+        """等待至超时，返回是否由事件唤醒"""
+        time.sleep(max(0, timeout))
+        self.wakeups += 1
+        return False
+
+    def close(self):
+        pass
+
+
+class PollWaker(TimerWaker):
+    """基于poll()的等待 - 事件或超时先到者唤醒"""
+
+    name = 'poll'
+    event_driven = True
+
+    def __init__(self, fd, eventmask):
+        super().__init__()
+        self.fd = fd
+        self.poller = select.poll()
+        self.poller.register(fd, eventmask)
+        self.eventmask = eventmask
+
+    def _consume(self):
+        """事件就绪后的处理"""
+        pass
+
+    def wait(self, timeout):
+        events = self.poller.poll(max(0, timeout) * 1000)
+        self.wakeups += 1
+        for _, mask in events:
+            if mask & (select.POLLERR | select.POLLNVAL):
+                # 触发源失效，退化为超时
+                self.poller.unregister(self.fd)
+                self.event_driven = False
+                time.sleep(max(0, timeout))
+                return False
+            if mask & self.eventmask:
+                self._consume()
+                self.events += 1
+                return True
+        return False
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class PsiWaker(PollWaker):
+    """PSI触发器 - 窗口内stall超过阈值时内核产生POLLPRI"""
+
+    name = 'psi'
+
+    def __init__(self, trigger=DEFAULT_TRIGGER, path=PSI_MEMORY):
+        self.trigger = trigger
+        fd = os.open(path, os.O_RDWR | os.O_NONBLOCK)
+        try:
+            os.write(fd, trigger.encode() + b'\0')
+        except OSError:
+            os.close(fd)
+            raise
+        super().__init__(fd, select.POLLPRI)
+
+
+class PipeWaker(PollWaker):
+    """管道触发源 - fire()写入一字节即唤醒"""
+
+    name = 'pipe'
+
+    def __init__(self):
+        self.read_fd, self.write_fd = os.pipe()
+        os.set_blocking(self.read_fd, False)
+        super().__init__(self.read_fd, select.POLLIN)
+
+    def fire(self):
+        """触发一次唤醒"""
+        os.write(self.write_fd, b'\x01')
+
+    def _consume(self):
+        try:
+            os.read(self.read_fd, 4096)
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        super().close()
+        os.close(self.write_fd)
+
+
+def create_waker(trigger=DEFAULT_TRIGGER, path=PSI_MEMORY):
+    """优先PSI触发器，内核不支持（或无权限）时退回超时"""
+    if not trigger:
+        return TimerWaker()
+    try:
+        return PsiWaker(trigger, path)
+    except OSError:
+        return TimerWaker()
+
+
+def get_waker(waker=None):
+    """按触发器字符串或实例获取唤醒源（None为默认触发器，空串为纯超时）"""
+    if waker is None:
+        return create_waker()
+    if isinstance(waker, str):
+        return create_waker(waker)
+    return waker
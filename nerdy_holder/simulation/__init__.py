@@ -0,0 +1,20 @@
+"""模拟模块"""
+
+from .clock import VirtualClock
+from .host import SimulatedHost, TraceHost, SimulatedBackend, SimulatedPressure, VirtualWaker
+from .harness import Simulation
+from .replay import BatchPipeline, replay
+from .tuner import CorpusTuner
+
+__all__ = [
+    'VirtualClock',
+    'SimulatedHost',
+    'TraceHost',
+    'SimulatedBackend',
+    'SimulatedPressure',
+    'VirtualWaker',
+    'Simulation',
+    'BatchPipeline',
+    'replay',
+    'CorpusTuner'
+]
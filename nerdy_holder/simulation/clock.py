@@ -0,0 +1,25 @@
+"""虚拟时钟 - 与time模块同接口，sleep只推进读数"""
+
+DEFAULT_START = 1_700_000_000.0
+
+
+class VirtualClock:
+    """虚拟时钟 - 组件默认使用time模块，模拟时注入本类实例"""
+
+    def __init__(self, start=DEFAULT_START):
+        self.start = start
+        self.now = start
+
+    def time(self):
+        """墙钟时间（epoch秒）"""
+        return self.now
+
+    def monotonic(self):
+        """自创建起的秒数"""
+        return self.now - self.start
+
+    def sleep(self, seconds):
+        """推进时间，立即返回"""
+        self.now += max(0, seconds)
+
+    advance = sleep
@@ -0,0 +1,136 @@
+"""无头模拟 - 虚拟时钟驱动未修改的决策流程，快于实时运行"""
+
+import os
+import time
+import random
+import contextlib
+
+from ..core import NerdyHolderPro
+from .clock import VirtualClock
+from .host import SimulatedHost
+
+
+class Simulation:
+    """模拟运行 - 一个holder对一台模拟主机
+
+    params:        覆盖优化器参数（经 apply_params 同步到算法组件）
+    optimizer:     参数探索方式（random/bayesian），max_error 为代理模型探索的安全约束
+    shadows:       影子控制器数（>0时以影子评估代替线上探索）
+    host_options:  传给 SimulatedHost 的负载模型参数
+    同一种子下结果完全一致；主机和holder使用各自的随机源
+    """
+
+    def __init__(self, seed=0, fixed_target=None, dynamic_range=None, sensor='used',
+                 params=None, optimizer=None, max_error=None, shadows=0, verbose=False,
+                 **host_options):
+        self.seed = seed
+        self.verbose = verbose
+        self.clock = VirtualClock()
+        self.host = SimulatedHost(self.clock, seed=seed, **host_options)
+
+        self.holder = NerdyHolderPro(
+            enable_benchmark=False,
+            fixed_target=fixed_target,
+            dynamic_range=dynamic_range,
+            backend=self.host.backend(),
+            prefault_workers=1,
+            sensor=self.host.sensor(sensor),
+            waker=self.host.waker(),
+            pressure=self.host.pressure(),
+            config_file=None,
+            clock=self.clock,
+            rng=random.Random(f'holder:{seed}'),
+            optimizer=optimizer,
+            max_error=max_error,
+            shadows=shadows
+        )
+        if params:
+            self.holder.optimizer.params.update(params)
+            self.holder.apply_params()
+
+        self.initialized = False
+        self.ticks = 0
+        self.elapsed = 0.0
+        self.abs_error_seconds = 0.0
+        self.outside_seconds = 0.0
+        self.max_abs_error = 0.0
+        self.wall_seconds = 0.0
+        # 每模拟小时的 [误差×秒, 秒]，用于比较参数探索的收敛速度
+        self.hourly = []
+
+    def _output(self):
+        """非verbose时丢弃holder的日志和状态汇总"""
+        if self.verbose:
+            return contextlib.nullcontext()
+        return contextlib.redirect_stdout(open(os.devnull, 'w'))
+
+    def run(self, seconds):
+        """推进 seconds 模拟秒，返回累计汇总"""
+        holder = self.holder
+        clock = self.clock
+        wall_start = time.perf_counter()
+
+        with self._output() as sink:
+            if not self.initialized:
+                holder.initialize()
+                self.initialized = True
+
+            end = clock.monotonic() + seconds
+            now = clock.monotonic()
+            while now < end:
+                interval = holder.tick()
+                self.ticks += 1
+
+                # 读数到下一次决策之间按本轮误差计（时间加权，含分配耗时）
+                error = abs(holder.sensor.percent - holder.current_target)
+                holder.waker.wait(min(interval, end - clock.monotonic()))
+                dt = clock.monotonic() - now
+                now += dt
+
+                self.abs_error_seconds += error * dt
+                hour = int(self.elapsed // 3600)
+                while len(self.hourly) <= hour:
+                    self.hourly.append([0.0, 0.0])
+                self.hourly[hour][0] += error * dt
+                self.hourly[hour][1] += dt
+                self.max_abs_error = max(self.max_abs_error, error)
+                if error > holder.optimizer.params['tolerance']:
+                    self.outside_seconds += dt
+                self.elapsed += dt
+
+            if sink is not None:
+                sink.close()
+
+        self.wall_seconds += time.perf_counter() - wall_start
+        return self.summary()
+
+    def summary(self):
+        """累计汇总"""
+        holder = self.holder
+        elapsed = max(self.elapsed, 1e-9)
+        score, scenario = holder.optimizer.calculate_score(holder.performance_tracker.get_stats())
+        return {
+            'seed': self.seed,
+            'simulated_seconds': self.elapsed,
+            'wall_seconds': self.wall_seconds,
+            'speedup': self.elapsed / max(self.wall_seconds, 1e-9),
+            'ticks': self.ticks,
+            'decisions': holder.stats['decisions'],
+            'adjustments': holder.stats['adjustments'],
+            'blocked': holder.stats['blocked'],
+            'mean_abs_error': self.abs_error_seconds / elapsed,
+            'max_abs_error': self.max_abs_error,
+            'hourly_error': [e / s for e, s in self.hourly if s > 0],
+            'outside_tolerance': self.outside_seconds / elapsed,
+            'overcommit_seconds': self.host.overcommit_seconds,
+            'allocation_failures': self.host.allocation_failures,
+            'holding_mb': holder.get_holding_mb(),
+            'optimizer': holder.optimizer.name,
+            'shadows': holder.shadows.get_status() if holder.shadows else None,
+            'params': {name: holder.optimizer.params[name] for name in holder.optimizer.PARAM_LIMITS},
+            'score': score,
+            'scenario': scenario
+        }
+
+    def close(self):
+        self.holder.prefaulter.shutdown()
@@ -0,0 +1,287 @@
+"""模拟主机 - 合成内存负载的被控对象
+
+租户负载:   基线 + 日周期 + OU随机游走 + 泊松到达的突发
+页缓存噪声: 每次采样叠加的高斯噪声（MemAvailable估计的抖动）
+执行滞后:   提交/归还按填充/释放速率消耗模拟时间，期间负载照常变化
+
+状态在被读取或时钟推进后按 step 秒步长惰性积分，给定种子完全可复现
+"""
+
+import math
+import random
+
+from ..sensors import SENSORS, TimerWaker
+from ..sensors.pressure import SCALES, COUNTERS
+from ..trackers import MemoryTrace
+
+MB = 1024 * 1024
+
+
+class SimulatedHost:
+    """模拟主机"""
+
+    def __init__(self, clock, total_mb=32768, base_mb=8192, daily_mb=2048, period=86400,
+                 walk_mb=512, walk_tau=600, burst_rate=1 / 3600, burst_mb=4096, burst_seconds=300,
+                 cache_noise_mb=32, fill_mb_per_sec=2000, release_mb_per_sec=20000,
+                 step=1.0, seed=0):
+        self.clock = clock
+        self.rng = random.Random(f'host:{seed}')
+
+        self.total_bytes = int(total_mb * MB)
+        self.base_mb = base_mb
+        self.daily_mb = daily_mb
+        self.period = period
+        self.walk_mb = walk_mb          # 随机游走的稳态标准差
+        self.walk_tau = walk_tau        # 随机游走的回归时间常数
+        self.burst_rate = burst_rate    # 每秒突发到达率
+        self.burst_mb = burst_mb
+        self.burst_seconds = burst_seconds
+        self.cache_noise_mb = cache_noise_mb
+        self.fill_mb_per_sec = fill_mb_per_sec
+        self.release_mb_per_sec = release_mb_per_sec
+        self.step = step
+
+        self.walk = 0.0
+        self.bursts = []                # [(结束时刻, MB)]
+        self.held_bytes = 0             # holder已提交
+        self.overcommit_seconds = 0.0   # 租户负载+holder超过总内存的时长
+        self.allocation_failures = 0
+        self.last_update = clock.monotonic()
+
+    def load_mb(self, t=None):
+        """租户负载(MB)"""
+        if t is None:
+            t = self.last_update
+        daily = self.daily_mb * math.sin(2 * math.pi * t / self.period)
+        return max(0.0, self.base_mb + daily + self.walk + sum(mb for _, mb in self.bursts))
+
+    def _step(self, t, dt):
+        rng = self.rng
+
+        # OU随机游走
+        self.walk += -self.walk * dt / self.walk_tau + \
+            self.walk_mb * math.sqrt(2 * dt / self.walk_tau) * rng.gauss(0, 1)
+
+        # 突发：到达后持续指数分布的时长
+        self.bursts = [(end, mb) for end, mb in self.bursts if end > t]
+        if rng.random() < self.burst_rate * dt:
+            duration = rng.expovariate(1 / self.burst_seconds)
+            self.bursts.append((t + duration, self.burst_mb * rng.uniform(0.5, 1.5)))
+
+        if self.load_mb(t) * MB + self.held_bytes >= self.total_bytes:
+            self.overcommit_seconds += dt
+
+    def update(self):
+        """积分到当前时刻"""
+        now = self.clock.monotonic()
+        while self.last_update < now:
+            t = min(self.last_update + self.step, now)
+            self._step(t, t - self.last_update)
+            self.last_update = t
+
+    @property
+    def used_bytes(self):
+        """无噪声的已用字节数"""
+        self.update()
+        return min(self.total_bytes, self.load_mb() * MB + self.held_bytes)
+
+    @property
+    def used_fraction(self):
+        return self.used_bytes / self.total_bytes
+
+    def commit(self, size_bytes):
+        """holder提交内存（耗时按填充速率），超出总内存时失败"""
+        self.update()
+        if self.load_mb() * MB + self.held_bytes + size_bytes > self.total_bytes:
+            self.allocation_failures += 1
+            raise MemoryError("模拟主机内存不足")
+        self.held_bytes += size_bytes
+        self.clock.sleep(size_bytes / MB / self.fill_mb_per_sec)
+        return size_bytes
+
+    def decommit(self, size_bytes):
+        """holder归还内存（耗时按释放速率）"""
+        self.update()
+        self.held_bytes = max(0, self.held_bytes - size_bytes)
+        self.clock.sleep(size_bytes / MB / self.release_mb_per_sec)
+
+    def trace(self, seconds, step=1.0):
+        """不运行holder，按步长采样租户负载（含页缓存噪声）为轨迹"""
+        times, load = [], []
+        for _ in range(int(seconds // step) + 1):
+            noise = self.rng.gauss(0, self.cache_noise_mb)
+            used_mb = self.used_bytes / MB + noise
+            times.append(self.clock.time())
+            load.append(max(0.0, min(100.0, used_mb / (self.total_bytes / MB) * 100)))
+            self.clock.sleep(step)
+        return MemoryTrace(times, load, self.total_bytes / MB)
+
+    def sensor(self, name='used'):
+        """指标（复用真实指标类，读数来自本主机）"""
+        if name not in ('used', 'available', 'commit'):
+            raise ValueError(f"模拟主机不支持指标: {name}")
+        return SENSORS[name](meminfo=SimulatedMeminfo(self))
+
+    def pressure(self):
+        return SimulatedPressure(self)
+
+    def backend(self):
+        return SimulatedBackend(self)
+
+    def waker(self):
+        return VirtualWaker(self.clock)
+
+
+class TraceHost(SimulatedHost):
+    """按轨迹回放租户负载的模拟主机（无随机游走和突发，默认无噪声）"""
+
+    def __init__(self, clock, trace, cache_noise_mb=0, **options):
+        self.trace = trace
+        super().__init__(clock, total_mb=trace.total_mb, cache_noise_mb=cache_noise_mb, **options)
+
+    def load_mb(self, t=None):
+        if t is None:
+            t = self.last_update
+        return max(0.0, self.trace.load_at(t) / 100 * self.total_bytes / MB)
+
+    def _step(self, t, dt):
+        if self.load_mb(t) * MB + self.held_bytes >= self.total_bytes:
+            self.overcommit_seconds += dt
+
+
+class SimulatedMeminfo:
+    """与MeminfoSensor同接口的快照，带页缓存噪声"""
+
+    def __init__(self, host):
+        self.host = host
+        self.values = {}
+        self.timestamp = 0
+        self.samples = 0
+        self.sample()
+
+    def sample(self):
+        """读取新快照"""
+        host = self.host
+        noise = host.rng.gauss(0, host.cache_noise_mb) * MB
+        used = max(0, min(host.total_bytes, host.used_bytes + noise))
+        available = host.total_bytes - int(used)
+        self.values = {
+            'MemTotal': host.total_bytes,
+            'MemFree': available,
+            'MemAvailable': available,
+            'CommitLimit': host.total_bytes,
+            'Committed_AS': int(host.load_mb() * MB + host.held_bytes)
+        }
+        self.timestamp = host.clock.time()
+        self.samples += 1
+        return self
+
+    def get(self, name):
+        return self.values[name]
+
+    @property
+    def total(self):
+        return self.get('MemTotal')
+
+    @property
+    def available(self):
+        return self.get('MemAvailable')
+
+    @property
+    def used(self):
+        return self.total - self.available
+
+    @property
+    def percent(self):
+        total = self.total
+        if not total:
+            return 0.0
+        return round((total - self.available) / total * 100, 1)
+
+    def close(self):
+        pass
+
+
+class SimulatedPressure:
+    """与PressureSensor同接口 - 可用内存低于10%起压力线性上升"""
+
+    def __init__(self, host, onset=0.90, saturation=0.98):
+        self.host = host
+        self.onset = onset
+        self.saturation = saturation
+        self.psi = {'some': 0.0, 'full': 0.0}
+        self.rates = {name: 0.0 for name in COUNTERS}
+        self.components = {name: 0.0 for name in SCALES}
+        self.score = 0.0
+        self.available = True
+
+    def sample(self):
+        """按当前已用比例更新压力分数"""
+        level = (self.host.used_fraction - self.onset) / (self.saturation - self.onset)
+        self.score = max(0.0, min(1.0, level))
+        self.psi['some'] = self.score * SCALES['psi_some']
+        self.psi['full'] = self.score * SCALES['psi_full'] / 2
+        self.rates['pgscan_direct'] = self.score * SCALES['pgscan_direct']
+        return self
+
+    def close(self):
+        pass
+
+
+class SimulatedSegment:
+    """模拟段 - 只记录大小和提交量"""
+
+    closed = False
+
+    def __init__(self, size_bytes):
+        self.size_bytes = size_bytes
+        self.committed = 0
+
+    def __len__(self):
+        return self.size_bytes
+
+
+class SimulatedBackend:
+    """模拟后端 - 提交/归还只改变模拟主机的持有量"""
+
+    name = 'simulated'
+
+    def __init__(self, host):
+        self.host = host
+
+    def allocate(self, size_bytes):
+        return SimulatedSegment(size_bytes)
+
+    def commit(self, segment):
+        """整段提交，返回提交字节数"""
+        self.host.commit(segment.size_bytes - segment.committed)
+        segment.committed = segment.size_bytes
+        return segment.committed
+
+    def decommit(self, segment, offset, length):
+        freed = max(0, min(length, segment.committed))
+        segment.committed -= freed
+        self.host.decommit(freed)
+        return freed
+
+    def release(self, segment):
+        if segment.closed:
+            return
+        self.host.decommit(segment.committed)
+        segment.committed = 0
+        segment.closed = True
+
+
+class VirtualWaker(TimerWaker):
+    """等待即推进虚拟时钟"""
+
+    name = 'virtual'
+
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+
+    def wait(self, timeout):
+        self.clock.sleep(timeout)
+        self.wakeups += 1
+        return False
@@ -0,0 +1,471 @@
+"""批量回放 - 以数组运算同时回放N组参数
+
+按 EnhancedPIDController.compute、UnifiedResponseCalculator.calculate_response_size /
+should_adjust、AdaptiveEMAPredictor 以及 NerdyHolderPro 的决策与执行流程逐步重写为
+(N,) 数组运算，在记录的租户负载轨迹上闭环回放：读数 = 轨迹负载 + 各候选自己的持有量。
+
+与实时holder的差异：固定步长决策（无自适应节拍、无空闲轮），固定目标，
+无参数探索；回收压力按 SimulatedPressure 的同一模型由已用比例得出。
+统计按 PerformanceTracker 的定义在整段回放上计算，得分用 ParameterOptimizer.calculate_score。
+
+需要 numpy。
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ..memory.commit import PAGE_SIZE
+from ..optimizers import ParameterOptimizer
+
+# 回放覆盖的参数（其余优化器参数不影响决策）
+PARAM_NAMES = (
+    'pid_kp', 'pid_ki', 'pid_kd',
+    'response_base', 'response_curve', 'urgency_threshold',
+    'cost_decay_release', 'cost_decay_allocate',
+    'min_interval_release', 'min_interval_allocate',
+    'ema_fast', 'ema_slow', 'tolerance'
+)
+
+HISTORY = 20             # calculate_volatility 的窗口
+MIN_HISTORY = 10
+PRESSURE_BIAS = 5.0
+PRESSURE_ONSET = 0.90    # 与 SimulatedPressure 一致
+PRESSURE_SATURATION = 0.98
+MAX_RESPONSE_MB = 10000
+PAGES_PER_MB = 1024 * 1024 // PAGE_SIZE
+
+# 与 UnifiedResponseCalculator 一致的固定参数
+URGENT_RELEASE = 0.7
+BLOCK_ALLOCATE = 0.5
+LARGE_INTERVAL_RELEASE = 2.5
+LARGE_INTERVAL_ALLOCATE = 6.0
+LARGE_ADJ_THRESHOLD = 3000
+
+NONE, ALLOCATE, RELEASE = 0, 1, 2
+
+
+def chunked_allocation(target_mb):
+    """allocate_memory 的分块规则下实际分配量（到达95%即停）"""
+    allocated = 0
+    while allocated < target_mb:
+        remaining = target_mb - allocated
+        if remaining >= 1000:
+            chunk_size = 500
+        elif remaining >= 500:
+            chunk_size = 300
+        elif remaining >= 200:
+            chunk_size = 200
+        elif remaining >= 100:
+            chunk_size = 100
+        else:
+            chunk_size = max(50, int(remaining))
+        allocated += chunk_size
+        if allocated >= target_mb * 0.95:
+            break
+    return allocated
+
+
+_ALLOCATION_TABLE = None
+
+
+def allocation_table():
+    """0~MAX_RESPONSE_MB 的分配量查表"""
+    global _ALLOCATION_TABLE
+    if _ALLOCATION_TABLE is None:
+        _ALLOCATION_TABLE = np.array([chunked_allocation(mb) for mb in range(MAX_RESPONSE_MB + 1)],
+                                     dtype=np.float64)
+    return _ALLOCATION_TABLE
+
+
+def default_params():
+    """优化器默认参数（不读参数文件）"""
+    return ParameterOptimizer(config_file=None).params
+
+
+class BatchPipeline:
+    """N组参数的向量化决策流水线
+
+    candidates: 参数字典列表，缺省项取优化器默认值
+    target:     目标(%)，回放中固定；影子评估时随线上目标变化（set_target）
+    plant_mb:   持有量折算读数的分母（读数每MB变化 100/plant_mb %），默认为 total_mb；
+                影子评估时由学习到的对象增益给出
+    """
+
+    def __init__(self, candidates, total_mb, target, plant_mb=None):
+        if np is None:
+            raise RuntimeError("批量回放需要numpy")
+
+        defaults = default_params()
+        self.candidates = [dict(c) for c in candidates]
+        self.n = len(self.candidates)
+        self.total_mb = float(total_mb)
+        self.plant_mb = float(plant_mb or total_mb)
+        self.target = float(target)
+        self.params = {
+            name: np.array([float(c.get(name, defaults[name])) for c in self.candidates])
+            for name in PARAM_NAMES
+        }
+        self.scorer = ParameterOptimizer(config_file=None)
+        self.reset()
+
+    def set_target(self, target):
+        """EnhancedPIDController.set_target：更新目标并清空积分"""
+        self.target = float(target)
+        self.integral[:] = 0
+
+    def reset(self):
+        """清空回放状态（与新建的holder一致，时间原点为0）"""
+        n = self.n
+        self.holding = np.zeros(n)
+
+        self.fast = np.zeros(n)
+        self.slow = np.zeros(n)
+        self.history = np.zeros((n, HISTORY))
+        self.history_count = np.zeros(n, dtype=np.int64)
+        self.rows = np.arange(n)
+
+        self.integral = np.zeros(n)
+        self.last_error = np.zeros(n)
+        self.last_time = np.zeros(n)
+        self.last_action = np.zeros(n, dtype=np.int8)
+        self.action_change_time = np.zeros(n)
+
+        self.last_adjustment_time = np.zeros(n)
+        self.last_adjustment_size = np.zeros(n)
+        self.last_was_release = np.zeros(n, dtype=bool)
+
+        # PerformanceTracker 统计（整段）
+        self.records = 0
+        self.error_sum = np.zeros(n)
+        self.error_sq = np.zeros(n)
+        self.error_max = np.zeros(n)
+        self.blocked = np.zeros(n)
+        self.adjustments = np.zeros(n)
+        self.last_adjust_record = np.full(n, np.nan)
+        self.interval_count = np.zeros(n)
+        self.interval_sum = np.zeros(n)
+        self.interval_sq = np.zeros(n)
+        self.outside = np.zeros(n)
+        self.allocation_failures = np.zeros(n)
+        self.first_time = None
+        self.last_record_time = 0.0
+
+    def load_state(self, pid, response, ema, history):
+        """所有候选从同一个holder的运行状态出发（各组件 get_state() 与读数历史）"""
+        self.integral[:] = pid['integral']
+        self.last_error[:] = pid['last_error']
+        self.last_time[:] = pid['last_time']
+        self.last_action[:] = {'allocate': ALLOCATE, 'release': RELEASE}.get(pid['last_action'], NONE)
+        self.action_change_time[:] = pid['action_change_time']
+
+        self.last_adjustment_time[:] = response['last_adjustment_time']
+        self.last_adjustment_size[:] = response['last_adjustment_size']
+        self.last_was_release[:] = response['last_was_release']
+
+        if ema['fast_ema'] is not None:
+            self.fast[:] = ema['fast_ema']
+            self.slow[:] = ema['slow_ema']
+
+        # 环形窗口：下一次写入位置 count % HISTORY 处为最旧的读数
+        count = len(history)
+        for j, value in enumerate(history[-HISTORY:]):
+            self.history[:, (count - min(count, HISTORY) + j) % HISTORY] = value
+        self.history_count[:] = count
+
+    # ---- 读数 ----
+
+    def reading(self, load):
+        """控制刻度读数（与MeminfoSensor同样保留一位小数）"""
+        return np.round(np.minimum(load + self.holding / self.plant_mb * 100, 100), 1)
+
+    def observe(self, value, mask=None):
+        """observe_memory：历史窗口 + EMA"""
+        if mask is None:
+            mask = np.ones(self.n, dtype=bool)
+        slot = self.history_count % HISTORY
+        self.history[self.rows[mask], slot[mask]] = value[mask]
+        first = mask & (self.history_count == 0)
+        self.history_count = self.history_count + mask
+
+        fast_alpha = self.params['ema_fast']
+        slow_alpha = self.params['ema_slow']
+        fast = fast_alpha * value + (1 - fast_alpha) * self.fast
+        slow = slow_alpha * value + (1 - slow_alpha) * self.slow
+        self.fast = np.where(first, value, np.where(mask, fast, self.fast))
+        self.slow = np.where(first, value, np.where(mask, slow, self.slow))
+
+    def volatility(self):
+        """calculate_volatility：最近20个读数的总体标准差，不足10个为0"""
+        if self.history_count.min() >= HISTORY:
+            # 窗口已满（回放中绝大多数步）
+            deviation = self.history - self.history.mean(axis=1, keepdims=True)
+            np.square(deviation, out=deviation)
+            return np.sqrt(deviation.mean(axis=1))
+        count = np.minimum(self.history_count, HISTORY)
+        valid = np.arange(HISTORY)[None, :] < count[:, None]
+        size = np.maximum(count, 1)
+        mean = np.where(valid, self.history, 0).sum(axis=1) / size
+        variance = (np.where(valid, self.history - mean[:, None], 0) ** 2).sum(axis=1) / size
+        return np.where(self.history_count < MIN_HISTORY, 0.0, np.sqrt(variance))
+
+    # ---- 控制器 ----
+
+    def pid(self, now, current, mask):
+        """EnhancedPIDController.compute（只更新mask内的候选）"""
+        p = self.params
+        dt = np.maximum(0.1, now - self.last_time)
+        error = self.target - current
+        abs_error = np.abs(error)
+
+        action = np.where(error < 0, ALLOCATE, RELEASE).astype(np.int8)
+        changed = mask & (self.last_action != NONE) & (action != self.last_action)
+        to_release = action == RELEASE
+        reset = np.where(to_release,
+                         np.where(abs_error > 8, 0.0, self.integral * 0.1),
+                         np.where(abs_error > 12, 0.0, self.integral * 0.4))
+        integral = np.where(changed, reset, self.integral)
+        change_time = np.where(changed, now, self.action_change_time)
+
+        P = p['pid_kp'] * error
+        integral = np.clip(integral + error * dt, -40, 40)
+
+        since = now - change_time
+        weight = np.where(to_release,
+                          np.where(since < 8, 0.2 + 0.8 * (since / 8), 1.0),
+                          np.where(since < 18, 0.05 + 0.95 * (since / 18), 1.0))
+        I = p['pid_ki'] * integral * weight
+        D = p['pid_kd'] * ((error - self.last_error) / dt)
+        output = P + I + D
+
+        self.integral = np.where(mask, integral, self.integral)
+        self.action_change_time = np.where(mask, change_time, self.action_change_time)
+        self.last_action = np.where(mask, action, self.last_action)
+        self.last_error = np.where(mask, error, self.last_error)
+        self.last_time = np.where(mask, now, self.last_time)
+        return output
+
+    def response_size(self, error, pid_output, momentum, volatility, pressure):
+        """UnifiedResponseCalculator.calculate_response_size"""
+        p = self.params
+        is_release = error > 0
+        abs_error = np.abs(error)
+
+        base_mb = abs_error * self.total_mb / 100
+
+        urgency = np.clip(np.power(abs_error / p['urgency_threshold'], p['response_curve']), 0.3, 3.0)
+        urgency = np.where(is_release, urgency * 1.3, urgency)
+
+        pid_factor = np.clip(1.0 + (pid_output / 50), 0.5, 2.0)
+
+        same = error * momentum > 0
+        opposite = (error * momentum < 0) & (np.abs(momentum) > 2)
+        momentum_factor = np.where(same, np.minimum(1.5, 1.0 + np.abs(momentum) / 10),
+                                   np.where(opposite, 1.2, 1.0))
+
+        volatility_factor = np.clip(1.0 / (1.0 + volatility / 15), 0.8, 1.0)
+
+        pressure_factor = np.where(is_release, 1.0 + pressure, 1.0 - 0.5 * pressure)
+
+        response = (base_mb * p['response_base'] * urgency * pid_factor *
+                    momentum_factor * volatility_factor * pressure_factor)
+
+        return np.where(abs_error > 15, np.clip(response, 1000, 10000),
+               np.where(abs_error > 8, np.clip(response, 500, 5000),
+               np.where(abs_error > 3, np.clip(response, 200, 2000),
+                        np.clip(response, 50, 1000))))
+
+    def should_adjust(self, now, error, response, volatility, pressure, mask):
+        """UnifiedResponseCalculator.should_adjust（只更新mask内的候选）"""
+        p = self.params
+        since = now - self.last_adjustment_time
+        is_release = error > 0
+        abs_error = np.abs(error)
+        pressure = np.clip(pressure, 0.0, 1.0)
+
+        urgent = (is_release & (pressure >= URGENT_RELEASE)) | (is_release & (abs_error > 8))
+        held = ~is_release & (pressure >= BLOCK_ALLOCATE)
+
+        large = self.last_adjustment_size > LARGE_ADJ_THRESHOLD
+        min_interval = np.where(is_release,
+                                np.where(large, LARGE_INTERVAL_RELEASE, p['min_interval_release']),
+                                np.where(large, LARGE_INTERVAL_ALLOCATE, p['min_interval_allocate']))
+        min_interval = np.where(is_release, min_interval * (1.0 - 0.5 * pressure), min_interval)
+
+        protection = np.where(is_release, 6, 10)
+        protected = (since < min_interval) & (abs_error < protection)
+
+        urgency_bonus = np.where(is_release, np.maximum(0, (abs_error - 5) * 3),
+                                 np.maximum(0, (abs_error - 10) * 1))
+        benefit = response / 500 + abs_error / 3 + urgency_bonus
+
+        cost_decay = np.where(is_release, p['cost_decay_release'], p['cost_decay_allocate'])
+        frequency_cost = np.exp(-since / cost_decay)
+        frequency_cost = np.where(is_release, frequency_cost * 1.0, frequency_cost * 2.5)
+        volatility_cost = volatility / 8
+        recent_cost = self.last_adjustment_size / 1000
+
+        reversal = is_release != self.last_was_release
+        reversal_factor = np.where(reversal, np.where(is_release, 0.3, 0.6), 1.0)
+        frequency_cost = frequency_cost * reversal_factor
+        recent_cost = recent_cost * reversal_factor
+        cost = frequency_cost + volatility_cost + recent_cost
+
+        slow = since < min_interval * 1.5
+        threshold = np.where(is_release,
+                             np.where(abs_error > 6, 0.5, np.where(slow, 1.2, 0.8)),
+                             np.where(abs_error > 10, 0.8, np.where(slow, 2.0, 1.3)))
+        threshold = np.where(is_release, threshold * (1.0 - 0.5 * pressure), threshold * (1.0 + pressure))
+
+        ratio = benefit / np.maximum(0.1, cost)
+        decision = np.where(urgent, True, np.where(held | protected, False, ratio > threshold))
+
+        update = mask & decision
+        self.last_adjustment_time = np.where(update, now, self.last_adjustment_time)
+        self.last_adjustment_size = np.where(update, response, self.last_adjustment_size)
+        self.last_was_release = np.where(update, is_release, self.last_was_release)
+        return decision
+
+    # ---- 执行 ----
+
+    def allocate(self, size, load, mask):
+        """allocate_memory：分块规则，超出主机内存的部分失败"""
+        size = np.maximum(size, 0).astype(np.int64)
+        wanted = allocation_table()[np.minimum(size, MAX_RESPONSE_MB)]
+        # 超出查表范围的只有初始化时的一次性分配
+        for i in np.nonzero(mask & (size > MAX_RESPONSE_MB))[0]:
+            wanted[i] = chunked_allocation(int(size[i]))
+        free = np.maximum(0.0, (100 - load) / 100 * self.plant_mb - self.holding)
+        granted = np.minimum(wanted, free)
+        self.allocation_failures += mask & (granted < wanted)
+        self.holding = np.where(mask, self.holding + granted, self.holding)
+
+    def release(self, size, mask):
+        """release_memory：精确释放（部分释放按页向下对齐），不超过持有量"""
+        size = np.floor(size * PAGES_PER_MB) / PAGES_PER_MB
+        self.holding = np.where(mask, self.holding - np.minimum(size, self.holding), self.holding)
+
+    def record(self, now, measured, size, blocked):
+        """PerformanceTracker.record（所有候选各记一条）"""
+        if self.first_time is None:
+            self.first_time = now
+        self.last_record_time = now
+        self.records += 1
+        self.error_sum += measured
+        self.error_sq += measured ** 2
+        self.error_max = np.maximum(self.error_max, measured)
+        self.blocked += blocked
+
+        adjusted = (size > 0) & ~blocked
+        interval = now - self.last_adjust_record
+        counted = adjusted & ~np.isnan(self.last_adjust_record)
+        self.interval_count += counted
+        self.interval_sum += np.where(counted, interval, 0)
+        self.interval_sq += np.where(counted, interval ** 2, 0)
+        self.last_adjust_record = np.where(adjusted, now, self.last_adjust_record)
+
+    # ---- 主流程 ----
+
+    def initialize(self, load):
+        """NerdyHolderPro.initialize：读数后一次性补到目标"""
+        current = self.reading(load)
+        self.observe(current)
+        need = self.target - current
+        grow = need > 0
+        size = np.floor(need * self.total_mb / 100)
+        self.allocate(size, load, grow)
+        self.observe(self.reading(load), grow)
+
+    def step(self, now, load, observed=False):
+        """一轮决策与执行（_decide + apply）
+
+        observed: 本轮读数已在载入的状态中（影子从holder状态出发的第一轮）
+        """
+        p = self.params
+        current = self.reading(load)
+        if not observed:
+            self.observe(current)
+
+        measured = current - self.target
+        used = np.minimum(load + self.holding / self.plant_mb * 100, 100) / 100
+        pressure = np.clip((used - PRESSURE_ONSET) / (PRESSURE_SATURATION - PRESSURE_ONSET), 0.0, 1.0)
+        error = measured + pressure * PRESSURE_BIAS
+        volatility = self.volatility()
+        abs_measured = np.abs(measured)
+        self.outside += abs_measured > p['tolerance']
+
+        in_tolerance = np.abs(error) <= p['tolerance']
+        nothing_held = ~in_tolerance & (error > 0) & (self.holding == 0)
+        active = ~in_tolerance & ~nothing_held
+
+        momentum = self.fast - self.slow
+        pid_output = self.pid(now, current, active)
+        response = self.response_size(error, pid_output, momentum, volatility, pressure)
+        decision = self.should_adjust(now, error, response, volatility, pressure, active)
+
+        adjust = active & decision
+        blocked = nothing_held | (active & ~decision)
+        self.adjustments += adjust
+        self.record(now, abs_measured, np.where(active, response, 0.0), blocked)
+
+        self.allocate(response, load, adjust & (error < 0))
+        self.release(response, adjust & (error > 0))
+        self.observe(self.reading(load), adjust)
+
+    def run(self, load, step=1.0):
+        """在负载序列（每step秒一个点，%）上回放，返回各候选结果"""
+        load = np.asarray(load, dtype=np.float64)
+        self.reset()
+        self.initialize(load[0])
+        for i in range(1, len(load)):
+            self.step(i * step, load[i])
+        return self.results(len(load) - 1)
+
+    def stats(self, i):
+        """第i个候选的 PerformanceTracker.get_stats 同口径统计（整段）"""
+        n = self.records
+        mean = self.error_sum[i] / n
+        variance = max(0.0, (self.error_sq[i] - n * mean ** 2) / (n - 1)) if n > 1 else 0.0
+        count = self.interval_count[i]
+        if count > 2:
+            interval_mean = self.interval_sum[i] / count
+            interval_var = max(0.0, (self.interval_sq[i] - count * interval_mean ** 2) / (count - 1))
+        else:
+            interval_var = 0.0
+        span = self.last_record_time - self.first_time
+        return {
+            'avg_error': float(mean),
+            'max_error': float(self.error_max[i]),
+            'error_volatility': float(np.sqrt(variance)),
+            'block_rate': float(self.blocked[i] / n),
+            'adjustment_rate': float((n - self.blocked[i]) / max(1, span / 60)),
+            'interval_volatility': float(np.sqrt(interval_var)),
+            'release_overshoot': 0.0
+        }
+
+    def results(self, steps):
+        """各候选的得分与统计"""
+        results = []
+        for i in range(self.n):
+            stats = self.stats(i) if self.records >= 10 else None
+            score, scenario = self.scorer.calculate_score(stats)
+            result = dict(stats or {})
+            result.update({
+                'params': self.candidates[i],
+                'score': float(score),
+                'scenario': scenario,
+                'adjustments': int(self.adjustments[i]),
+                'blocked': int(self.blocked[i]),
+                'outside_tolerance': float(self.outside[i] / max(steps, 1)),
+                'allocation_failures': int(self.allocation_failures[i]),
+                'holding_mb': float(self.holding[i])
+            })
+            results.append(result)
+        return results
+
+
+def replay(trace, candidates, target, step=1.0):
+    """在轨迹上回放候选参数，返回各候选结果"""
+    pipeline = BatchPipeline(candidates, trace.total_mb, target)
+    return pipeline.run(trace.resample(step), step)
@@ -0,0 +1,165 @@
+"""离线调参 - 在多台主机的轨迹语料上做连续减半搜索
+
+搜索空间为 ParameterOptimizer.PARAM_LIMITS，候选在范围内均匀采样（含当前默认值）。
+每一轮所有存活候选在每条轨迹的同一前段上批量回放（见 replay.py），按跨轨迹的
+稳健得分（均值 - 标准差）保留前 1/eta，回放长度乘以 eta，最后一轮回放完整轨迹。
+
+并行：每轮拆成（轨迹 × 候选批）个独立任务交给 ProcessPoolExecutor，
+工作进程按路径加载并缓存轨迹，任务间不共享状态。
+"""
+
+import os
+import json
+import math
+import random
+import statistics
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from ..optimizers import ParameterOptimizer
+from ..trackers import MemoryTrace
+from .replay import BatchPipeline
+
+MIN_STEPS = 300          # 每轮每条轨迹至少回放的步数
+MIN_BATCH = 64           # 候选批下限（太小则向量化收益不足）
+
+_LOADS = {}              # 工作进程内缓存：(路径, 步长) -> (总量MB, 负载序列)
+
+
+def _load(path, step):
+    key = (path, step)
+    if key not in _LOADS:
+        trace = MemoryTrace.load_file(path)
+        _LOADS[key] = (trace.total_mb, trace.resample(step))
+    return _LOADS[key]
+
+
+def evaluate(path, candidates, target, step, fraction=1.0):
+    """在轨迹前 fraction 段上回放一批候选，返回得分列表（工作进程入口）"""
+    total_mb, load = _load(path, step)
+    count = min(len(load), max(MIN_STEPS, int(len(load) * fraction)))
+    pipeline = BatchPipeline(candidates, total_mb, target)
+    return [result['score'] for result in pipeline.run(load[:count], step)]
+
+
+def find_traces(directory, pattern='*.csv'):
+    """目录下的轨迹文件（按文件名排序）"""
+    paths = sorted(str(p) for p in Path(directory).glob(pattern))
+    if not paths:
+        raise ValueError(f"目录中没有轨迹: {directory}")
+    return paths
+
+
+def summarize(scores):
+    """跨轨迹汇总：均值、标准差（稳健性）、最差、稳健得分"""
+    mean = statistics.fmean(scores)
+    spread = statistics.pstdev(scores) if len(scores) > 1 else 0.0
+    return {
+        'mean': mean,
+        'spread': spread,
+        'worst': min(scores),
+        'robust': mean - spread
+    }
+
+
+class CorpusTuner:
+    """轨迹语料调参器
+
+    traces:  轨迹文件路径列表
+    target:  回放的固定目标(%)
+    eta:     每轮保留 1/eta，回放长度乘以 eta
+    workers: 进程数，默认CPU核数
+    """
+
+    def __init__(self, traces, target=60, step=2.0, eta=3, workers=None, seed=0,
+                 limits=None):
+        self.traces = list(traces)
+        self.target = target
+        self.step = step
+        self.eta = eta
+        self.workers = workers or os.cpu_count() or 1
+        self.rng = random.Random(seed)
+        self.limits = dict(limits or ParameterOptimizer.PARAM_LIMITS)
+        self.rounds = []
+
+    def sample(self, count):
+        """范围内均匀采样 count 组候选，第一组为当前默认值"""
+        defaults = ParameterOptimizer(config_file=None).params
+        candidates = [{name: defaults[name] for name in self.limits}]
+        while len(candidates) < count:
+            candidates.append({
+                name: round(self.rng.uniform(low, high), 4)
+                for name, (low, high) in self.limits.items()
+            })
+        return candidates
+
+    def _tasks(self, count):
+        """每条轨迹拆成的候选批大小"""
+        chunks = max(1, math.ceil(self.workers * 2 / len(self.traces)))
+        return max(MIN_BATCH, math.ceil(count / chunks))
+
+    def evaluate(self, executor, candidates, fraction):
+        """所有候选在每条轨迹前段上的得分矩阵 [候选][轨迹]"""
+        batch = self._tasks(len(candidates))
+        futures = []
+        for t, path in enumerate(self.traces):
+            for start in range(0, len(candidates), batch):
+                future = executor.submit(evaluate, path, candidates[start:start + batch],
+                                         self.target, self.step, fraction)
+                futures.append((t, start, future))
+
+        scores = [[0.0] * len(self.traces) for _ in candidates]
+        for t, start, future in futures:
+            for offset, score in enumerate(future.result()):
+                scores[start + offset][t] = score
+        return scores
+
+    def run(self, count=1000, progress=None):
+        """连续减半搜索，返回最后一轮候选的排名（稳健得分降序）"""
+        candidates = self.sample(count)
+        rounds = max(1, int(math.log(len(candidates), self.eta)))
+        self.rounds = []
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for r in range(rounds):
+                fraction = self.eta ** (r - rounds + 1)
+                scores = self.evaluate(executor, candidates, fraction)
+                ranked = sorted(
+                    (dict(summarize(s), params=c, scores=s) for c, s in zip(candidates, scores)),
+                    key=lambda entry: entry['robust'], reverse=True
+                )
+                self.rounds.append({'fraction': fraction, 'candidates': len(candidates)})
+                if progress:
+                    progress(r, fraction, ranked)
+
+                if r < rounds - 1:
+                    keep = max(1, math.ceil(len(candidates) / self.eta))
+                    candidates = [entry['params'] for entry in ranked[:keep]]
+
+        names = [Path(path).name for path in self.traces]
+        for entry in ranked:
+            entry['scores'] = dict(zip(names, entry['scores']))
+        return ranked
+
+    def write(self, ranking, path='nerdy_params.json', report=None):
+        """写出第一名参数（holder启动时加载）和完整排名报告，返回报告路径
+
+        报告默认与参数文件同目录，名为 <参数文件名>.tuning.json；
+        不写进参数文件：holder会把其中所有键当作参数加载并反复保存
+        """
+        report = report or str(Path(path).with_suffix('.tuning.json'))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(ranking[0]['params'], f, indent=2)
+
+        with open(report, 'w', encoding='utf-8') as f:
+            json.dump({
+                'target': self.target,
+                'step': self.step,
+                'traces': [Path(p).name for p in self.traces],
+                'rounds': self.rounds,
+                'ranking': [
+                    dict(rank=rank, **entry)
+                    for rank, entry in enumerate(ranking, 1)
+                ]
+            }, f, indent=2)
+        return report
@@ -0,0 +1,5 @@
+"""状态导出模块"""
+
+from .block import StatusWriter, StatusReader, STATUS_BLOCK, FIELDS
+
+__all__ = ['StatusWriter', 'StatusReader', 'STATUS_BLOCK', 'FIELDS']
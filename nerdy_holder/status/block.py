@@ -0,0 +1,230 @@
+"""共享内存状态块 - 固定布局，顺序锁(seqlock)原地更新
+
+布局: 头部 magic(4s) version(I) seq(Q)，之后是 FIELDS 按顺序打包的负载。
+写者: seq加1(奇数) → 写负载 → seq再加1(偶数)
+读者: 读seq(偶数) → 复制负载 → 再读seq，两次相同即为一致快照，否则重试
+
+只包含标量字段；commit_check / backend_stats / pressure.rates 等嵌套明细仍只在JSON中
+"""
+
+import os
+import mmap
+import struct
+import tempfile
+import time
+
+MAGIC = b'NRDY'
+VERSION = 1
+HEADER = struct.Struct('<4sIQ')
+SEQ_OFFSET = 8
+
+STATUS_BLOCK = os.path.join('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(),
+                            'nerdy_status')
+
+# (状态字典中的点路径, struct格式)
+FIELDS = (
+    ('timestamp', 'd'),
+    ('current_target', 'd'),
+    ('system_memory', 'd'),
+    ('sensor.name', '16s'),
+    ('sensor.unit', '8s'),
+    ('sensor.value', 'd'),
+    ('sensor.target', 'd'),
+    ('holding_mb', 'q'),
+    ('nominal_mb', 'q'),
+    ('rss_mb', 'd'),
+    ('chunks_count', 'q'),
+    ('backend', '16s'),
+    ('runtime', '8s'),
+    ('waker', '8s'),
+    ('fill.policy', '8s'),
+    ('fill.mb_per_sec', 'd'),
+    ('hugepage.anon_huge_mb', 'd'),
+    ('release_latency_ms.last', 'd'),
+    ('release_latency_ms.avg', 'd'),
+    ('release_latency_ms.max', 'd'),
+    ('params.pid_kp', 'd'),
+    ('params.pid_ki', 'd'),
+    ('params.pid_kd', 'd'),
+    ('params.response_base', 'd'),
+    ('params.response_curve', 'd'),
+    ('params.tolerance', 'd'),
+    ('stats.uptime_seconds', 'd'),
+    ('stats.decisions', 'q'),
+    ('stats.adjustments', 'q'),
+    ('stats.blocked', 'q'),
+    ('stats.optimizations', 'q'),
+    ('stats.pressure_wakeups', 'q'),
+    ('scheduler.interval_s', 'd'),
+    ('scheduler.idle', '?'),
+    ('scheduler.idle_ticks', 'q'),
+    ('cpu_seconds_per_hour', 'd'),
+    ('pressure.score', 'd'),
+    ('pressure.psi_some_avg10', 'd'),
+    ('pressure.psi_full_avg10', 'd'),
+    ('actuator.busy', '?'),
+    ('actuator.release_start_latency_ms.last', 'd'),
+    ('watchdog.floor_mb', 'd'),
+    ('watchdog.breaches', 'q'),
+    ('watchdog.breach_to_freed_ms.last', 'd'),
+    ('performance.avg_error', 'd'),
+    ('performance.error_volatility', 'd'),
+    ('performance.block_rate', 'd'),
+    ('performance.release_overshoot_mb', 'd'),
+    ('performance.score', 'd'),
+)
+
+PAYLOAD = struct.Struct('<' + ''.join(fmt for _, fmt in FIELDS))
+SIZE = HEADER.size + PAYLOAD.size
+PATHS = [tuple(path.split('.')) for path, _ in FIELDS]
+STRINGS = [i for i, (_, fmt) in enumerate(FIELDS) if fmt.endswith('s')]
+
+
+def flatten(status):
+    """状态字典 → 负载值（缺失字段为0/空）"""
+    values = []
+    for keys, (_, fmt) in zip(PATHS, FIELDS):
+        value = status
+        for key in keys:
+            value = value.get(key) if isinstance(value, dict) else None
+        if fmt.endswith('s'):
+            values.append(str(value or '').encode())
+        elif fmt == '?':
+            values.append(bool(value))
+        elif fmt == 'q':
+            values.append(int(value or 0))
+        else:
+            values.append(float(value or 0))
+    return values
+
+
+def unflatten(values):
+    """负载值 → 与JSON同结构的状态字典"""
+    values = list(values)
+    for i in STRINGS:
+        values[i] = values[i].rstrip(b'\0').decode(errors='replace')
+
+    status = {}
+    for keys, value in zip(PATHS, values):
+        node = status
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        node[keys[-1]] = value
+    return status
+
+
+class StatusWriter:
+    """状态块写者（holder进程内唯一）"""
+
+    def __init__(self, path=STATUS_BLOCK):
+        self.path = path
+        self.seq = 0
+
+        # 先在临时文件中建好再原子改名，读者不会看到缺失或半初始化的文件
+        tmp = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, SIZE)
+            self.mm = mmap.mmap(fd, SIZE, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        finally:
+            os.close(fd)
+        HEADER.pack_into(self.mm, 0, MAGIC, VERSION, 0)
+        os.rename(tmp, path)
+
+    def write(self, status):
+        """原地写入一次快照"""
+        values = flatten(status)
+        self.seq += 1
+        struct.pack_into('<Q', self.mm, SEQ_OFFSET, self.seq)
+        PAYLOAD.pack_into(self.mm, HEADER.size, *values)
+        self.seq += 1
+        struct.pack_into('<Q', self.mm, SEQ_OFFSET, self.seq)
+
+    def close(self, unlink=False):
+        self.mm.close()
+        if unlink:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+class StatusReader:
+    """状态块读者 - 映射一次，每次读取为一致快照（无需解析）"""
+
+    def __init__(self, path=STATUS_BLOCK, stale_after=2.0):
+        self.path = path
+        self.stale_after = stale_after
+        self.mm = None
+        self.inode = None
+        self.retries = 0
+
+    def attach(self):
+        """映射状态块，返回是否成功"""
+        self.detach()
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except OSError:
+            return False
+        try:
+            st = os.fstat(fd)
+            if st.st_size < SIZE:
+                return False
+            mm = mmap.mmap(fd, SIZE, mmap.MAP_SHARED, mmap.PROT_READ)
+        finally:
+            os.close(fd)
+
+        magic, version, _ = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or version != VERSION:
+            mm.close()
+            return False
+        self.mm = mm
+        self.inode = st.st_ino
+        return True
+
+    def detach(self):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+
+    def _replaced(self):
+        """写者重启后文件被替换"""
+        try:
+            return os.stat(self.path).st_ino != self.inode
+        except OSError:
+            return False
+
+    def read_values(self, max_retries=1000):
+        """一致快照的负载值，无状态块或持续冲突时返回None"""
+        if self.mm is None and not self.attach():
+            return None
+
+        mm = self.mm
+        for _ in range(max_retries):
+            seq = struct.unpack_from('<Q', mm, SEQ_OFFSET)[0]
+            if seq & 1:
+                self.retries += 1
+                continue
+            payload = mm[HEADER.size:SIZE]
+            if struct.unpack_from('<Q', mm, SEQ_OFFSET)[0] == seq:
+                if seq == 0:
+                    return None     # 尚未写入
+                return PAYLOAD.unpack(payload)
+            self.retries += 1
+        return None
+
+    def read(self):
+        """一致快照（与JSON同结构的字典）"""
+        values = self.read_values()
+        if values is None:
+            return None
+
+        # 快照过旧时检查写者是否已重建状态块
+        if time.time() - values[0] > self.stale_after and self._replaced() and self.attach():
+            values = self.read_values()
+            if values is None:
+                return None
+        return unflatten(values)
+
+    def close(self):
+        self.detach()
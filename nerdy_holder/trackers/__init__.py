@@ -1,5 +1,6 @@
 """追踪器模块"""
 
 from .performance import PerformanceTracker
+from .trace import MemoryTrace, TraceRecorder
 
-__all__ = ['PerformanceTracker']
+__all__ = ['PerformanceTracker', 'MemoryTrace', 'TraceRecorder']
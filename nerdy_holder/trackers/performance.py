@@ -8,13 +8,15 @@ from collections import deque
 class PerformanceTracker:
     """性能追踪器 - 多维度"""
 
-    def __init__(self):
+    def __init__(self, clock=time):
+        self.clock = clock
         self.metrics_window = deque(maxlen=100)
         self.adjustment_times = deque(maxlen=50)
+        self.release_overshoots = deque(maxlen=50)
 
     def record(self, error, adjustment_size, was_blocked):
         """记录一次决策"""
-        now = time.time()
+        now = self.clock.time()
 
         if adjustment_size > 0 and not was_blocked:
             self.adjustment_times.append(now)
@@ -26,6 +28,20 @@ class PerformanceTracker:
             'was_blocked': was_blocked
         })
 
+    def mark_blocked(self):
+        """把最近一次调整改记为阻止（计划未被执行）"""
+        for entry in reversed(self.metrics_window):
+            if entry['adjustment_size'] > 0 and not entry['was_blocked']:
+                entry['was_blocked'] = True
+                if entry['timestamp'] in self.adjustment_times:
+                    self.adjustment_times.remove(entry['timestamp'])
+                return True
+        return False
+
+    def record_release(self, requested_mb, released_mb):
+        """记录一次释放的超出量（正=多释放，负=少释放）"""
+        self.release_overshoots.append(released_mb - requested_mb)
+
     def get_stats(self):
         """获取统计数据 - 多维度"""
         if len(self.metrics_window) < 10:
@@ -40,6 +56,9 @@ class PerformanceTracker:
         errors = [m['error'] for m in recent]
         error_volatility = statistics.stdev(errors) if len(errors) > 1 else 0
 
+        # 最大误差（代理模型探索的安全约束）
+        max_error = max(errors)
+
         # 3. 阻止率
         block_rate = sum(1 for m in recent if m['was_blocked']) / len(recent)
 
@@ -57,10 +76,18 @@ class PerformanceTracker:
         else:
             interval_volatility = 0
 
+        # 6. 释放超出量
+        if self.release_overshoots:
+            release_overshoot = sum(abs(x) for x in self.release_overshoots) / len(self.release_overshoots)
+        else:
+            release_overshoot = 0
+
         return {
             'avg_error': avg_error,
+            'max_error': max_error,
             'error_volatility': error_volatility,
             'block_rate': block_rate,
             'adjustment_rate': adjustment_rate,
-            'interval_volatility': interval_volatility
+            'interval_volatility': interval_volatility,
+            'release_overshoot': release_overshoot
         }
@@ -0,0 +1,103 @@
+"""内存轨迹 - 记录主机读数与持有量，离线回放时还原租户负载
+
+文件为CSV，首行注释记录内存总量：
+    # nerdy-trace total_mb=32768
+    time,used_percent,holding_mb
+    1700000000.000,45.2,8192.0
+租户负载 = 已用百分比 - 持有量折算的百分比
+"""
+
+import bisect
+
+HEADER = 'time,used_percent,holding_mb'
+
+
+class MemoryTrace:
+    """内存轨迹 - 租户负载(%)随时间变化"""
+
+    def __init__(self, times, load, total_mb, name=''):
+        self.times = list(times)
+        self.load = list(load)
+        self.total_mb = total_mb
+        self.name = name
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def duration(self):
+        return self.times[-1] - self.times[0] if self.times else 0
+
+    def load_at(self, seconds):
+        """自起点 seconds 秒处的负载（线性插值，两端取端点值）"""
+        t = self.times[0] + seconds
+        i = bisect.bisect_right(self.times, t)
+        if i <= 0:
+            return self.load[0]
+        if i >= len(self.times):
+            return self.load[-1]
+        t0, t1 = self.times[i - 1], self.times[i]
+        v0, v1 = self.load[i - 1], self.load[i]
+        if t1 == t0:
+            return v1
+        return v0 + (v1 - v0) * (t - t0) / (t1 - t0)
+
+    def resample(self, step):
+        """按固定步长重采样，返回 [负载]"""
+        count = int(self.duration // step) + 1
+        return [self.load_at(i * step) for i in range(count)]
+
+    @classmethod
+    def load_file(cls, path):
+        """读取轨迹文件"""
+        times, load = [], []
+        total_mb = None
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line == HEADER:
+                    continue
+                if line.startswith('#'):
+                    for item in line[1:].split():
+                        if item.startswith('total_mb='):
+                            total_mb = float(item[9:])
+                    continue
+                if total_mb is None:
+                    raise ValueError(f"轨迹缺少total_mb: {path}")
+                t, used, holding = line.split(',')
+                times.append(float(t))
+                load.append(float(used) - float(holding) / total_mb * 100)
+        if total_mb is None:
+            raise ValueError(f"轨迹缺少total_mb: {path}")
+        return cls(times, load, total_mb, name=str(path))
+
+    def save(self, path):
+        """写出轨迹（持有量记为0）"""
+        with TraceRecorder(path, self.total_mb) as recorder:
+            for t, load in zip(self.times, self.load):
+                recorder.record(t, load, 0)
+
+
+class TraceRecorder:
+    """轨迹记录器 - holder每轮追加一行"""
+
+    def __init__(self, path, total_mb):
+        self.path = path
+        self.total_mb = total_mb
+        self.file = open(path, 'w', encoding='utf-8')
+        self.file.write(f"# nerdy-trace total_mb={total_mb:g}\n{HEADER}\n")
+        self.records = 0
+
+    def record(self, timestamp, used_percent, holding_mb):
+        self.file.write(f"{timestamp:.3f},{used_percent:.4f},{holding_mb:.1f}\n")
+        self.records += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
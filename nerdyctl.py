@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Nerdy Holder control client 🤓☝
+"""
+
+import sys
+import json
+import argparse
+from nerdy_holder.control import ControlClient, CONTROL_SOCKET
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Control a running Nerdy Holder')
+    parser.add_argument('--socket', default=CONTROL_SOCKET, metavar='PATH',
+                       help=f'Holder control socket (default: {CONTROL_SOCKET})')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('status', help='Print the current status as JSON')
+
+    target = commands.add_parser('set-target', help='Switch to a fixed target (sensor units)')
+    target.add_argument('value', type=float)
+
+    target_range = commands.add_parser('set-range', help='Switch to a dynamic target range (sensor units)')
+    target_range.add_argument('low', type=float)
+    target_range.add_argument('high', type=float)
+
+    tolerance = commands.add_parser('set-tolerance', help='Set the tolerance in percent')
+    tolerance.add_argument('value', type=float)
+
+    release = commands.add_parser('release', help='Release MB now, bypassing the decision pipeline')
+    release.add_argument('mb', type=float)
+
+    hold = commands.add_parser('hold', help='Allocate MB more now')
+    hold.add_argument('mb', type=int)
+
+    commands.add_parser('watch', help='Stream decision events as NDJSON until interrupted')
+
+    args = parser.parse_args()
+
+    try:
+        client = ControlClient(args.socket)
+    except OSError as e:
+        print(f"Cannot connect to {args.socket}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    with client:
+        if args.command == 'watch':
+            try:
+                for event in client.subscribe():
+                    print(json.dumps(event, ensure_ascii=False), flush=True)
+            except KeyboardInterrupt:
+                pass
+            return
+
+        if args.command == 'status':
+            reply = client.request('status')
+        elif args.command == 'set-target':
+            reply = client.request('set_target', value=args.value)
+        elif args.command == 'set-range':
+            reply = client.request('set_range', low=args.low, high=args.high)
+        elif args.command == 'set-tolerance':
+            reply = client.request('set_tolerance', value=args.value)
+        elif args.command == 'release':
+            reply = client.request('release', mb=args.mb)
+        else:
+            reply = client.request('hold', mb=args.mb)
+
+    print(json.dumps(reply, indent=2, ensure_ascii=False))
+    if not reply.get('ok'):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,84 @@ Nerdy Holder 🤓☝
 
 import argparse
 from nerdy_holder import NerdyHolderPro
+from nerdy_holder.sensors import SENSORS, DEFAULT_TRIGGER
+from nerdy_holder.status import STATUS_BLOCK
+from nerdy_holder.control import CONTROL_SOCKET
+from nerdy_holder.optimizers import OPTIMIZERS
+from nerdy_holder.memory import (
+    BACKENDS, COMMIT_METHODS, FILL_POLICIES, benchmark_prefault, benchmark_fill, cleanup_segments
+)
 
 
 def main():
     parser = argparse.ArgumentParser(description='Nerdy Holder - Over-engineering Memory Holder')
     parser.add_argument('--no-benchmark', action='store_true',
                        help='Disable benchmark export')
+    parser.add_argument('--status-block', default=STATUS_BLOCK, metavar='PATH',
+                       help=f'Shared-memory status block for monitors (default: {STATUS_BLOCK})')
+    parser.add_argument('--status-json', action='store_true',
+                       help='Also write nerdy_status.json once per second (slow path)')
+    parser.add_argument('--control-socket', default=CONTROL_SOCKET, metavar='PATH',
+                       help=f'Control socket for nerdyctl.py (default: {CONTROL_SOCKET})')
+    parser.add_argument('--no-control', action='store_true',
+                       help='Disable the control socket')
+    parser.add_argument('--record-trace', metavar='PATH',
+                       help='Record every reading with the holding to a CSV trace for offline replay')
+    parser.add_argument('--optimizer', choices=sorted(OPTIMIZERS), default='random',
+                       help='Parameter exploration: random single-parameter nudges, or a bayesian surrogate over '
+                            'the full vector including PID gains and EMA alphas (default: random)')
+    parser.add_argument('--max-error', type=float, metavar='PCT',
+                       help='Bayesian exploration skips candidates predicted to exceed this error (default: 5)')
+    parser.add_argument('--shadows', type=int, default=0, metavar='N',
+                       help='Evaluate N candidate parameter sets alongside the live controller on every reading '
+                            'and promote the best instead of exploring live (requires numpy, default: off)')
     parser.add_argument('--fixed-target', type=float,
-                       help='Fixed target percentage (e.g., 80)')
+                       help='Fixed target in sensor units (e.g., 80 for used%%, 2048 for available MB)')
     parser.add_argument('--dynamic-range', type=float, nargs=2, metavar=('MIN', 'MAX'),
-                       help='Custom dynamic range (e.g., --dynamic-range 30 40)')
+                       help='Custom dynamic range in sensor units (e.g., --dynamic-range 30 40)')
+    parser.add_argument('--sensor', choices=sorted(SENSORS), default='used',
+                       help='Controlled metric: used (%%), available (MemAvailable floor, MB), '
+                            'commit (CommitLimit - Committed_AS headroom, MB), '
+                            'cgroup (memory.current, MB) (default: used)')
+    parser.add_argument('--psi-trigger', default=DEFAULT_TRIGGER, metavar='TRIGGER',
+                       help=f'PSI memory trigger that wakes the loop (default: "{DEFAULT_TRIGGER}")')
+    parser.add_argument('--no-psi', action='store_true',
+                       help='Disable PSI wakeups and poll on a fixed timeout')
+    parser.add_argument('--runtime', choices=('sync', 'async'), default='sync',
+                       help='Main loop: sync (one step after another) or async (concurrent tasks)')
+    parser.add_argument('--slice-budget', type=float, metavar='SECONDS',
+                       help='Allocate in background slices of at most this long, aborting between '
+                            'slices when a release is needed (default: off, one blocking call)')
+    parser.add_argument('--no-watchdog', action='store_true',
+                       help='Disable the emergency release watchdog thread')
+    parser.add_argument('--watchdog-floor', type=float, metavar='MB',
+                       help='MemAvailable floor that triggers an immediate release '
+                            '(default: 2%% of RAM, at least 256MB; lowered to half the '
+                            'MemAvailable left at the highest target if above it)')
+    parser.add_argument('--watchdog-psi-full', type=float, default=10.0, metavar='PCT',
+                       help='PSI "full" stall share over 1s that triggers an immediate release (default: 10)')
+    parser.add_argument('--oom-score-adj', type=int, default=1000, metavar='N',
+                       help='oom_score_adj for the holder so the OOM killer picks it first (default: 1000)')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='bytearray',
+                       help='Memory chunk backend (default: bytearray)')
+    parser.add_argument('--commit-method', choices=COMMIT_METHODS, default='stride',
+                       help='Page commit method (default: stride)')
+    parser.add_argument('--fill', choices=FILL_POLICIES, default='zero',
+                       help='Page fill policy against zswap/zram/KSM (default: zero)')
+    parser.add_argument('--fill-benchmark', type=int, metavar='MB',
+                       help='Report fill throughput and compressibility per policy, then exit')
+    parser.add_argument('--prefault-workers', type=int,
+                       help='Parallel prefault threads (default: CPU count)')
+    parser.add_argument('--prefault-rate', type=float, metavar='MBPS',
+                       help='Prefault throughput ceiling in MB/s')
+    parser.add_argument('--prefault-benchmark', type=int, metavar='MB',
+                       help='Report time-to-target for 1, 2, 4 and N workers, then exit')
+    parser.add_argument('--cleanup-segments', action='store_true',
+                       help='Remove orphaned shm segments left by a stopped holder, then exit')
+    parser.add_argument('--handover-socket', metavar='PATH',
+                       help='Listen for a successor and hand over held memory (memfd/shm backends)')
+    parser.add_argument('--takeover', metavar='PATH',
+                       help='Take over held memory from a running holder via its handover socket')
 
     args = parser.parse_args()
 
@@ -22,10 +90,53 @@ def main():
     if args.fixed_target and args.dynamic_range:
         parser.error('--fixed-target and --dynamic-range cannot be used together')
 
+    if args.cleanup_segments:
+        result = cleanup_segments()
+        if result is None:
+            print("A holder is running; segments are in use")
+        else:
+            print(f"Removed {result[0]} segments ({result[1]:.0f}MB)")
+        return
+
+    if args.fill_benchmark:
+        print(f"Fill benchmark: {args.fill_benchmark}MB ({args.backend})")
+        for r in benchmark_fill(args.fill_benchmark, backend=args.backend):
+            print(f"  {r['policy']:>7}: {r['mb_per_sec']:8.0f} MB/s | "
+                  f"compressed to {r['compress_ratio']:.0%}")
+        return
+
+    if args.prefault_benchmark:
+        print(f"Prefault benchmark: {args.prefault_benchmark}MB ({args.backend})")
+        for r in benchmark_prefault(args.prefault_benchmark, backend=args.backend):
+            print(f"  {r['workers']:>3} workers: {r['seconds']:7.2f}s | {r['mb_per_sec']:8.0f} MB/s")
+        return
+
     holder = NerdyHolderPro(
         enable_benchmark=not args.no_benchmark,
         fixed_target=args.fixed_target,
-        dynamic_range=tuple(args.dynamic_range) if args.dynamic_range else None
+        dynamic_range=tuple(args.dynamic_range) if args.dynamic_range else None,
+        backend=args.backend,
+        commit_method=args.commit_method,
+        prefault_workers=args.prefault_workers,
+        prefault_rate=args.prefault_rate,
+        fill_policy=args.fill,
+        handover_socket=args.handover_socket,
+        takeover_socket=args.takeover,
+        sensor=args.sensor,
+        waker='' if args.no_psi else args.psi_trigger,
+        runtime=args.runtime,
+        slice_budget=args.slice_budget or None,
+        watchdog=not args.no_watchdog,
+        watchdog_floor_mb=args.watchdog_floor,
+        watchdog_psi_full=args.watchdog_psi_full,
+        oom_score_adj=args.oom_score_adj,
+        status_block=args.status_block,
+        status_json=args.status_json,
+        control_socket=None if args.no_control else args.control_socket,
+        trace_file=args.record_trace,
+        optimizer=args.optimizer,
+        max_error=args.max_error,
+        shadows=args.shadows
     )
     holder.run()
 
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Nerdy Simulation 🤓☝
+"""
+
+import argparse
+import statistics
+from nerdy_holder.optimizers import OPTIMIZERS
+from nerdy_holder.simulation import Simulation
+
+
+def convergence_windows(hours):
+    """按倍增划分的小时窗口：[0,1), [1,2), [2,4), [4,8) ..."""
+    windows = [(0, 1)]
+    while windows[-1][1] < hours:
+        start = windows[-1][1]
+        windows.append((start, min(hours, start * 2)))
+    return windows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the holder against a simulated host on a virtual clock')
+    parser.add_argument('--hours', type=float, default=24,
+                       help='Simulated hours to run (default: 24)')
+    parser.add_argument('--seed', type=int, nargs='+', default=[0],
+                       help='Random seeds; one run per seed (default: 0)')
+    parser.add_argument('--fixed-target', type=float,
+                       help='Fixed target in sensor units')
+    parser.add_argument('--dynamic-range', type=float, nargs=2, metavar=('MIN', 'MAX'),
+                       help='Dynamic range in sensor units')
+    parser.add_argument('--total-mb', type=int, default=32768,
+                       help='Simulated host memory in MB (default: 32768)')
+    parser.add_argument('--base-mb', type=int, default=8192,
+                       help='Co-tenant baseline load in MB (default: 8192)')
+    parser.add_argument('--burst-mb', type=int, default=4096,
+                       help='Mean co-tenant burst size in MB (default: 4096)')
+    parser.add_argument('--noise-mb', type=float, default=32,
+                       help='Page-cache noise per sample, standard deviation in MB (default: 32)')
+    parser.add_argument('--optimizer', choices=sorted(OPTIMIZERS), nargs='+', default=['random'],
+                       help='Parameter exploration modes; several are compared on the same seeds (default: random)')
+    parser.add_argument('--max-error', type=float, metavar='PCT',
+                       help='Max-error safety bound for bayesian exploration (default: 5)')
+    parser.add_argument('--shadows', type=int, default=0, metavar='N',
+                       help='Evaluate N candidate parameter sets as shadow controllers instead of live exploration')
+    parser.add_argument('--verbose', action='store_true',
+                       help='Print the holder log')
+
+    args = parser.parse_args()
+
+    hourly = {}
+    for optimizer in args.optimizer:
+        hourly[optimizer] = []
+        for seed in args.seed:
+            simulation = Simulation(
+                seed=seed,
+                fixed_target=args.fixed_target,
+                dynamic_range=args.dynamic_range,
+                optimizer=optimizer,
+                max_error=args.max_error,
+                shadows=args.shadows,
+                verbose=args.verbose,
+                total_mb=args.total_mb,
+                base_mb=args.base_mb,
+                burst_mb=args.burst_mb,
+                cache_noise_mb=args.noise_mb
+            )
+            result = simulation.run(args.hours * 3600)
+            simulation.close()
+            hourly[optimizer].append(result['hourly_error'])
+
+            print(f"[{optimizer}] seed {seed}: {result['simulated_seconds'] / 3600:.1f}h in {result['wall_seconds']:.1f}s "
+                  f"({result['speedup']:.0f}x) | error {result['mean_abs_error']:.2f}% "
+                  f"(max {result['max_abs_error']:.1f}%) | outside tolerance {result['outside_tolerance']:.1%} | "
+                  f"adjustments {result['adjustments']} | blocked {result['blocked']} | "
+                  f"overcommit {result['overcommit_seconds']:.0f}s | "
+                  f"score {result['score']:.1f} [{result['scenario']}]")
+
+    # 收敛：各探索方式在倍增时间窗口内的平均误差（跨种子）
+    print("\nmean error by hour window:")
+    for start, end in convergence_windows(int(args.hours)):
+        cells = []
+        for optimizer, runs in hourly.items():
+            values = [e for run in runs for e in run[start:end]]
+            if values:
+                cells.append(f"{optimizer} {statistics.fmean(values):.3f}%")
+        if cells:
+            print(f"  {start:>4}-{end:<4}h  " + " | ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Nerdy Tuner 🤓☝
+"""
+
+import argparse
+from nerdy_holder.simulation import CorpusTuner
+from nerdy_holder.simulation.tuner import find_traces
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tune holder parameters offline against a directory of recorded traces')
+    parser.add_argument('traces',
+                       help='Directory of traces recorded with run_holder.py --record-trace')
+    parser.add_argument('--pattern', default='*.csv',
+                       help='Trace file pattern (default: *.csv)')
+    parser.add_argument('--candidates', type=int, default=1000,
+                       help='Parameter sets sampled in the first round (default: 1000)')
+    parser.add_argument('--eta', type=int, default=3,
+                       help='Keep 1/ETA per round and replay ETA times longer (default: 3)')
+    parser.add_argument('--target', type=float, default=60,
+                       help='Fixed target used for replay, percent (default: 60)')
+    parser.add_argument('--step', type=float, default=2.0,
+                       help='Replay decision step in seconds (default: 2.0)')
+    parser.add_argument('--workers', type=int,
+                       help='Worker processes (default: CPU count)')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='Sampling seed (default: 0)')
+    parser.add_argument('--output', default='nerdy_params.json',
+                       help='Parameter file to write (default: nerdy_params.json)')
+    parser.add_argument('--report',
+                       help='Ranking report to write (default: OUTPUT with a .tuning.json suffix)')
+
+    args = parser.parse_args()
+
+    tuner = CorpusTuner(find_traces(args.traces, args.pattern), target=args.target, step=args.step,
+                        eta=args.eta, workers=args.workers, seed=args.seed)
+
+    def progress(round_index, fraction, ranked):
+        best = ranked[0]
+        print(f"round {round_index + 1}: {len(ranked)} candidates on {fraction:.1%} of {len(tuner.traces)} traces | "
+              f"best robust {best['robust']:.1f} (mean {best['mean']:.1f}, spread {best['spread']:.1f})")
+
+    ranking = tuner.run(args.candidates, progress=progress)
+    report = tuner.write(ranking, args.output, args.report)
+
+    print(f"\nwrote {args.output} and {report}")
+    for rank, entry in enumerate(ranking, 1):
+        params = ', '.join(f"{k}={v:g}" for k, v in entry['params'].items())
+        print(f"#{rank} robust {entry['robust']:.1f} | mean {entry['mean']:.1f} | spread {entry['spread']:.1f} | "
+              f"worst {entry['worst']:.1f} | {params}")
+
+
+if __name__ == "__main__":
+    main()
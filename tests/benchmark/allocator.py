@@ -1,23 +1,31 @@
 """内存分配器"""
 
-import random
+import time
 import threading
 
+from nerdy_holder.memory import MemoryChunk, touch_pages, get_anon_huge_bytes
+
 
 class MemoryAllocator:
     """智能内存分配器"""
 
-    def __init__(self):
+    def __init__(self, hugepages=False):
         self.chunks = []
         self.lock = threading.Lock()
+        self.hugepages = hugepages
+        self.alloc_seconds = 0
 
     def allocate_mb(self, mb):
         """分配指定MB"""
         with self.lock:
             try:
-                chunk = bytearray(int(mb * 1024 * 1024))
-                for i in range(0, len(chunk), 1024*1024):
-                    chunk[i] = random.randint(0, 255)
+                start = time.perf_counter()
+                if self.hugepages:
+                    chunk = MemoryChunk(max(1, int(mb)), 'hugepage').data
+                else:
+                    chunk = bytearray(int(mb * 1024 * 1024))
+                    touch_pages(chunk)
+                self.alloc_seconds += time.perf_counter() - start
                 self.chunks.append(chunk)
                 return mb
             except Exception:
@@ -30,16 +38,48 @@ class MemoryAllocator:
             while self.chunks and released < mb:
                 chunk = self.chunks.pop()
                 released += len(chunk) / (1024*1024)
+                self._drop(chunk)
             return released
 
     def release_all(self):
         """释放全部"""
         with self.lock:
             total = sum(len(c) for c in self.chunks) / (1024*1024)
+            for chunk in self.chunks:
+                self._drop(chunk)
             self.chunks.clear()
             return total
 
+    def _drop(self, chunk):
+        """大页块需显式解除映射"""
+        if isinstance(chunk, memoryview):
+            region = chunk.obj
+            chunk.release()
+            region.close()
+
     def get_total_mb(self):
         """获取总持有量"""
         with self.lock:
             return sum(len(c) for c in self.chunks) / (1024*1024)
+
+
+def compare_page_modes(size_mb, chunk_mb=256):
+    """对比普通页与大页：分配耗时和大页支撑量"""
+    results = {}
+    for mode, hugepages in (('4k', False), ('thp', True)):
+        allocator = MemoryAllocator(hugepages=hugepages)
+        huge_before = get_anon_huge_bytes()
+
+        remaining = size_mb
+        while remaining > 0:
+            allocator.allocate_mb(min(chunk_mb, remaining))
+            remaining -= chunk_mb
+
+        results[mode] = {
+            'alloc_seconds': allocator.alloc_seconds,
+            'held_mb': allocator.get_total_mb(),
+            'anon_huge_mb': (get_anon_huge_bytes() - huge_before) / (1024*1024)
+        }
+        allocator.release_all()
+
+    return results
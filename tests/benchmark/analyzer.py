@@ -273,4 +273,31 @@ class SystemAnalyzer:
 
             params['pattern'] = 'combined'  # 默认组合模式
 
+        elif scenario_type == 'emergency_floor':
+            watchdog = (self.holder_status.read_status() or {}).get('watchdog')
+            if not watchdog:
+                params['feasible'] = False
+                params['reason'] = "Holder未启用看门狗"
+                return params
+
+            floor_mb = watchdog['floor_mb']
+            to_floor = analysis['system_can_allocate'] - floor_mb
+
+            if to_floor <= 0:
+                params['feasible'] = False
+                params['reason'] = f"可用内存已低于下限{floor_mb:.0f}MB"
+                return params
+
+            # 越线后holder要能释放出一个下限的余量
+            if analysis['holder_can_release'] < floor_mb:
+                params['feasible'] = False
+                params['reason'] = f"holder仅有{analysis['holder_can_release']:.0f}MB，不足以恢复"
+                return params
+
+            params['floor_mb'] = floor_mb
+            params['step_mb'] = 64
+            params['test_size_mb'] = to_floor + floor_mb * 0.5
+            params['description'] = f"压过可用内存下限({floor_mb:.0f}MB)"
+            params['expect_holder_delta_mb'] = -params['test_size_mb']
+
         return params
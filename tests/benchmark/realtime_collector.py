@@ -6,14 +6,18 @@ import threading
 from collections import deque
 from pathlib import Path
 
+from nerdy_holder.status import StatusReader, STATUS_BLOCK
+
 
 class RealtimeCollector:
     """实时数据收集器 - 在测试期间持续收集holder状态"""
 
-    def __init__(self, status_file='nerdy_status.json', sample_interval=1.0):
+    def __init__(self, status_file='nerdy_status.json', sample_interval=0.02,
+                 block_path=STATUS_BLOCK):
         self.status_file = status_file
-        self.sample_interval = sample_interval
-        self.snapshots = deque(maxlen=1000)  # 最多保存1000个快照
+        self.block = StatusReader(block_path)
+        self.sample_interval = sample_interval  # 状态块读取只需微秒，默认50Hz
+        self.snapshots = deque(maxlen=30000)  # 50Hz下约10分钟
         self.collecting = False
         self.collector_thread = None
         self.start_time = None
@@ -49,7 +53,11 @@ class RealtimeCollector:
             time.sleep(self.sample_interval)
 
     def _read_status(self):
-        """读取holder状态文件"""
+        """读取holder状态：优先状态块，没有时退回JSON文件"""
+        status = self.block.read()
+        if status is not None:
+            return status
+
         try:
             if not Path(self.status_file).exists():
                 return None
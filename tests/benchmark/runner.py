@@ -23,6 +23,7 @@ class BenchmarkRunner:
             SustainedScenario(),
             BidirectionalScenario(),
             NonlinearScenario(),
+            EmergencyScenario(),
         ]
         self.results = []
         self.holder_status = HolderStatusReader()
@@ -125,6 +126,10 @@ class BenchmarkRunner:
         else:
             print(f"Holder变化: {actual:+.0f}MB")
 
+        if 'breach_to_freed_ms' in metrics:
+            print(f"越线到恢复: {metrics['breach_to_freed_ms']:.1f}ms "
+                  f"(Holder内部 {metrics['holder_breach_to_freed_ms']:.1f}ms)")
+
         score = self.calculate_score(metrics)
         grade = self.get_grade(score)
         print(f"\n评分: {score:.1f}/100 ({grade})")
@@ -10,7 +10,8 @@ from .scenarios import (
     ShockScenario,
     SustainedScenario,
     BidirectionalScenario,
-    NonlinearScenario
+    NonlinearScenario,
+    EmergencyScenario
 )
 
 __all__ = [
@@ -23,5 +24,6 @@ __all__ = [
     'ShockScenario',
     'SustainedScenario',
     'BidirectionalScenario',
-    'NonlinearScenario'
+    'NonlinearScenario',
+    'EmergencyScenario'
 ]
@@ -7,6 +7,9 @@ from ..utils import HolderStatusReader, SmartMonitor
 from ..analyzer import SystemAnalyzer
 from ..allocator import MemoryAllocator
 
+SAMPLE_INTERVAL = 0.02   # 状态块读取只需微秒，50Hz采样
+PRINT_INTERVAL = 0.5
+
 
 class BaseScenario:
     """自适应场景基类"""
@@ -65,6 +68,7 @@ class BaseScenario:
 
         start_time = time.time()
         duration = self.base_duration
+        last_print = 0
 
         while time.time() - start_time < duration:
             sample = self.monitor.record()
@@ -72,14 +76,16 @@ class BaseScenario:
             elapsed = time.time() - start_time
             progress = elapsed / duration * 100
 
-            print(f"\r进度: {progress:5.1f}% | "
-                  f"系统: {sample['system_mem_percent']:5.1f}% | "
-                  f"Holder: {sample['holder_holding']:6.0f}MB "
-                  f"({sample['holder_delta']:+6.0f}MB) | "
-                  f"误差: {sample['error']:4.1f}%",
-                  end='', flush=True)
+            if elapsed - last_print >= PRINT_INTERVAL:
+                print(f"\r进度: {progress:5.1f}% | "
+                      f"系统: {sample['system_mem_percent']:5.1f}% | "
+                      f"Holder: {sample['holder_holding']:6.0f}MB "
+                      f"({sample['holder_delta']:+6.0f}MB) | "
+                      f"误差: {sample['error']:4.1f}%",
+                      end='', flush=True)
+                last_print = elapsed
 
-            time.sleep(0.5)
+            time.sleep(SAMPLE_INTERVAL)
 
         print()
 
@@ -3,8 +3,12 @@
 import time
 import math
 import random
+
+from nerdy_holder.sensors import MeminfoSensor
 from .base import BaseScenario
 
+MB = 1024 * 1024
+
 
 class StarvationScenario(BaseScenario):
     """内存饥饿测试"""
@@ -394,3 +398,58 @@ class NonlinearScenario(BaseScenario):
             time.sleep(phase_time / 4)
 
         print("\n[完成] 组合模式测试结束")
+
+
+class EmergencyScenario(BaseScenario):
+    """紧急释放测试 - 快速压到看门狗下限以下，测量越线到恢复的耗时"""
+
+    def __init__(self):
+        super().__init__(
+            "紧急释放测试",
+            "emergency_floor",
+            20
+        )
+        self.breach = None
+
+    def run_test_logic(self, params):
+        time.sleep(3)
+
+        floor_mb = params['floor_mb']
+        sensor = MeminfoSensor()
+        print(f"\n[紧急] 快速申请直到可用内存低于 {floor_mb:.0f}MB...")
+
+        allocated = 0
+        breached = False
+        while allocated < params['test_size_mb']:
+            got = self.allocator.allocate_mb(params['step_mb'])
+            if not got:
+                break
+            allocated += got
+            if sensor.sample().available / MB < floor_mb:
+                breached = True
+                break
+
+        if not breached:
+            print(f"[紧急] 申请 {allocated:.0f}MB 仍未越线（Holder已提前释放）")
+            sensor.close()
+            return
+
+        # 1ms轮询直到可用内存回到下限之上
+        start = time.perf_counter()
+        while sensor.sample().available / MB < floor_mb and time.perf_counter() - start < 5:
+            time.sleep(0.001)
+        elapsed = (time.perf_counter() - start) * 1000
+        sensor.close()
+
+        self.breach = {'breach_to_freed_ms': elapsed, 'breach_allocated_mb': allocated}
+        print(f"[紧急] 越线后 {elapsed:.1f}ms 恢复（已申请{allocated:.0f}MB）")
+        time.sleep(8)
+
+    def run(self):
+        self.breach = None
+        metrics = super().run()
+        if metrics is not None and self.breach:
+            metrics.update(self.breach)
+            watchdog = (self.holder_status.read_status() or {}).get('watchdog', {})
+            metrics['holder_breach_to_freed_ms'] = watchdog.get('breach_to_freed_ms', {}).get('last', 0)
+        return metrics
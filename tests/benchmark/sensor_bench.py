@@ -0,0 +1,35 @@
+"""传感器微基准 - MeminfoSensor vs psutil.virtual_memory()"""
+
+import time
+import psutil
+
+from nerdy_holder.sensors import MeminfoSensor
+
+
+def benchmark_sensor(iterations=20000):
+    """每次采样耗时(微秒)"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        psutil.virtual_memory().percent
+    psutil_us = (time.perf_counter() - start) / iterations * 1e6
+
+    sensor = MeminfoSensor()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        sensor.sample().percent
+    sensor_us = (time.perf_counter() - start) / iterations * 1e6
+    sensor.close()
+
+    return {
+        'iterations': iterations,
+        'psutil_us': psutil_us,
+        'sensor_us': sensor_us,
+        'speedup': psutil_us / max(sensor_us, 1e-9)
+    }
+
+
+if __name__ == '__main__':
+    result = benchmark_sensor()
+    print(f"psutil.virtual_memory(): {result['psutil_us']:.1f}us")
+    print(f"MeminfoSensor.sample():  {result['sensor_us']:.1f}us")
+    print(f"加速: {result['speedup']:.1f}x")
@@ -6,16 +6,27 @@ import psutil
 import statistics
 from pathlib import Path
 
+from nerdy_holder.status import StatusReader, STATUS_BLOCK
+
 
 class HolderStatusReader:
-    """读取holder状态"""
+    """读取holder状态 - 优先共享内存状态块，没有时退回JSON文件"""
 
-    def __init__(self, status_file='nerdy_status.json'):
+    def __init__(self, status_file='nerdy_status.json', block_path=STATUS_BLOCK):
         self.status_file = status_file
+        self.block = StatusReader(block_path)
         self.last_status = None
         self.last_read_time = 0
 
     def read_status(self):
+        """读取状态（状态块为一致快照，可高频读取）"""
+        status = self.block.read()
+        if status is not None:
+            self.last_status = status
+            return status
+        return self._read_json()
+
+    def _read_json(self):
         """读取状态文件"""
         try:
             now = time.time()
@@ -70,14 +81,17 @@ class SmartMonitor:
 
     def record(self):
         """记录样本"""
+        mem = psutil.virtual_memory()
+        status = self.holder_status.read_status() or {}
+        holding = status.get('holding_mb', 0)
         sample = {
             'timestamp': time.time(),
-            'system_mem_percent': psutil.virtual_memory().percent,
-            'system_mem_mb': psutil.virtual_memory().used / (1024*1024),
-            'holder_target': self.holder_status.get_target(),
-            'holder_holding': self.holder_status.get_holding_mb(),
-            'holder_chunks': self.holder_status.get_chunks(),
-            'holder_delta': self.holder_status.get_holding_mb() - self.holder_start_holding
+            'system_mem_percent': mem.percent,
+            'system_mem_mb': mem.used / (1024*1024),
+            'holder_target': status.get('current_target', 0),
+            'holder_holding': holding,
+            'holder_chunks': status.get('chunks_count', 0),
+            'holder_delta': holding - self.holder_start_holding
         }
 
         sample['error'] = abs(sample['system_mem_percent'] - sample['holder_target'])
@@ -0,0 +1,151 @@
+"""测试控制接口"""
+
+import os
+import time
+import socket
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from nerdy_holder.core import NerdyHolderPro
+from nerdy_holder.control import ControlServer, ControlClient
+
+
+class TestControlServer(unittest.TestCase):
+    """测试控制请求和事件推送"""
+
+    def setUp(self):
+        """初始化"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'control.sock')
+        self.holder = NerdyHolderPro(enable_benchmark=True, fixed_target=30, waker='',
+                                     control_socket=self.path)
+        self.holder.log = lambda *args, **kwargs: None
+        self.client = ControlClient(self.path, timeout=5)
+
+    def tearDown(self):
+        """清理"""
+        self.client.close()
+        self.holder.control.close()
+        self.tmp.cleanup()
+
+    def test_socket_owner_only(self):
+        """测试socket仅属主可连接"""
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+
+    def test_socket_created_private(self):
+        """测试bind时即为0600（不依赖事后chmod），且恢复umask"""
+        path = os.path.join(self.tmp.name, 'private.sock')
+        umask = os.umask(0o022)
+        try:
+            with patch('nerdy_holder.control.server.os.chmod'):
+                server = ControlServer(self.holder, path)
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+            self.assertEqual(os.umask(umask), 0o022)
+        finally:
+            os.umask(umask)
+        server.close()
+
+    def test_status(self):
+        """测试查询状态"""
+        reply = self.client.request('status')
+        self.assertTrue(reply['ok'])
+        self.assertEqual(reply['status']['current_target'], 30)
+
+    def test_set_target(self):
+        """测试切到固定目标"""
+        reply = self.client.request('set_target', value=45)
+        self.assertTrue(reply['ok'])
+        self.assertEqual(self.holder.current_target, 45)
+        self.assertTrue(self.holder.test_mode)
+
+        reply = self.client.request('set_target', value=150)
+        self.assertFalse(reply['ok'])
+        self.assertEqual(self.holder.current_target, 45)
+
+    def test_set_range(self):
+        """测试切到动态范围"""
+        reply = self.client.request('set_range', low=60, high=70)
+        self.assertTrue(reply['ok'])
+        self.assertFalse(self.holder.test_mode)
+        self.assertEqual(self.holder.current_target, 65)
+        self.assertEqual(reply['min_target'], 60)
+
+    def test_set_tolerance(self):
+        """测试设置容差"""
+        self.assertTrue(self.client.request('set_tolerance', value=0.8)['ok'])
+        self.assertEqual(self.holder.optimizer.params['tolerance'], 0.8)
+        self.assertFalse(self.client.request('set_tolerance', value=0)['ok'])
+
+    def test_release_and_hold(self):
+        """测试强制释放和分配"""
+        with patch.object(self.holder, 'allocate_memory', return_value=100) as allocate, \
+             patch.object(self.holder, 'release_memory', return_value=50) as release, \
+             patch.object(self.holder, 'get_holding_mb', return_value=100):
+            reply = self.client.request('hold', mb=100)
+            self.assertEqual(reply['allocated_mb'], 100)
+            allocate.assert_called_once_with(100)
+
+            reply = self.client.request('release', mb=50)
+            self.assertEqual(reply['released_mb'], 50)
+            release.assert_called_once_with(50)
+
+    def test_unknown_command(self):
+        """测试未知命令和缺少参数"""
+        reply = self.client.request('explode')
+        self.assertFalse(reply['ok'])
+        self.assertIn('explode', reply['error'])
+        self.assertFalse(self.client.request('set_target')['ok'])
+
+    def test_subscribe(self):
+        """测试订阅收到事件"""
+        events = []
+
+        def watch():
+            with ControlClient(self.path, timeout=5) as client:
+                events.append(next(client.subscribe()))
+
+        thread = threading.Thread(target=watch)
+        thread.start()
+        # 服务端登记订阅队列后再发事件
+        deadline = time.monotonic() + 5
+        while not self.holder.control.subscribers and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.holder.emit('adjusted', action='release', size_mb=10)
+        thread.join(5)
+
+        self.assertEqual(events[0]['event'], 'adjusted')
+        self.assertEqual(events[0]['size_mb'], 10)
+
+    def test_live_socket_rejected(self):
+        """测试路径上已有进程监听时拒绝启动"""
+        with self.assertRaises(RuntimeError):
+            ControlServer(self.holder, self.path)
+        self.assertTrue(self.client.request('status')['ok'])
+
+    def test_stale_socket_replaced(self):
+        """测试遗留的socket文件被替换"""
+        path = os.path.join(self.tmp.name, 'stale.sock')
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(path)
+
+        server = ControlServer(self.holder, path)
+        with ControlClient(path, timeout=5) as client:
+            self.assertTrue(client.request('status')['ok'])
+        server.close()
+        self.assertFalse(os.path.exists(path))
+
+    def test_close_keeps_successor_socket(self):
+        """测试关闭时不删除继任进程重新绑定的socket"""
+        old = self.holder.control
+        os.remove(self.path)
+        successor = ControlServer(self.holder, self.path)
+        old.close()
+
+        with ControlClient(self.path, timeout=5) as client:
+            self.assertTrue(client.request('status')['ok'])
+        self.holder.control = successor
+
+
+if __name__ == '__main__':
+    unittest.main()
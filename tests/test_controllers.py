@@ -2,7 +2,7 @@
 
 import unittest
 import time
-from nerdy_holder.controllers import EnhancedPIDController, UnifiedResponseCalculator
+from nerdy_holder.controllers import EnhancedPIDController, UnifiedResponseCalculator, TickScheduler
 
 
 class TestEnhancedPIDController(unittest.TestCase):
@@ -105,6 +105,77 @@ class TestUnifiedResponseCalculator(unittest.TestCase):
         # 第二次可能被阻止（因为间隔太短）
         # 注意：由于算法的复杂性，这个可能通过或失败都正常
 
+    def test_pressure_release(self):
+        """测试回收压力下紧急释放"""
+        decision = self.calculator.should_adjust(2.0, 200, 1.0, pressure=0.9)
+
+        self.assertTrue(decision['should_adjust'])
+        self.assertIn('压力释放', decision['reason'])
+
+    def test_pressure_blocks_allocate(self):
+        """测试回收压力下暂停分配"""
+        self.calculator.last_adjustment_time = 0
+        decision = self.calculator.should_adjust(-12.0, 2000, 1.0, pressure=0.6)
+
+        self.assertFalse(decision['should_adjust'])
+        self.assertIn('压力保护', decision['reason'])
+
+    def test_pressure_response_size(self):
+        """测试压力放大释放量、缩小分配量"""
+        calm_release = self.calculator.calculate_response_size(2.0, 0, 0, 1.0)
+        hot_release = self.calculator.calculate_response_size(2.0, 0, 0, 1.0, pressure=0.5)
+        calm_alloc = self.calculator.calculate_response_size(-2.0, 0, 0, 1.0)
+        hot_alloc = self.calculator.calculate_response_size(-2.0, 0, 0, 1.0, pressure=0.5)
+
+        self.assertGreater(hot_release, calm_release)
+        self.assertLess(hot_alloc, calm_alloc)
+
+
+class TestTickScheduler(unittest.TestCase):
+    """测试节拍调度"""
+
+    def setUp(self):
+        """初始化"""
+        self.scheduler = TickScheduler()
+
+    def test_fast_when_far(self):
+        """测试远离目标时快速唤醒"""
+        interval = self.scheduler.next_interval(error=20, tolerance=0.5)
+        self.assertAlmostEqual(interval, 0.1)
+
+    def test_slow_when_settled(self):
+        """测试稳定后间隔拉长"""
+        fresh = self.scheduler.next_interval(error=0.1, tolerance=0.5, since_adjust=0)
+        settled = self.scheduler.next_interval(error=0.1, tolerance=0.5, since_adjust=3600)
+
+        self.assertLess(fresh, 3)
+        self.assertEqual(settled, 30)
+
+    def test_volatility_shortens(self):
+        """测试波动和动量缩短间隔"""
+        calm = self.scheduler.next_interval(error=0, tolerance=0.5, since_adjust=600)
+        choppy = self.scheduler.next_interval(error=0, tolerance=0.5, volatility=2,
+                                              momentum=3, since_adjust=600)
+        self.assertLess(choppy, calm)
+
+    def test_hold_off(self):
+        """测试间隔保护期内不提前醒来"""
+        interval = self.scheduler.next_interval(error=2, tolerance=0.5, hold_off=2.5)
+        self.assertEqual(interval, 2.5)
+
+    def test_idle(self):
+        """测试连续容差内轮次进入空闲"""
+        for _ in range(3):
+            self.assertFalse(self.scheduler.idle)
+            self.scheduler.observe(True)
+        self.assertTrue(self.scheduler.idle)
+
+        self.scheduler.observe(True)
+        self.assertEqual(self.scheduler.idle_ticks, 1)
+
+        self.scheduler.observe(False)
+        self.assertFalse(self.scheduler.idle)
+
 
 if __name__ == '__main__':
     unittest.main()
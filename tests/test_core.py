@@ -1,8 +1,14 @@
 """测试核心程序"""
 
+import os
+import time
+import tempfile
+import threading
 import unittest
 from unittest.mock import Mock, patch
 from nerdy_holder.core import NerdyHolderPro
+from nerdy_holder.memory import MemoryChunk
+from nerdy_holder.sensors import PipeWaker
 
 
 class TestNerdyHolderPro(unittest.TestCase):
@@ -86,6 +92,271 @@ class TestNerdyHolderPro(unittest.TestCase):
                 "容差范围内不应该调整"
             )
 
+    def test_release_records_latency(self):
+        """测试释放记录耗时"""
+        holder = NerdyHolderPro(enable_benchmark=False, fixed_target=30, backend='mmap')
+        holder.allocate_memory(100)
+
+        released = holder.release_memory(100)
+
+        self.assertGreater(released, 0)
+        latency = holder.get_release_latency()
+        self.assertIsNotNone(latency)
+        self.assertGreaterEqual(latency['max'], latency['last'])
+
+    def test_parallel_allocate(self):
+        """测试大块分配走并行预提交"""
+        holder = NerdyHolderPro(enable_benchmark=False, fixed_target=30, prefault_workers=2)
+        holder.parallel_threshold_mb = 100
+
+        allocated = holder.allocate_memory(150)
+
+        self.assertGreaterEqual(allocated, 150)
+        self.assertEqual(holder.get_holding_mb(), holder.get_nominal_mb())
+        holder.prefaulter.shutdown()
+
+    def test_parallel_allocate_failure(self):
+        """测试并行预提交失败时释放未入账的块并重新抛出"""
+        holder = NerdyHolderPro(enable_benchmark=False, fixed_target=30, backend='mmap', prefault_workers=2)
+        holder.parallel_threshold_mb = 100
+
+        with patch('nerdy_holder.memory.prefault.fill_pages', side_effect=OSError("injected")), \
+                patch.object(holder.backend, 'release', wraps=holder.backend.release) as release:
+            with self.assertRaises(OSError):
+                holder.allocate_memory(150)
+        holder.prefaulter.shutdown()
+
+        self.assertEqual(release.call_count, 2)
+        self.assertEqual(holder.get_nominal_mb(), 0)
+
+    def test_serial_allocate_throttled(self):
+        """测试串行分配同样受 --prefault-rate 限速"""
+        holder = NerdyHolderPro(enable_benchmark=False, fixed_target=30, backend='mmap', prefault_rate=100)
+
+        with patch.object(holder.prefaulter, 'throttle') as throttle:
+            holder.allocate_memory(150)
+        holder.prefaulter.shutdown()
+
+        self.assertEqual([c.args[0] for c in throttle.call_args_list], [100 * 1024 * 1024, 50 * 1024 * 1024])
+        holder.ledger.clear()
+
+    def test_release_exact(self):
+        """测试精确释放（尾部归还）"""
+        holder = NerdyHolderPro(enable_benchmark=False, fixed_target=30, backend='mmap')
+        holder.allocate_memory(200)
+        holding = holder.get_holding_mb()
+
+        released = holder.release_memory(130)
+
+        self.assertAlmostEqual(released, 130, delta=0.01)
+        self.assertAlmostEqual(holder.get_holding_mb(), holding - released, delta=0.01)
+        holder.ledger.clear()
+
+    def test_adopt_segments(self):
+        """测试接管持久化段"""
+        from nerdy_holder.memory import ShmBackend
+
+        with tempfile.TemporaryDirectory() as directory:
+            backend = ShmBackend(directory)
+            chunk = MemoryChunk(4, backend)
+            fd, _ = backend.segments.pop(id(chunk.data))
+            chunk.data.close()
+            os.close(fd)
+            os.close(backend.lock_fd)
+
+            holder = NerdyHolderPro(enable_benchmark=False, fixed_target=30,
+                                    backend=ShmBackend(directory))
+            adopted = holder.adopt_segments()
+
+            self.assertEqual(adopted, 1)
+            self.assertEqual(holder.get_holding_mb(), 4)
+            holder.ledger.clear()
+            os.close(holder.backend.lock_fd)
+
+    def test_native_unit_target(self):
+        """测试以指标原生单位给出的目标"""
+        holder = NerdyHolderPro(enable_benchmark=False, fixed_target=1024, sensor='available')
+        expected = (holder.total_bytes - 1024 * 1024 * 1024) / holder.total_bytes * 100
+
+        self.assertAlmostEqual(holder.current_target, expected)
+        self.assertAlmostEqual(holder.sensor.from_percent(holder.current_target), 1024)
+
+    def test_allocation_failure_logged(self):
+        """测试分配失败（如提交余量耗尽）被记录"""
+        with patch('nerdy_holder.core.MemoryChunk', side_effect=MemoryError):
+            with patch.object(self.holder, 'log') as mock_log:
+                allocated = self.holder.allocate_memory(100)
+
+        self.assertEqual(allocated, 0)
+        self.assertIn('分配失败', mock_log.call_args[0][0])
+
+    def test_release_under_pressure(self):
+        """测试回收压力下即使在容差内也释放"""
+        self.holder.pressure.score = 0.9
+        with patch.object(self.holder.pressure, 'sample', return_value=self.holder.pressure):
+            with patch.object(self.holder, 'get_system_memory', return_value=30.5):
+                with patch.object(self.holder, 'get_holding_mb', return_value=1000):
+                    with patch.object(self.holder, 'release_memory', return_value=100) as mock_release:
+                        self.holder.make_decision()
+
+        mock_release.assert_called_once()
+
+    def test_idle_ticks_skip_work(self):
+        """测试空闲轮跳过追踪器记录和参数优化"""
+        with patch.object(self.holder, 'get_system_memory', return_value=30.0), \
+                patch.object(self.holder, 'optimize_parameters') as mock_optimize:
+            for _ in range(5):
+                interval = self.holder.tick()
+
+        self.assertEqual(mock_optimize.call_count, 3)
+        self.assertEqual(len(self.holder.performance_tracker.metrics_window), 3)
+        self.assertGreater(interval, 1)
+
+    def test_pressure_wakeup(self):
+        """测试压力事件提前唤醒主循环"""
+        waker = PipeWaker()
+        holder = NerdyHolderPro(enable_benchmark=False, fixed_target=30, waker=waker)
+        holder.scheduler.min_interval = 30
+        decisions = []
+
+        def decide():
+            decisions.append(time.monotonic())
+            if len(decisions) == 2:
+                holder.running = False
+                waker.fire()
+
+        with patch.object(holder, 'initialize'), patch.object(holder, 'log'), \
+                patch.object(holder, 'make_decision', side_effect=decide):
+            threading.Timer(0.05, waker.fire).start()
+            holder.run()
+        waker.close()
+
+        self.assertLess(decisions[1] - decisions[0], 5)
+        self.assertEqual(holder.stats['pressure_wakeups'], 2)
+
+    def test_export_between_ticks(self):
+        """测试节拍很长时状态按低频周期刷新，不每100ms唤醒"""
+        from nerdy_holder.simulation import VirtualClock
+        clock = VirtualClock()
+        waker = Mock()
+        waker.wait.side_effect = lambda timeout: clock.sleep(timeout) or False
+        holder = NerdyHolderPro(enable_benchmark=True, fixed_target=30, waker=waker, clock=clock,
+                                config_file=None)
+        holder.last_export = clock.time()
+
+        with patch.object(holder, 'export_status') as mock_export, \
+                patch.object(holder.sensor, 'sample') as mock_sample:
+            self.assertFalse(holder.wait(30))
+        self.assertLess(clock.time() - holder.last_export, holder.idle_export_interval)
+        self.assertIn(mock_export.call_count, (29, 30))
+        self.assertEqual(mock_sample.call_count, mock_export.call_count)
+
+        # 节拍不长于刷新周期时直接睡到下一轮
+        with patch.object(holder, 'export_status') as mock_export:
+            holder.wait(0.5)
+        mock_export.assert_not_called()
+        self.assertEqual(waker.wait.call_args.args, (0.5,))
+
+        holder.enable_benchmark = False
+        with patch.object(holder, 'export_status') as mock_export:
+            holder.wait(30)
+        mock_export.assert_not_called()
+        self.assertEqual(waker.wait.call_args.args, (30,))
+
+    def test_anon_huge_refresh(self):
+        """测试大页支撑量只在大页后端读取，且低频刷新"""
+        with patch('nerdy_holder.core.get_anon_huge_bytes', return_value=64 * 1024 * 1024) as mock_read:
+            holder = NerdyHolderPro(enable_benchmark=False, fixed_target=30, config_file=None)
+            holder.build_status()
+            mock_read.assert_not_called()
+
+            holder = NerdyHolderPro(enable_benchmark=False, fixed_target=30, config_file=None,
+                                    backend='hugepage')
+            for _ in range(3):
+                status = holder.build_status()
+            self.assertEqual(mock_read.call_count, 1)
+            self.assertEqual(status['hugepage']['anon_huge_mb'], 64)
+
+            holder.anon_huge_refreshed -= holder.anon_huge_interval
+            holder.build_status()
+            self.assertEqual(mock_read.call_count, 2)
+
+    def test_background_dispatch(self):
+        """测试启用分片时分配交给后台执行器，释放先抢占分配再就地执行"""
+        holder = NerdyHolderPro(enable_benchmark=False, fixed_target=30, slice_budget=0.1)
+        actuator = holder.actuator
+
+        with patch.object(actuator, 'submit') as mock_submit, \
+                patch.object(holder, 'allocate_memory') as mock_allocate, \
+                patch.object(holder, 'log'):
+            holder.dispatch({'action': 'allocate', 'size_mb': 500, 'error': -5})
+        mock_submit.assert_called_once()
+        mock_allocate.assert_not_called()
+
+        plan = {'action': 'release', 'size_mb': 100, 'error': 5, 'current_mem': 35,
+                'pressure': 0, 'decided_at': time.monotonic()}
+        actuator.active = True
+        with patch.object(actuator, 'cancel') as mock_cancel, \
+                patch.object(holder, 'get_holding_mb', return_value=1000), \
+                patch.object(holder, 'release_memory', return_value=100) as mock_release, \
+                patch.object(holder, 'log'):
+            holder.dispatch(plan)
+            # 后台分配进行中且未超出目标时不决策
+            with patch.object(holder.sensor, 'sample', return_value=Mock(percent=29.0)):
+                self.assertTrue(holder.allocating_in_background())
+        actuator.active = False
+
+        mock_cancel.assert_called_once()
+        mock_release.assert_called_once()
+        self.assertEqual(len(actuator.release_latencies), 1)
+
+    def test_dropped_plan_blocked(self):
+        """测试执行器未接受的分配计划记为阻止，不占调整间隔"""
+        holder = NerdyHolderPro(enable_benchmark=False, fixed_target=30, slice_budget=0.1)
+        holder.response_calculator.last_adjustment_time -= 1000
+        before = holder.response_calculator.get_state()
+
+        with patch.object(holder.actuator, 'submit', return_value=False), \
+                patch.object(holder.sensor, 'sample', return_value=Mock(percent=20.0)), \
+                patch.object(holder, 'log'):
+            holder.make_decision()
+
+        self.assertEqual(holder.stats['adjustments'], 0)
+        self.assertEqual(holder.stats['blocked'], 1)
+        self.assertTrue(holder.performance_tracker.metrics_window[-1]['was_blocked'])
+        self.assertEqual(len(holder.performance_tracker.adjustment_times), 0)
+        self.assertEqual(holder.response_calculator.get_state(), before)
+
+    def test_exploration_applied(self):
+        """测试探索开始和回滚都同步到PID/EMA/响应计算器"""
+        holder = NerdyHolderPro(enable_benchmark=False, fixed_target=30, optimizer='bayesian',
+                                max_error=50, config_file=None)
+        optimizer = holder.optimizer
+        optimizer.exploration_rate = 1.0
+        stats = {'avg_error': 1.0, 'max_error': 2.0, 'error_volatility': 0.5,
+                 'block_rate': 0.2, 'interval_volatility': 1.0}
+        original = optimizer.exploration_backup()
+
+        with patch.object(holder.performance_tracker, 'get_stats', return_value=stats), \
+                patch.object(holder, 'log'):
+            optimizer.params['best_score'] = 100
+            holder.last_optimization = 0
+            holder.optimize_parameters()
+            self.assertIsNotNone(optimizer.exploration_start_time)
+            self.assertEqual(holder.pid_controller.Kp, optimizer.params['pid_kp'])
+            self.assertEqual(holder.ema_predictor.fast_alpha, optimizer.params['ema_fast'])
+            self.assertNotEqual(optimizer.exploration_backup(), original)
+
+            # 期满且得分变差 → 回滚完整参数向量
+            optimizer.exploration_start_time -= 120
+            optimizer.last_score = 100
+            holder.last_optimization = 0
+            holder.optimize_parameters()
+
+        self.assertEqual(optimizer.exploration_backup(), original)
+        self.assertEqual(holder.pid_controller.Kp, original['pid_kp'])
+        self.assertEqual(holder.response_calculator.response_base, original['response_base'])
+
 
 if __name__ == '__main__':
     unittest.main()
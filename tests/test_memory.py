@@ -1,7 +1,41 @@
 """测试内存模块"""
 
+import os
+import time
+import tempfile
 import unittest
-from nerdy_holder.memory import MemoryChunk
+from unittest.mock import Mock, patch
+from nerdy_holder.memory import (
+    MemoryChunk, MmapBackend, get_backend, touch_pages, get_rss_bytes, PAGE_SIZE,
+    ParallelPrefaulter, benchmark_prefault, ChunkLedger, HugepageBackend,
+    thp_status, get_anon_huge_bytes, ArenaBackend, IntervalMap,
+    ShmBackend, MemfdBackend, cleanup_segments, fill_pages, benchmark_fill,
+    BackgroundActuator
+)
+from nerdy_holder.memory.persistent import listen_fds
+from nerdy_holder.memory.commit import buffer_address
+from nerdy_holder.memory.fill import compress_ratio
+
+
+class FakeChunk:
+    """账本测试用块（不分配内存）"""
+
+    def __init__(self, size_mb):
+        self.size_mb = size_mb
+        self.committed_bytes = size_mb * 1024 * 1024
+        self.released = False
+
+    @property
+    def committed_mb(self):
+        return self.committed_bytes / (1024*1024)
+
+    def shrink(self, mb):
+        freed = min(int(mb * 1024 * 1024), self.committed_bytes)
+        self.committed_bytes -= freed
+        return freed
+
+    def release(self):
+        self.released = True
 
 
 class TestMemoryChunk(unittest.TestCase):
@@ -36,5 +70,586 @@ class TestMemoryChunk(unittest.TestCase):
             self.assertEqual(len(chunk.data), size * 1024 * 1024)
 
 
+class TestCommitEngine(unittest.TestCase):
+    """测试页级提交"""
+
+    def test_chunk_committed(self):
+        """测试内存块按页提交"""
+        chunk = MemoryChunk(8)
+
+        self.assertEqual(chunk.committed_bytes, 8 * 1024 * 1024)
+        self.assertEqual(chunk.committed_mb, 8)
+
+    def test_every_page_touched(self):
+        """测试每一页都被写入"""
+        buf = bytearray(PAGE_SIZE * 16)
+        touch_pages(buf, method='memset')
+
+        for page in range(16):
+            self.assertNotEqual(buf[page * PAGE_SIZE], 0)
+
+    def test_partial_range(self):
+        """测试部分区间按页对齐"""
+        buf = bytearray(PAGE_SIZE * 8)
+        committed = touch_pages(buf, PAGE_SIZE, PAGE_SIZE + 1)
+
+        self.assertEqual(committed, PAGE_SIZE * 2)
+
+    def test_rss_grows(self):
+        """测试RSS确实增长"""
+        before = get_rss_bytes()
+        chunk = MemoryChunk(32, 'mmap')
+        delta = get_rss_bytes() - before
+
+        self.assertGreater(delta, chunk.committed_bytes * 0.9)
+        chunk.release()
+
+
+class TestParallelPrefaulter(unittest.TestCase):
+    """测试并行预提交"""
+
+    def test_commit_chunks(self):
+        """测试多线程提交多个块"""
+        chunks = [MemoryChunk(8, 'mmap', commit=False) for _ in range(3)]
+        self.assertEqual(chunks[0].committed_bytes, 0)
+
+        prefaulter = ParallelPrefaulter(workers=4, segment_mb=2)
+        total = prefaulter.commit(chunks)
+        prefaulter.shutdown()
+
+        self.assertEqual(total, 24 * 1024 * 1024)
+        for chunk in chunks:
+            self.assertEqual(chunk.committed_mb, 8)
+
+    def test_rate_ceiling(self):
+        """测试限速"""
+        chunk = MemoryChunk(8, commit=False)
+        prefaulter = ParallelPrefaulter(workers=2, max_mb_per_sec=40, segment_mb=2)
+
+        start = time.monotonic()
+        prefaulter.commit([chunk])
+        elapsed = time.monotonic() - start
+        prefaulter.shutdown()
+
+        # 8MB @ 40MB/s，首段不等待
+        self.assertGreaterEqual(elapsed, 0.14)
+
+    def test_failed_segment(self):
+        """测试分段失败时等其余分段结束再抛出"""
+        chunk = MemoryChunk(8, 'mmap', commit=False)
+        prefaulter = ParallelPrefaulter(workers=2, segment_mb=2)
+        touched = []
+
+        def fill(buf, offset, length, policy, method):
+            if offset == 2 * 1024 * 1024:
+                raise OSError("injected")
+            time.sleep(0.05)
+            touched.append(offset)
+            return length
+
+        with patch('nerdy_holder.memory.prefault.fill_pages', side_effect=fill):
+            with self.assertRaises(OSError):
+                prefaulter.commit([chunk])
+            finished = list(touched)
+        prefaulter.shutdown()
+
+        # 抛出后不再有分段在写这个块
+        self.assertEqual(touched, finished)
+        self.assertEqual(chunk.committed_bytes, 0)
+        chunk.release()
+
+    def test_benchmark(self):
+        """测试启动基准"""
+        results = benchmark_prefault(4, worker_counts=[1, 2], chunk_mb=2)
+
+        self.assertEqual([r['workers'] for r in results], [1, 2])
+        for r in results:
+            self.assertEqual(r['committed_mb'], 4)
+
+
+class TestFillPolicies(unittest.TestCase):
+    """测试填充策略"""
+
+    def _pages(self, buf):
+        return [bytes(buf[i:i + PAGE_SIZE]) for i in range(0, len(buf), PAGE_SIZE)]
+
+    def test_header_unique(self):
+        """测试每页序号唯一（防KSM合并）"""
+        buf = bytearray(64 * PAGE_SIZE)
+        committed = fill_pages(buf, policy='header')
+
+        self.assertEqual(committed, len(buf))
+        pages = self._pages(buf)
+        self.assertEqual(len(set(pages)), len(pages))
+
+    def test_random_incompressible(self):
+        """测试随机填充不可压缩且各页不同"""
+        buf = bytearray(2 * 1024 * 1024)
+        fill_pages(buf, policy='random')
+
+        self.assertGreater(compress_ratio(buf), 0.95)
+        pages = self._pages(buf)
+        self.assertEqual(len(set(pages)), len(pages))
+
+    def test_zero_compressible(self):
+        """测试zero策略只提交页"""
+        buf = bytearray(64 * PAGE_SIZE)
+        fill_pages(buf, policy='zero')
+        self.assertLess(compress_ratio(buf), 0.1)
+
+    def test_partial_range(self):
+        """测试区间填充不越界"""
+        buf = bytearray(8 * PAGE_SIZE)
+        fill_pages(buf, PAGE_SIZE, 2 * PAGE_SIZE, policy='random')
+
+        self.assertEqual(bytes(buf[:PAGE_SIZE]), bytes(PAGE_SIZE))
+        self.assertEqual(bytes(buf[3 * PAGE_SIZE:]), bytes(5 * PAGE_SIZE))
+
+    def test_unknown_policy(self):
+        """测试未知策略"""
+        with self.assertRaises(ValueError):
+            fill_pages(bytearray(PAGE_SIZE), policy='pattern')
+
+    def test_parallel_fill(self):
+        """测试并行预提交按块的策略填充"""
+        chunk = MemoryChunk(4, 'mmap', commit=False, fill='random')
+        prefaulter = ParallelPrefaulter(workers=2, segment_mb=1)
+        prefaulter.commit([chunk])
+        prefaulter.shutdown()
+
+        self.assertEqual(chunk.committed_mb, 4)
+        self.assertGreater(compress_ratio(chunk.data), 0.95)
+        chunk.release()
+
+    def test_benchmark(self):
+        """测试填充基准"""
+        results = benchmark_fill(2, backend='bytearray')
+
+        self.assertEqual([r['policy'] for r in results], ['zero', 'header', 'random'])
+        self.assertGreater(results[2]['compress_ratio'], results[0]['compress_ratio'])
+
+
+class TestChunkShrink(unittest.TestCase):
+    """测试尾部归还"""
+
+    def test_shrink_mmap(self):
+        """测试mmap块按页归还"""
+        chunk = MemoryChunk(8, 'mmap')
+        freed = chunk.shrink(3)
+
+        self.assertEqual(freed, 3 * 1024 * 1024)
+        self.assertEqual(chunk.committed_mb, 5)
+        self.assertEqual(freed % PAGE_SIZE, 0)
+
+    def test_shrink_bytearray(self):
+        """测试bytearray块按页归还"""
+        chunk = MemoryChunk(8)
+        freed = chunk.shrink(3)
+
+        self.assertGreater(freed, 3 * 1024 * 1024 - 2 * PAGE_SIZE)
+        self.assertEqual(freed % PAGE_SIZE, 0)
+
+    def test_shrink_rss(self):
+        """测试RSS确实下降"""
+        chunk = MemoryChunk(32, 'mmap')
+        before = get_rss_bytes()
+        chunk.shrink(16)
+
+        self.assertGreater(before - get_rss_bytes(), 15 * 1024 * 1024)
+
+
+class TestChunkLedger(unittest.TestCase):
+    """测试内存块账本"""
+
+    def setUp(self):
+        """初始化"""
+        self.ledger = ChunkLedger()
+        for size in [500, 300, 200, 100, 50]:
+            self.ledger.add(FakeChunk(size))
+
+    def test_totals(self):
+        """测试运行总量"""
+        self.assertEqual(len(self.ledger), 5)
+        self.assertEqual(self.ledger.holding_mb, 1150)
+        self.assertEqual(self.ledger.nominal_mb, 1150)
+
+    def test_remove(self):
+        """测试注销"""
+        chunk = next(c for c in self.ledger if c.size_mb == 200)
+        self.ledger.remove(chunk)
+
+        self.assertEqual(len(self.ledger), 4)
+        self.assertEqual(self.ledger.holding_mb, 950)
+        self.assertNotIn(200, self.ledger.size_classes)
+
+    def test_select_exact(self):
+        """测试可精确覆盖时无超出"""
+        picked = self.ledger.select_for_release(350)
+
+        self.assertEqual(sorted(c.size_mb for c in picked), [50, 300])
+
+    def test_select_least_overshoot(self):
+        """测试最少超出"""
+        picked = self.ledger.select_for_release(420)
+
+        self.assertEqual(sum(c.size_mb for c in picked), 450)
+
+    def test_select_more_than_held(self):
+        """测试目标超过持有量"""
+        picked = self.ledger.select_for_release(5000)
+
+        self.assertEqual(len(picked), 5)
+
+    def test_plan_release_partial(self):
+        """测试精确释放规划"""
+        whole, partial, partial_mb = self.ledger.plan_release(420)
+
+        self.assertEqual(sorted(c.size_mb for c in whole), [100, 300])
+        self.assertEqual(partial.size_mb, 50)
+        self.assertEqual(partial_mb, 20)
+
+    def test_plan_release_fragment(self):
+        """测试不足1MB的尾块也能整块释放"""
+        chunk = next(c for c in self.ledger if c.size_mb == 50)
+        self.ledger.shrink(chunk, 49.5)
+        whole, partial, _ = self.ledger.plan_release(5000)
+
+        self.assertEqual(len(whole), 5)
+        self.assertIsNone(partial)
+
+    def test_shrink(self):
+        """测试缩小后重新分级"""
+        chunk = next(c for c in self.ledger if c.size_mb == 300)
+        self.ledger.shrink(chunk, 120)
+
+        self.assertEqual(self.ledger.holding_mb, 1030)
+        self.assertEqual(len(self.ledger), 5)
+        self.assertIn(180, self.ledger.size_classes)
+        self.assertNotIn(300, self.ledger.size_classes)
+
+    def test_clear(self):
+        """测试清空"""
+        chunks = list(self.ledger)
+        self.ledger.clear()
+
+        self.assertEqual(len(self.ledger), 0)
+        self.assertEqual(self.ledger.holding_mb, 0)
+        self.assertTrue(all(c.released for c in chunks))
+
+
+class TestHugepage(unittest.TestCase):
+    """测试大页模式"""
+
+    def test_thp_status(self):
+        """测试读取内核THP策略"""
+        with tempfile.TemporaryDirectory() as root:
+            with open(os.path.join(root, 'enabled'), 'w') as f:
+                f.write('always [madvise] never\n')
+            with open(os.path.join(root, 'hpage_pmd_size'), 'w') as f:
+                f.write('2097152\n')
+
+            status = thp_status(root)
+
+        self.assertEqual(status['enabled'], 'madvise')
+        self.assertTrue(status['available'])
+        self.assertEqual(status['hugepage_size'], 2097152)
+
+    def test_thp_unsupported(self):
+        """测试无THP"""
+        with tempfile.TemporaryDirectory() as root:
+            status = thp_status(root)
+
+        self.assertFalse(status['available'])
+
+    def test_aligned_chunk(self):
+        """测试大页块按大页对齐"""
+        chunk = MemoryChunk(3, 'hugepage')
+        hp = chunk.backend.hugepage_size
+
+        self.assertIsInstance(chunk.backend, HugepageBackend)
+        self.assertEqual(buffer_address(chunk.data) % hp, 0)
+        self.assertEqual(len(chunk.data) % hp, 0)
+        self.assertGreaterEqual(get_anon_huge_bytes(), 0)
+
+        chunk.shrink(1)
+        chunk.release()
+        self.assertIsNone(chunk.data)
+
+
+class TestIntervalMap(unittest.TestCase):
+    """测试空闲区间表"""
+
+    def test_allocate_and_coalesce(self):
+        """测试分配与合并"""
+        intervals = IntervalMap(100)
+        a = intervals.allocate(30)
+        b = intervals.allocate(30)
+        c = intervals.allocate(30)
+
+        self.assertEqual((a, b, c), (0, 30, 60))
+        self.assertIsNone(intervals.allocate(20))
+
+        intervals.free(b, 30)
+        self.assertEqual(len(intervals), 2)
+        intervals.free(a, 30)
+        intervals.free(c, 30)
+
+        self.assertEqual(len(intervals), 1)
+        self.assertEqual(intervals.free_bytes, 100)
+
+    def test_first_fit_reuse(self):
+        """测试复用释放的区间"""
+        intervals = IntervalMap(100)
+        a = intervals.allocate(40)
+        intervals.allocate(40)
+        intervals.free(a, 40)
+
+        self.assertEqual(intervals.allocate(10), 0)
+
+
+class TestArenaBackend(unittest.TestCase):
+    """测试竞技场后端"""
+
+    def setUp(self):
+        """初始化"""
+        self.arena = ArenaBackend(64 * 1024 * 1024)
+
+    def tearDown(self):
+        """清理"""
+        self.arena.close()
+
+    def test_commit_release_cycle(self):
+        """测试区间提交与归还不产生新映射"""
+        chunks = [MemoryChunk(8, self.arena) for _ in range(4)]
+        self.assertEqual(self.arena.stats()['allocated_mb'], 32)
+
+        for chunk in chunks:
+            self.assertEqual(chunk.committed_mb, 8)
+            chunk.release()
+
+        stats = self.arena.stats()
+        self.assertEqual(stats['allocated_mb'], 0)
+        self.assertEqual(stats['free_intervals'], 1)
+
+    def test_shrink_and_recommit(self):
+        """测试尾部归还与原地重新提交"""
+        chunk = MemoryChunk(8, self.arena)
+        chunk.shrink(3)
+        self.assertEqual(chunk.committed_mb, 5)
+
+        chunk.decommit()
+        chunk.commit()
+        self.assertEqual(chunk.committed_mb, 8)
+        chunk.release()
+
+    def test_exhausted(self):
+        """测试空间不足"""
+        with self.assertRaises(MemoryError):
+            MemoryChunk(128, self.arena)
+
+
+class TestPersistentBackends(unittest.TestCase):
+    """测试持久化后端"""
+
+    def setUp(self):
+        """初始化"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+
+    def tearDown(self):
+        """清理"""
+        self.tmp.cleanup()
+
+    def _abandon(self, backend, chunks):
+        """模拟进程退出：不删除段"""
+        for chunk in chunks:
+            fd, _ = backend.segments.pop(id(chunk.data))
+            chunk.data.close()
+            os.close(fd)
+        os.close(backend.lock_fd)
+
+    def test_shm_adopt(self):
+        """测试重启后接管段"""
+        backend = ShmBackend(self.directory)
+        chunks = [MemoryChunk(4, backend), MemoryChunk(2, backend)]
+        chunks[0].shrink(1)
+        self._abandon(backend, chunks)
+
+        successor = ShmBackend(self.directory)
+        adopted = successor.adopt()
+
+        self.assertEqual(sorted(len(b) for b in adopted), [2 * 1024 * 1024, 4 * 1024 * 1024])
+        committed = sum(successor.committed_bytes(b) for b in adopted)
+        self.assertEqual(committed, 5 * 1024 * 1024)
+
+        adopted_chunk = MemoryChunk.adopt(adopted[0], successor, successor.committed_bytes(adopted[0]))
+        adopted_chunk.release()
+        self.assertEqual(len(os.listdir(self.directory)), 2)  # 剩一段 + 锁文件
+
+    def test_shm_single_owner(self):
+        """测试同一目录只允许一个holder"""
+        backend = ShmBackend(self.directory)
+
+        with self.assertRaises(RuntimeError):
+            ShmBackend(self.directory)
+        os.close(backend.lock_fd)
+
+    def test_cleanup_segments(self):
+        """测试清理无主段"""
+        backend = ShmBackend(self.directory)
+        chunk = MemoryChunk(2, backend)
+
+        self.assertIsNone(cleanup_segments(self.directory))
+
+        self._abandon(backend, [chunk])
+        count, mb = cleanup_segments(self.directory)
+
+        self.assertEqual(count, 1)
+        self.assertEqual(mb, 2)
+
+    def test_memfd_shrink(self):
+        """测试memfd段打洞归还"""
+        backend = MemfdBackend()
+        chunk = MemoryChunk(4, backend)
+        chunk.shrink(1)
+
+        self.assertEqual(backend.committed_bytes(chunk.data), 3 * 1024 * 1024)
+        chunk.release()
+        self.assertEqual(backend.segments, {})
+
+    def test_listen_fds(self):
+        """测试解析systemd传回的fd"""
+        env = {'LISTEN_PID': str(os.getpid()), 'LISTEN_FDS': '2', 'LISTEN_FDNAMES': 'a:b'}
+        with patch.dict(os.environ, env):
+            self.assertEqual(listen_fds(), [(3, 'a'), (4, 'b')])
+
+        with patch.dict(os.environ, {'LISTEN_PID': '1', 'LISTEN_FDS': '2'}):
+            self.assertEqual(listen_fds(), [])
+
+
+class TestMmapBackend(unittest.TestCase):
+    """测试mmap后端"""
+
+    def test_create_chunk(self):
+        """测试创建mmap内存块"""
+        chunk = MemoryChunk(4, 'mmap')
+
+        self.assertIsInstance(chunk.backend, MmapBackend)
+        self.assertEqual(len(chunk.data), 4 * 1024 * 1024)
+        self.assertTrue(chunk.committed)
+
+    def test_decommit_recommit(self):
+        """测试原地归还和重新提交"""
+        chunk = MemoryChunk(2, 'mmap')
+        chunk.data[0] = 7
+
+        chunk.decommit()
+        self.assertFalse(chunk.committed)
+        self.assertEqual(chunk.committed_bytes, 0)
+        self.assertEqual(chunk.data[0], 0)  # DONTNEED后读回零页
+
+        chunk.commit()
+        self.assertTrue(chunk.committed)
+        self.assertEqual(len(chunk.data), 2 * 1024 * 1024)
+
+    def test_release_with_reference_held(self):
+        """测试有外部引用时仍可释放"""
+        chunk = MemoryChunk(2, 'mmap')
+        view = memoryview(chunk.data)
+
+        chunk.release()
+
+        self.assertIsNone(chunk.data)
+        view.release()
+
+    def test_unknown_backend(self):
+        """测试未知后端"""
+        with self.assertRaises(ValueError):
+            get_backend('unknown')
+
+
+class FakeHolder:
+    """执行器测试用holder：每MB耗时固定，读数随分配上升"""
+
+    def __init__(self, seconds_per_mb=0.001, percent=20.0, percent_per_mb=0.0):
+        self.current_target = 30.0
+        self.seconds_per_mb = seconds_per_mb
+        self.percent_per_mb = percent_per_mb
+        self.holding = 0
+        self.slices = []
+        self.sensor = Mock()
+        self.sensor.sample.return_value = self.sensor
+        self.sensor.percent = percent
+        self.log = Mock()
+        self.emit = Mock()
+
+    def allocate_memory(self, mb):
+        time.sleep(mb * self.seconds_per_mb)
+        self.slices.append(mb)
+        self.holding += mb
+        self.sensor.percent += mb * self.percent_per_mb
+        return mb
+
+    def get_holding_mb(self):
+        return self.holding
+
+
+class TestBackgroundActuator(unittest.TestCase):
+    """测试后台分片执行器"""
+
+    def _run(self, holder, size_mb, **kwargs):
+        actuator = BackgroundActuator(holder, **kwargs)
+        actuator.submit({'size_mb': size_mb, 'error': -5})
+        actuator.wait_idle(5)
+        actuator.stop()
+        return actuator
+
+    def test_slices_within_budget(self):
+        """测试按速率调整片大小，每片在时间预算内"""
+        holder = FakeHolder(seconds_per_mb=0.0002)
+        actuator = self._run(holder, 1500, slice_budget=0.05)
+
+        self.assertEqual(sum(holder.slices), 1500)
+        self.assertGreater(len(holder.slices), 2)
+        # 首片取最小片，之后约为 速率 × 预算
+        self.assertEqual(holder.slices[0], 50)
+        self.assertLessEqual(max(holder.slices[1:-1]), 300)
+        self.assertIsNone(actuator.last_result['aborted'])
+
+    def test_abort_on_reversal(self):
+        """测试误差反向（已高于目标）时中止"""
+        holder = FakeHolder(percent_per_mb=0.1)
+        actuator = self._run(holder, 1000, slice_budget=0.05)
+
+        self.assertEqual(actuator.last_result['aborted'], 'reversed')
+        self.assertLess(holder.holding, 1000)
+
+    def test_preempt_records_latency(self):
+        """测试释放抢占进行中的分配并记录开始延迟"""
+        holder = FakeHolder(seconds_per_mb=0.002)
+        actuator = BackgroundActuator(holder, slice_budget=0.1)
+        actuator.submit({'size_mb': 2000, 'error': -5})
+        time.sleep(0.15)
+
+        plan = {'action': 'release', 'decided_at': time.monotonic()}
+        self.assertTrue(actuator.preempt(plan))
+        actuator.release_started(plan)
+        actuator.wait_idle(5)
+        actuator.stop()
+
+        self.assertEqual(actuator.last_result['aborted'], 'cancelled')
+        self.assertLess(holder.holding, 2000)
+        self.assertEqual(len(actuator.release_latencies), 1)
+        self.assertFalse(actuator.preempt({'action': 'release'}))
+
+    def test_busy_rejects_new_plan(self):
+        """测试分配进行中拒绝新的分配计划"""
+        holder = FakeHolder(seconds_per_mb=0.002)
+        actuator = BackgroundActuator(holder, slice_budget=0.1)
+        self.assertTrue(actuator.submit({'size_mb': 500, 'error': -5}))
+        self.assertFalse(actuator.submit({'size_mb': 500, 'error': -5}))
+        actuator.stop()
+
+
 if __name__ == '__main__':
     unittest.main()
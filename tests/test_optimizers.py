@@ -2,8 +2,9 @@
 
 import unittest
 import tempfile
+import random
 import os
-from nerdy_holder.optimizers import ParameterOptimizer
+from nerdy_holder.optimizers import ParameterOptimizer, GaussianProcess, BayesianOptimizer, get_optimizer
 
 
 class TestParameterOptimizer(unittest.TestCase):
@@ -100,6 +101,76 @@ class TestParameterOptimizer(unittest.TestCase):
         if updated and not isinstance(result, str):
             self.assertGreater(result, 80)
 
+    def test_explore_within_limits(self):
+        """测试探索结果不超出参数范围"""
+        stats = {'avg_error': 5.0, 'error_volatility': 0.5, 'block_rate': 0.2, 'interval_volatility': 1.0}
+        self.optimizer.params['response_base'] = 2.5
+        self.optimizer.params['urgency_threshold'] = 5.0
+
+        for _ in range(20):
+            self.optimizer.explore_parameter_smart(stats)
+
+        for name, (low, high) in ParameterOptimizer.PARAM_LIMITS.items():
+            self.assertGreaterEqual(self.optimizer.params[name], low)
+            self.assertLessEqual(self.optimizer.params[name], high)
+
+
+class TestGaussianProcess(unittest.TestCase):
+    """测试高斯过程"""
+
+    def test_interpolates(self):
+        """测试样本处接近观测值、远处回到均值且不确定性更大"""
+        points = [[0.1], [0.5], [0.9]]
+        gp = GaussianProcess(lengthscale=0.2, noise=1e-4)
+        gp.fit(points, [[1.0, 3.0, 2.0]])
+
+        (mu, sd), = gp.predict([0.5])
+        self.assertAlmostEqual(mu, 3.0, places=2)
+        (far_mu, far_sd), = gp.predict([5.0])
+        self.assertAlmostEqual(far_mu, 2.0, places=2)
+        self.assertGreater(far_sd, sd)
+
+
+class TestBayesianOptimizer(unittest.TestCase):
+    """测试代理模型探索"""
+
+    def setUp(self):
+        """初始化"""
+        self.optimizer = BayesianOptimizer(config_file=None, rng=random.Random(0))
+
+    def _trials(self, max_error):
+        rng = random.Random(1)
+        for _ in range(10):
+            self.optimizer.params.update(self.optimizer.decode([rng.random() for _ in self.optimizer.names]))
+            self.optimizer.record_trial(rng.uniform(60, 80), {'avg_error': 1.0, 'max_error': max_error})
+
+    def test_get_optimizer(self):
+        """测试按名称获取"""
+        self.assertIsInstance(get_optimizer('bayesian', config_file=None), BayesianOptimizer)
+        self.assertEqual(type(get_optimizer(None, config_file=None)), ParameterOptimizer)
+        self.assertIs(get_optimizer(self.optimizer), self.optimizer)
+        with self.assertRaises(ValueError):
+            get_optimizer('annealing')
+
+    def test_full_vector(self):
+        """测试探索覆盖PID和EMA且在范围内"""
+        self._trials(max_error=1.0)
+        self.assertTrue(self.optimizer.explore(None))
+
+        backup = self.optimizer.exploration_backup()
+        self.assertIn('pid_kp', backup)
+        self.assertIn('ema_slow', backup)
+        for name, (low, high) in ParameterOptimizer.PARAM_LIMITS.items():
+            self.assertTrue(low <= self.optimizer.params[name] <= high)
+
+    def test_safety_constraint(self):
+        """测试预测最大误差超限时不探索"""
+        self._trials(max_error=20.0)
+        before = self.optimizer.exploration_backup()
+
+        self.assertFalse(self.optimizer.explore(None))
+        self.assertEqual(self.optimizer.exploration_backup(), before)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,354 @@
+"""测试运行时：在线交接、异步运行时、紧急释放看门狗"""
+
+import os
+import time
+import tempfile
+import threading
+import unittest
+from nerdy_holder.core import NerdyHolderPro
+from nerdy_holder.memory import MemoryChunk, ShmBackend
+from unittest.mock import Mock, patch
+from nerdy_holder.runtime import (
+    take_over, HandoverServer, AsyncHolderRuntime, EmergencyWatchdog, set_oom_score_adj, get_oom_score_adj
+)
+
+
+class TestHandover(unittest.TestCase):
+    """测试段与状态交接"""
+
+    def setUp(self):
+        """初始化"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'handover.sock')
+
+    def tearDown(self):
+        """清理"""
+        self.tmp.cleanup()
+
+    def _wait_pending(self, holder, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not holder.handover_server.pending:
+            if time.monotonic() > deadline:
+                self.fail("继任者未连接")
+            time.sleep(0.01)
+
+    def test_hand_over(self):
+        """测试旧进程交出段，新进程接管持有量和控制器状态"""
+        old = NerdyHolderPro(enable_benchmark=False, fixed_target=30, config_file=None,
+                             backend='memfd', handover_socket=self.path)
+        for size in (4, 2):
+            old.ledger.add(MemoryChunk(size, old.backend))
+        old.pid_controller.integral = 12.5
+        old.stats['decisions'] = 42
+
+        new = NerdyHolderPro(enable_benchmark=False, fixed_target=30, config_file=None, backend='memfd')
+        result = {}
+        thread = threading.Thread(target=lambda: result.update(report=take_over(new, self.path)))
+        thread.start()
+
+        self._wait_pending(old)
+        old.hand_over()
+        thread.join(5)
+
+        report = result['report']
+        self.assertTrue(old.handed_over)
+        self.assertFalse(old.running)
+        self.assertEqual(len(old.ledger), 0)
+        self.assertEqual(report['segments'], 2)
+        self.assertEqual(new.get_holding_mb(), 6)
+        self.assertEqual(new.pid_controller.integral, 12.5)
+        self.assertEqual(new.stats['decisions'], 42)
+        self.assertFalse(os.path.exists(self.path))
+
+        new.ledger.clear()
+
+    def test_hand_over_shm(self):
+        """测试shm交接：继任者不与旧进程争目录锁，锁随段转交"""
+        directory = os.path.join(self.tmp.name, 'shm')
+        os.mkdir(directory)
+        control = os.path.join(self.tmp.name, 'control.sock')
+        old = NerdyHolderPro(enable_benchmark=False, fixed_target=30, config_file=None,
+                             backend=ShmBackend(directory), handover_socket=self.path,
+                             control_socket=control)
+        for size in (4, 2):
+            old.ledger.add(MemoryChunk(size, old.backend))
+
+        new = NerdyHolderPro(enable_benchmark=False, fixed_target=30, config_file=None,
+                             backend=ShmBackend(directory, lock=False), takeover_socket=self.path,
+                             control_socket=control)
+        self.assertIsNone(new.control)
+        result = {}
+        thread = threading.Thread(target=lambda: result.update(segments=new.restore_holding()))
+        with patch.object(new, 'adopt_segments') as adopt_segments, patch.object(new, 'log'):
+            thread.start()
+            self._wait_pending(old)
+            old.hand_over()
+            thread.join(5)
+        adopt_segments.assert_not_called()
+
+        self.assertTrue(old.handed_over)
+        self.assertEqual(result['segments'], 2)
+        self.assertEqual(new.get_holding_mb(), 6)
+        self.assertEqual(len(os.listdir(directory)), 3)
+
+        # 控制socket交接：旧进程先交出路径，继任者交接后绑定
+        self.assertIsNone(old.control)
+        self.assertTrue(os.path.exists(control))
+        new.control.close()
+
+        # 旧进程退出后目录锁仍由继任者持有
+        os.close(old.backend.lock_fd)
+        with self.assertRaises(RuntimeError):
+            ShmBackend(directory)
+
+        new.ledger.clear()
+        os.close(new.backend.lock_fd)
+
+    def test_socket_paths(self):
+        """测试交接socket：正在监听时拒绝启动，不能与接管socket相同，关闭时不删除他人的socket"""
+        old = NerdyHolderPro(enable_benchmark=False, fixed_target=30, config_file=None,
+                             handover_socket=self.path)
+        with self.assertRaises(RuntimeError):
+            NerdyHolderPro(enable_benchmark=False, fixed_target=30, config_file=None,
+                           handover_socket=self.path)
+        with self.assertRaises(ValueError):
+            NerdyHolderPro(enable_benchmark=False, fixed_target=30, config_file=None,
+                           handover_socket=self.path, takeover_socket=self.path)
+        self.assertTrue(os.path.exists(self.path))
+        # 存活探测不被当作继任者
+        time.sleep(0.05)
+        self.assertIsNone(old.handover_server.pending)
+
+        os.remove(self.path)
+        successor = HandoverServer(self.path)
+        old.handover_server.close()
+        self.assertTrue(os.path.exists(self.path))
+        successor.close()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_hand_over_unsupported_backend(self):
+        """测试不支持交接的后端保持运行"""
+        old = NerdyHolderPro(enable_benchmark=False, fixed_target=30, config_file=None, handover_socket=self.path)
+        old.ledger.add(MemoryChunk(1, old.backend))
+
+        new = NerdyHolderPro(enable_benchmark=False, fixed_target=30, config_file=None)
+        errors = []
+
+        def successor():
+            try:
+                take_over(new, self.path)
+            except RuntimeError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=successor)
+        thread.start()
+        self._wait_pending(old)
+        old.hand_over()
+        thread.join(5)
+
+        self.assertFalse(old.handed_over)
+        self.assertEqual(old.get_holding_mb(), 1)
+        self.assertEqual(len(errors), 1)
+
+        old.ledger.clear()
+
+
+class TestAsyncRuntime(unittest.TestCase):
+    """测试异步运行时"""
+
+    def setUp(self):
+        """初始化：决策固定为先分配后释放，每片分配耗时0.1s"""
+        self.holder = NerdyHolderPro(enable_benchmark=True, fixed_target=30, waker='',
+                                     slice_budget=0.1)
+        self.holder.scheduler.max_interval = 0.05
+        # 主机读数始终高于目标：分配途中也需要决策
+        self.holder.current_target = 0.1
+        self.events = []
+        actuator = self.holder.actuator
+
+        plans = [
+            {'outcome': 'adjust', 'action': 'allocate', 'size_mb': 2000, 'error': -5},
+            {'outcome': 'adjust', 'action': 'release', 'size_mb': 50, 'error': 5},
+        ]
+
+        def decide(current):
+            if not plans:
+                return {'outcome': 'tolerance', 'error': 0}
+            plan = plans.pop(0)
+            plan['decided_at'] = time.monotonic()
+            return plan
+
+        def allocate(mb):
+            self.events.append(('allocate', 'start', time.monotonic()))
+            time.sleep(0.1)
+            self.events.append(('allocate', 'end', time.monotonic()))
+            return mb
+
+        def apply(plan, report=True):
+            self.events.append((plan['action'], 'start', time.monotonic()))
+            actuator.release_started(plan)
+            self.events.append((plan['action'], 'end', time.monotonic()))
+
+        self.patches = [
+            patch.object(self.holder, 'decide', side_effect=decide),
+            patch.object(self.holder, 'allocate_memory', side_effect=allocate),
+            patch.object(self.holder, 'apply', side_effect=apply),
+            patch.object(self.holder, 'export_status'),
+            patch.object(self.holder, 'log'),
+            patch.object(self.holder, 'get_holding_mb', return_value=100),
+            # 片间检查只看取消信号（真实读数始终高于目标）
+            patch.object(actuator, 'check',
+                         side_effect=lambda: 'cancelled' if actuator.cancelled.is_set() else None),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """清理"""
+        for p in self.patches:
+            p.stop()
+        self.holder.actuator.stop()
+
+    def _run(self, seconds):
+        threading.Timer(seconds, lambda: setattr(self.holder, 'running', False)).start()
+        runtime = AsyncHolderRuntime(self.holder, sample_interval=0.02, export_interval=0.1)
+        runtime.run()
+        return runtime
+
+    def test_release_preempts_allocation(self):
+        """测试分配期间释放立即开始，分配在下一片前中止"""
+        self._run(1.0)
+
+        releases = [t for action, phase, t in self.events if action == 'release']
+        slices = [t for action, phase, t in self.events if action == 'allocate' and phase == 'end']
+        result = self.holder.actuator.last_result
+
+        self.assertEqual(result['aborted'], 'cancelled')
+        self.assertLess(result['allocated_mb'], 2000)
+        # 释放后至多再完成一片
+        self.assertLessEqual(len([t for t in slices if t > releases[0]]), 1)
+        self.assertLess(self.holder.actuator.get_release_latency()['max'], 100)
+
+    def test_export_during_allocation(self):
+        """测试分配期间状态导出照常进行"""
+        self._run(1.0)
+        self.assertGreaterEqual(self.holder.export_status.call_count, 5)
+
+    def test_stops_promptly(self):
+        """测试停止后及时退出（中止进行中的分配）"""
+        start = time.monotonic()
+        self._run(0.2)
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertFalse(self.holder.actuator.busy)
+        self.assertEqual(self.holder.actuator.last_result['aborted'], 'cancelled')
+
+
+class TestWatchdog(unittest.TestCase):
+    """测试紧急释放看门狗"""
+
+    def setUp(self):
+        """初始化：伪造meminfo/PSI文件和holder"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.meminfo = os.path.join(self.tmp.name, 'meminfo')
+        self.psi = os.path.join(self.tmp.name, 'memory')
+        self._write_meminfo(4096)
+        with open(self.psi, 'w') as f:
+            f.write("some avg10=0.00 avg60=0.00 avg300=0.00 total=0\n"
+                    "full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n")
+
+        self.holder = Mock()
+        self.holder.get_holding_mb.return_value = 2000
+        self.holder.release_memory.side_effect = lambda mb: mb
+
+    def tearDown(self):
+        """清理"""
+        self.tmp.cleanup()
+
+    def _write_meminfo(self, available_mb):
+        with open(self.meminfo, 'w') as f:
+            f.write(f"MemTotal:       16777216 kB\nMemAvailable:   {available_mb * 1024} kB\n")
+
+    def _watchdog(self, **kwargs):
+        return EmergencyWatchdog(self.holder, floor_mb=500, meminfo_path=self.meminfo,
+                                 psi_path=self.psi, **kwargs)
+
+    def test_floor_breach_releases(self):
+        """测试跌破下限时中止分配并释放到下限之上"""
+        watchdog = self._watchdog()
+        self.assertEqual(watchdog.check(), 0)
+
+        self._write_meminfo(100)
+        released = watchdog.check()
+        watchdog.close()
+
+        # 缺口400MB + 余量500MB
+        self.assertEqual(released, 900)
+        self.holder.actuator.cancel.assert_called_once()
+        self.assertEqual(watchdog.stats['breaches'], 1)
+        self.assertEqual(len(watchdog.latencies), 1)
+
+    def test_release_capped_by_holding(self):
+        """测试释放量不超过持有量，持有0时不动作"""
+        self._write_meminfo(100)
+        self.holder.get_holding_mb.return_value = 300
+        watchdog = self._watchdog()
+        self.assertEqual(watchdog.check(), 300)
+
+        self.holder.get_holding_mb.return_value = 0
+        self.assertEqual(watchdog.check(), 0)
+        watchdog.close()
+
+    def test_psi_full_rate(self):
+        """测试窗口内full停顿占比"""
+        watchdog = self._watchdog()
+        watchdog.sample_psi(0.0)
+        with open(self.psi, 'w') as f:
+            f.write("full avg10=0.00 avg60=0.00 avg300=0.00 total=200000\n")
+        self.assertAlmostEqual(watchdog.sample_psi(1.0), 20.0)
+        watchdog.close()
+
+    def test_psi_breach_cooldown(self):
+        """测试PSI越线释放后冷却期内不重复释放"""
+        watchdog = self._watchdog()
+        with patch.object(watchdog, 'sample_psi', return_value=20.0):
+            self.assertEqual(watchdog.check(), 500)
+            self.assertEqual(watchdog.check(), 0)
+        watchdog.close()
+
+    def test_fit_target(self):
+        """测试下限高于目标处可用内存时下调，默认周期不高频轮询"""
+        watchdog = self._watchdog()
+        self.assertGreaterEqual(watchdog.period, 0.25)
+        self.assertIsNone(watchdog.fit_target(2000))
+        self.assertEqual(watchdog.floor_mb, 500)
+
+        self.assertEqual(watchdog.fit_target(600), 500)
+        self.assertEqual(watchdog.floor_mb, 300)
+        self.assertEqual(watchdog.headroom_mb, 300)
+        watchdog.close()
+
+    def test_thread_reacts(self):
+        """测试线程在几个周期内响应越线"""
+        watchdog = self._watchdog(period=0.01)
+        watchdog.start()
+        time.sleep(0.05)
+        self._write_meminfo(100)
+        deadline = time.monotonic() + 2
+        while not watchdog.stats['breaches'] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        watchdog.close()
+
+        self.assertGreaterEqual(watchdog.stats['breaches'], 1)
+        self.assertLess(watchdog.get_latency()['max'], 100)
+
+    def test_oom_score_adj(self):
+        """测试写入oom_score_adj"""
+        path = os.path.join(self.tmp.name, 'oom_score_adj')
+        self.assertTrue(set_oom_score_adj(1000, path))
+        self.assertEqual(get_oom_score_adj(path), 1000)
+        self.assertFalse(set_oom_score_adj(1000, os.path.join(self.tmp.name, 'missing', 'x')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,307 @@
+"""测试传感器"""
+
+import os
+import time
+import tempfile
+import threading
+import unittest
+import psutil
+from nerdy_holder.sensors import (
+    MeminfoSensor, UsedPercentSensor, AvailableFloorSensor, CommitHeadroomSensor,
+    CgroupSensor, get_sensor, PressureSensor, TimerWaker, PipeWaker, create_waker, get_waker
+)
+
+MEMINFO = """MemTotal:        8000000 kB
+MemFree:         3000000 kB
+MemAvailable:    6000000 kB
+Buffers:           58684 kB
+CommitLimit:     4000000 kB
+Committed_AS:    2500000 kB
+HugePages_Total:       0
+"""
+
+
+class TestMeminfoSensor(unittest.TestCase):
+    """测试meminfo传感器"""
+
+    def setUp(self):
+        """初始化"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'meminfo')
+        self._write(MEMINFO)
+
+    def tearDown(self):
+        """清理"""
+        self.tmp.cleanup()
+
+    def _write(self, text):
+        with open(self.path, 'w') as f:
+            f.write(text)
+
+    def test_parse(self):
+        """测试解析字段"""
+        sensor = MeminfoSensor(self.path)
+
+        self.assertEqual(sensor.total, 8000000 * 1024)
+        self.assertEqual(sensor.available, 6000000 * 1024)
+        self.assertEqual(sensor.get('Committed_AS'), 2500000 * 1024)
+        self.assertEqual(sensor.percent, 25.0)
+        sensor.close()
+
+    def test_snapshot_until_sample(self):
+        """测试快照在下次采样前保持不变"""
+        sensor = MeminfoSensor(self.path)
+        self._write(MEMINFO.replace('6000000', '2000000'))
+
+        self.assertEqual(sensor.percent, 25.0)
+        sensor.sample()
+        self.assertEqual(sensor.percent, 75.0)
+        sensor.close()
+
+    def test_value_width_change(self):
+        """测试数值宽度变化（偏移缓存失效）"""
+        sensor = MeminfoSensor(self.path)
+        self._write(MEMINFO.replace('MemTotal:        8000000', 'MemTotal: 80000000'))
+
+        sensor.sample()
+        self.assertEqual(sensor.total, 80000000 * 1024)
+        self.assertEqual(sensor.get('Committed_AS'), 2500000 * 1024)
+        sensor.close()
+
+    def test_buffer_grow(self):
+        """测试缓冲区扩容"""
+        padding = ''.join(f"Filler{i}:  {i} kB\n" for i in range(500))
+        self._write(padding + MEMINFO)
+
+        sensor = MeminfoSensor(self.path)
+        self.assertEqual(sensor.percent, 25.0)
+        sensor.close()
+
+    def test_matches_psutil(self):
+        """测试与psutil同口径"""
+        sensor = MeminfoSensor()
+
+        self.assertEqual(sensor.total, psutil.virtual_memory().total)
+        self.assertAlmostEqual(sensor.sample().percent, psutil.virtual_memory().percent, delta=1)
+        sensor.close()
+
+    def test_psutil_fallback(self):
+        """测试无procfs时退回psutil"""
+        sensor = MeminfoSensor(os.path.join(self.tmp.name, 'missing'))
+
+        self.assertIsNone(sensor.fd)
+        self.assertEqual(sensor.total, psutil.virtual_memory().total)
+
+
+class TestMetricSensors(unittest.TestCase):
+    """测试可插拔指标"""
+
+    def setUp(self):
+        """初始化：假meminfo与假cgroupfs"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.meminfo_path = os.path.join(self.tmp.name, 'meminfo')
+        with open(self.meminfo_path, 'w') as f:
+            f.write(MEMINFO)
+
+        self.cgroup = os.path.join(self.tmp.name, 'cgroup')
+        os.makedirs(os.path.join(self.cgroup, 'holder.slice'))
+        self._cgroup_write('memory.current', 512 * 1024 * 1024)
+        self._cgroup_write('memory.max', 2048 * 1024 * 1024)
+
+    def tearDown(self):
+        """清理"""
+        self.tmp.cleanup()
+
+    def _cgroup_write(self, name, value):
+        with open(os.path.join(self.cgroup, 'holder.slice', name), 'w') as f:
+            f.write(f"{value}\n")
+
+    def _meminfo(self):
+        return MeminfoSensor(self.meminfo_path)
+
+    def test_used(self):
+        """测试已用百分比"""
+        sensor = UsedPercentSensor(self._meminfo())
+
+        self.assertEqual(sensor.percent, 25.0)
+        self.assertEqual(sensor.to_percent(80), 80)
+        self.assertEqual(sensor.scale_bytes, 8000000 * 1024)
+
+    def test_available_floor(self):
+        """测试MemAvailable下限（MB）"""
+        sensor = AvailableFloorSensor(self._meminfo())
+
+        self.assertAlmostEqual(sensor.value, 6000000 / 1024)
+        # 保留可用内存越多，控制刻度上的目标越低
+        self.assertLess(sensor.to_percent(6000), sensor.to_percent(2000))
+        self.assertAlmostEqual(sensor.from_percent(sensor.to_percent(2048)), 2048)
+
+    def test_commit_headroom(self):
+        """测试提交余量（MB）"""
+        sensor = CommitHeadroomSensor(self._meminfo())
+
+        self.assertEqual(sensor.scale_bytes, 4000000 * 1024)
+        self.assertAlmostEqual(sensor.percent, 62.5)
+        self.assertAlmostEqual(sensor.value, 1500000 / 1024)
+        self.assertAlmostEqual(sensor.to_percent(1500000 / 1024), 62.5)
+
+    def test_cgroup(self):
+        """测试cgroup v2 memory.current/memory.max"""
+        sensor = CgroupSensor(self.cgroup, 'holder.slice', self._meminfo())
+
+        self.assertEqual(sensor.percent, 25.0)
+        self.assertAlmostEqual(sensor.value, 512)
+        self.assertAlmostEqual(sensor.to_percent(1024), 50.0)
+
+        self._cgroup_write('memory.current', 1024 * 1024 * 1024)
+        self.assertEqual(sensor.sample().percent, 50.0)
+        sensor.close()
+
+    def test_cgroup_unlimited(self):
+        """测试memory.max为max时以主机内存为刻度"""
+        self._cgroup_write('memory.max', 'max')
+        sensor = CgroupSensor(self.cgroup, '/holder.slice', self._meminfo())
+
+        self.assertEqual(sensor.scale_bytes, 8000000 * 1024)
+        sensor.close()
+
+    def test_get_sensor(self):
+        """测试按名称获取"""
+        self.assertIsInstance(get_sensor('available'), AvailableFloorSensor)
+        with self.assertRaises(ValueError):
+            get_sensor('swap')
+
+
+PSI = """some avg10=0.00 avg60=0.00 avg300=0.00 total=0
+full avg10=0.00 avg60=0.00 avg300=0.00 total=0
+"""
+
+
+class TestPressureSensor(unittest.TestCase):
+    """测试回收压力融合"""
+
+    def setUp(self):
+        """初始化：假PSI与假vmstat"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.psi_path = os.path.join(self.tmp.name, 'memory')
+        self.vmstat_path = os.path.join(self.tmp.name, 'vmstat')
+        self._write(self.psi_path, PSI)
+        self._write_vmstat(0, 0)
+
+    def tearDown(self):
+        """清理"""
+        self.tmp.cleanup()
+
+    def _write(self, path, text):
+        with open(path, 'w') as f:
+            f.write(text)
+
+    def _write_vmstat(self, scan, refault, kswapd=0, majfault=10):
+        self._write(self.vmstat_path,
+                    f"nr_free_pages 1000\n"
+                    f"workingset_refault_anon {refault}\n"
+                    f"workingset_refault_file {refault}\n"
+                    f"pgmajfault {majfault}\n"
+                    f"pgsteal_kswapd {kswapd}\n"
+                    f"pgsteal_direct 0\n"
+                    f"pgscan_direct {scan}\n")
+
+    def test_calm(self):
+        """测试无压力"""
+        sensor = PressureSensor(self.psi_path, self.vmstat_path)
+        self.assertEqual(sensor.sample().score, 0)
+        sensor.close()
+
+    def test_psi_average(self):
+        """测试PSI均值"""
+        sensor = PressureSensor(self.psi_path, self.vmstat_path)
+        self._write(self.psi_path, PSI.replace('some avg10=0.00', 'some avg10=5.00'))
+
+        sensor.sample()
+        self.assertEqual(sensor.psi['some'], 5.0)
+        self.assertAlmostEqual(sensor.components['psi_some'], 0.5)
+        self.assertAlmostEqual(sensor.score, 0.5)
+        sensor.close()
+
+    def test_counter_rates(self):
+        """测试计数器速率与融合"""
+        sensor = PressureSensor(self.psi_path, self.vmstat_path)
+        sensor.last_time -= 1.0
+        self._write_vmstat(2560, 3200)
+
+        sensor.sample()
+        self.assertAlmostEqual(sensor.rates['pgscan_direct'], 2560, delta=10)
+        self.assertAlmostEqual(sensor.rates['workingset_refault'], 6400, delta=30)
+        self.assertAlmostEqual(sensor.components['pgscan_direct'], 1.0, delta=0.01)
+        self.assertGreater(sensor.score, 0.99)
+        sensor.close()
+
+    def test_kswapd_only(self):
+        """测试持续kswapd后台回收不推高压力"""
+        sensor = PressureSensor(self.psi_path, self.vmstat_path)
+        for second in range(1, 4):
+            sensor.last_time -= 1.0
+            self._write_vmstat(0, 0, kswapd=second * 51200, majfault=10 + second * 2000)
+            sensor.sample()
+
+        self.assertAlmostEqual(sensor.rates['pgsteal_kswapd'], 51200, delta=200)
+        self.assertAlmostEqual(sensor.rates['pgmajfault'], 2000, delta=10)
+        self.assertLess(sensor.score, 0.05)
+        sensor.close()
+
+    def test_missing_sources(self):
+        """测试无PSI/vmstat时压力为0"""
+        sensor = PressureSensor(os.path.join(self.tmp.name, 'none'), os.path.join(self.tmp.name, 'none'))
+
+        self.assertFalse(sensor.available)
+        self.assertEqual(sensor.sample().score, 0)
+
+
+class TestWakers(unittest.TestCase):
+    """测试唤醒源"""
+
+    def test_pipe_wakes_early(self):
+        """测试触发后立即唤醒"""
+        waker = PipeWaker()
+        threading.Timer(0.05, waker.fire).start()
+
+        start = time.monotonic()
+        woke = waker.wait(5)
+        elapsed = time.monotonic() - start
+        waker.close()
+
+        self.assertTrue(woke)
+        self.assertLess(elapsed, 1)
+        self.assertEqual(waker.events, 1)
+
+    def test_pipe_timeout(self):
+        """测试无事件时超时返回"""
+        waker = PipeWaker()
+        self.assertFalse(waker.wait(0.05))
+
+        # 多次触发只唤醒一次（已排空）
+        waker.fire()
+        waker.fire()
+        self.assertTrue(waker.wait(0.05))
+        self.assertFalse(waker.wait(0.05))
+        waker.close()
+
+    def test_fallback_without_psi(self):
+        """测试无PSI时退回超时"""
+        with tempfile.TemporaryDirectory() as directory:
+            waker = create_waker(path=os.path.join(directory, 'memory'))
+
+        self.assertIsInstance(waker, TimerWaker)
+        self.assertFalse(waker.event_driven)
+        self.assertFalse(waker.wait(0.01))
+
+    def test_get_waker(self):
+        """测试获取唤醒源"""
+        self.assertIsInstance(get_waker(''), TimerWaker)
+        pipe = PipeWaker()
+        self.assertIs(get_waker(pipe), pipe)
+        pipe.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,405 @@
+"""测试虚拟时钟与模拟主机"""
+
+import io
+import json
+import os
+import math
+import random
+import tempfile
+import unittest
+import contextlib
+from unittest.mock import patch
+from nerdy_holder.core import NerdyHolderPro
+from nerdy_holder.controllers import EnhancedPIDController
+from nerdy_holder.optimizers import ParameterOptimizer, ShadowPool
+from nerdy_holder.trackers import MemoryTrace
+from nerdy_holder.simulation import VirtualClock, SimulatedHost, TraceHost, Simulation, CorpusTuner, replay
+from nerdy_holder.simulation.replay import BatchPipeline, np
+
+MB = 1024 * 1024
+
+
+class TestVirtualClock(unittest.TestCase):
+    """测试虚拟时钟"""
+
+    def test_sleep_advances(self):
+        """测试sleep只推进读数"""
+        clock = VirtualClock(start=1000.0)
+        self.assertEqual(clock.monotonic(), 0)
+        clock.sleep(2.5)
+        clock.sleep(-1)
+        self.assertEqual(clock.time(), 1002.5)
+        self.assertEqual(clock.monotonic(), 2.5)
+
+    def test_pid_uses_clock(self):
+        """测试PID按注入时钟计算dt"""
+        clock = VirtualClock()
+        pid = EnhancedPIDController(Kp=0, Ki=1.0, Kd=0, target=50, clock=clock)
+        pid.compute(50)
+        clock.sleep(10)
+        pid.compute(40)
+        # 积分 = 误差10 × 10秒
+        self.assertAlmostEqual(pid.integral, 40)  # 上限
+        self.assertEqual(pid.last_time, clock.time())
+
+
+class TestOptimizerPersistence(unittest.TestCase):
+    """测试参数文件可关闭"""
+
+    def test_no_config_file(self):
+        """测试config_file为None时不读写文件"""
+        with tempfile.TemporaryDirectory() as tmp:
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                optimizer = ParameterOptimizer(config_file=None)
+                optimizer.save_params(force=True)
+                self.assertEqual(os.listdir(tmp), [])
+            finally:
+                os.chdir(cwd)
+
+
+class TestSimulatedHost(unittest.TestCase):
+    """测试模拟主机"""
+
+    def test_commit_takes_time(self):
+        """测试提交按填充速率消耗模拟时间"""
+        clock = VirtualClock()
+        host = SimulatedHost(clock, total_mb=4096, base_mb=1024, fill_mb_per_sec=1000)
+        host.commit(500 * MB)
+        self.assertAlmostEqual(clock.monotonic(), 0.5)
+        self.assertEqual(host.held_bytes, 500 * MB)
+
+        host.decommit(200 * MB)
+        self.assertEqual(host.held_bytes, 300 * MB)
+
+    def test_commit_beyond_total(self):
+        """测试超出总内存时分配失败"""
+        host = SimulatedHost(VirtualClock(), total_mb=4096, base_mb=3000, daily_mb=0, walk_mb=0)
+        with self.assertRaises(MemoryError):
+            host.commit(2048 * MB)
+        self.assertEqual(host.allocation_failures, 1)
+
+    def test_deterministic_load(self):
+        """测试同一种子负载轨迹一致"""
+        def trace(seed):
+            clock = VirtualClock()
+            host = SimulatedHost(clock, seed=seed, burst_rate=1 / 60)
+            loads = []
+            for _ in range(100):
+                clock.sleep(30)
+                loads.append(host.used_bytes)
+            return loads
+
+        self.assertEqual(trace(3), trace(3))
+        self.assertNotEqual(trace(3), trace(4))
+
+
+class TestSimulation(unittest.TestCase):
+    """测试无头模拟"""
+
+    def _run(self, seed):
+        simulation = Simulation(seed=seed, fixed_target=60)
+        result = simulation.run(6 * 3600)
+        simulation.close()
+        for key in ('wall_seconds', 'speedup'):
+            result.pop(key)
+        return result
+
+    def test_tracks_target(self):
+        """测试未修改的决策流程在模拟主机上跟踪目标"""
+        result = self._run(0)
+        self.assertGreaterEqual(result['simulated_seconds'], 6 * 3600)
+        self.assertGreater(result['adjustments'], 0)
+        self.assertLess(result['mean_abs_error'], 2)
+        self.assertGreater(result['holding_mb'], 0)
+
+    def test_deterministic(self):
+        """测试同一种子结果完全一致"""
+        self.assertEqual(self._run(1), self._run(1))
+
+    def test_params_applied(self):
+        """测试覆盖的PID增益和EMA系数同步到算法组件"""
+        simulation = Simulation(seed=0, fixed_target=60, params={'pid_kp': 3.0, 'pid_kd': 0.2, 'ema_fast': 0.5})
+        holder = simulation.holder
+        simulation.close()
+
+        self.assertEqual(holder.pid_controller.Kp, 3.0)
+        self.assertEqual(holder.pid_controller.Kd, 0.2)
+        self.assertEqual(holder.ema_predictor.fast_alpha, 0.5)
+
+    def test_bayesian_explorer(self):
+        """测试代理模型探索在模拟中积累样本并报告逐小时误差"""
+        simulation = Simulation(seed=0, fixed_target=60, optimizer='bayesian')
+        result = simulation.run(3 * 3600)
+        simulation.close()
+
+        self.assertEqual(result['optimizer'], 'bayesian')
+        self.assertEqual(len(result['hourly_error']), 3)
+        self.assertGreater(len(simulation.holder.optimizer.trials), 5)
+        self.assertLess(result['mean_abs_error'], 2)
+
+
+def trace_holder(trace, params, trace_file=None):
+    """在轨迹主机上构造holder（瞬时提交）"""
+    clock = VirtualClock(start=trace.times[0])
+    host = TraceHost(clock, trace, fill_mb_per_sec=math.inf, release_mb_per_sec=math.inf)
+    holder = NerdyHolderPro(
+        enable_benchmark=False, fixed_target=60, backend=host.backend(), prefault_workers=1,
+        sensor=host.sensor(), waker=host.waker(), pressure=host.pressure(),
+        config_file=None, clock=clock, rng=random.Random(0), trace_file=trace_file
+    )
+    holder.optimizer.params.update(params)
+    holder.apply_params()
+    return holder, clock
+
+
+@unittest.skipIf(np is None, "需要numpy")
+class TestReplay(unittest.TestCase):
+    """测试批量回放"""
+
+    CANDIDATES = [
+        {},
+        {'pid_kp': 3.0, 'response_base': 2.0, 'ema_fast': 0.5},
+        {'cost_decay_allocate': 1.1, 'min_interval_allocate': 4.5, 'tolerance': 0.5, 'pid_ki': 0.1}
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        host = SimulatedHost(VirtualClock(), seed=5, burst_rate=1 / 600)
+        cls.trace = host.trace(3600, 2.0)
+
+    def test_matches_holder(self):
+        """测试每个候选的持有量序列与真实决策流程逐步一致"""
+        load = self.trace.resample(2.0)
+        pipeline = BatchPipeline(self.CANDIDATES, self.trace.total_mb, 60)
+        pipeline.initialize(load[0])
+        holdings = [pipeline.holding.copy()]
+        for i in range(1, len(load)):
+            pipeline.step(i * 2.0, load[i])
+            holdings.append(pipeline.holding.copy())
+
+        for k, params in enumerate(self.CANDIDATES):
+            holder, clock = trace_holder(self.trace, params)
+            with contextlib.redirect_stdout(io.StringIO()):
+                holder.initialize()
+                self.assertAlmostEqual(holder.get_holding_mb(), holdings[0][k], places=6)
+                for i in range(1, len(load)):
+                    clock.sleep(2.0)
+                    holder.make_decision()
+                    self.assertAlmostEqual(holder.get_holding_mb(), holdings[i][k], places=6)
+            self.assertEqual(holder.stats['adjustments'], pipeline.adjustments[k])
+            self.assertEqual(holder.stats['blocked'], pipeline.blocked[k])
+            holder.prefaulter.shutdown()
+
+    def test_replay_results(self):
+        """测试回放结果按候选给出且可复现"""
+        first = replay(self.trace, self.CANDIDATES, target=60, step=2.0)
+        second = replay(self.trace, self.CANDIDATES, target=60, step=2.0)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(first), 3)
+        self.assertEqual(first[1]['params'], self.CANDIDATES[1])
+        self.assertGreater(first[0]['adjustments'], 0)
+        self.assertLess(first[0]['avg_error'], 5)
+
+    def test_recorded_trace(self):
+        """测试holder记录的轨迹读回后还原租户负载"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'trace.csv')
+            holder, clock = trace_holder(self.trace, {}, trace_file=path)
+            with contextlib.redirect_stdout(io.StringIO()):
+                holder.initialize()
+                for _ in range(30):
+                    clock.sleep(2.0)
+                    holder.make_decision()
+            holder.trace.close()
+            holder.prefaulter.shutdown()
+
+            recorded = MemoryTrace.load_file(path)
+
+        self.assertGreater(len(recorded), 30)
+        self.assertEqual(recorded.total_mb, self.trace.total_mb)
+        for t, load in zip(recorded.times, recorded.load):
+            # 读数保留一位小数
+            self.assertAlmostEqual(load, self.trace.load_at(t - self.trace.times[0]), delta=0.1)
+
+
+@unittest.skipIf(np is None, "需要numpy")
+class TestCorpusTuner(unittest.TestCase):
+    """测试轨迹语料调参"""
+
+    def setUp(self):
+        """初始化"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = []
+        for seed in range(2):
+            host = SimulatedHost(VirtualClock(), seed=seed, base_mb=8192 + 4096 * seed, burst_rate=1 / 600)
+            path = os.path.join(self.tmp.name, f'host{seed}.csv')
+            host.trace(1800, 2.0).save(path)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_sample_within_limits(self):
+        """测试采样在参数范围内且含默认值"""
+        tuner = CorpusTuner(self.paths)
+        candidates = tuner.sample(20)
+
+        self.assertEqual(candidates[0]['response_base'], ParameterOptimizer(config_file=None).params['response_base'])
+        for candidate in candidates:
+            for name, (low, high) in ParameterOptimizer.PARAM_LIMITS.items():
+                self.assertTrue(low <= candidate[name] <= high)
+
+    def test_ranked_params_file(self):
+        """测试写出的排名参数文件可被holder加载"""
+        tuner = CorpusTuner(self.paths, workers=2, eta=3)
+        ranking = tuner.run(9)
+        output = os.path.join(self.tmp.name, 'nerdy_params.json')
+        report = tuner.write(ranking, output)
+
+        # 9组候选 → 2轮，最后一轮保留3组并回放完整轨迹
+        self.assertEqual([r['candidates'] for r in tuner.rounds], [9, 3])
+        self.assertEqual(tuner.rounds[-1]['fraction'], 1)
+        self.assertEqual(len(ranking), 3)
+        robust = [entry['robust'] for entry in ranking]
+        self.assertEqual(robust, sorted(robust, reverse=True))
+        self.assertEqual(set(ranking[0]['scores']), {'host0.csv', 'host1.csv'})
+
+        params = ParameterOptimizer(config_file=output).params
+        for name, value in ranking[0]['params'].items():
+            self.assertEqual(params[name], value)
+        self.assertNotIn('tuning', params)
+
+        self.assertEqual(report, os.path.join(self.tmp.name, 'nerdy_params.tuning.json'))
+        with open(report, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['ranking'][0]['rank'], 1)
+
+
+@unittest.skipIf(np is None, "需要numpy")
+class TestShadowPool(unittest.TestCase):
+    """测试影子控制器"""
+
+    def setUp(self):
+        """初始化"""
+        self.trace = SimulatedHost(VirtualClock(), seed=5, burst_rate=1 / 600).trace(3600, 2.0)
+
+    def _holder(self, shadows, **options):
+        holder, clock = trace_holder(self.trace, {})
+        holder.shadows = ShadowPool(holder, shadows, **options)
+        return holder, clock
+
+    def _run(self, holder, clock, steps):
+        with contextlib.redirect_stdout(io.StringIO()):
+            holder.initialize()
+            for _ in range(steps):
+                clock.sleep(2.0)
+                holder.adjust_target()
+                holder.make_decision()
+
+    def test_candidates_within_limits(self):
+        """测试第0组为现参数，其余在参数范围内"""
+        holder, _ = self._holder(8)
+        candidates = holder.shadows.candidates()
+
+        self.assertEqual(len(candidates), 8)
+        for name, value in candidates[0].items():
+            self.assertEqual(value, holder.optimizer.params[name])
+        for candidate in candidates[1:]:
+            for name, (low, high) in ParameterOptimizer.PARAM_LIMITS.items():
+                self.assertTrue(low <= candidate[name] <= high)
+
+    def test_learn_gain(self):
+        """测试对象增益学习并丢弃异常样本"""
+        holder, _ = self._holder(4)
+        pool = holder.shadows
+        nominal = pool.nominal_gain
+
+        pool.learn(50, 10.0)
+        pool.learn(1000, 1000 * nominal * 100)
+        self.assertEqual(pool.stats['gain_samples'], 0)
+        self.assertAlmostEqual(pool.gain, nominal)
+
+        for _ in range(50):
+            pool.learn(-1000, -1000 * nominal * 1.5)
+        self.assertEqual(pool.stats['gain_samples'], 50)
+        self.assertAlmostEqual(pool.get_status()['gain_ratio'], 1.5, delta=0.05)
+
+    def test_shadow_tracks_live(self):
+        """测试零扰动的影子与线上控制器一致，且影子不改变持有量"""
+        holder, clock = self._holder(2, radius=0, window=math.inf)
+        self._run(holder, clock, 600)
+
+        pipeline = holder.shadows.pipeline
+        self.assertGreater(holder.stats['adjustments'], 5)
+        for row in range(2):
+            self.assertEqual(pipeline.adjustments[row], holder.stats['adjustments'])
+            self.assertAlmostEqual(pipeline.holding[row], holder.get_holding_mb(), delta=1)
+
+    def test_dynamic_target(self):
+        """测试目标变化时影子同步换目标，一轮不因此重新开始"""
+        holder, clock = self._holder(2, radius=0, window=math.inf)
+        holder.test_mode = False
+        holder.min_target, holder.max_target = 55, 65
+        holder.next_variation = clock.time()
+        with patch.object(holder, 'emit') as emit:
+            self._run(holder, clock, 1500)
+
+        targets = [c.kwargs['target'] for c in emit.call_args_list if c.args[0] == 'target']
+        pipeline = holder.shadows.pipeline
+        self.assertGreater(len(targets), 5)
+        self.assertEqual(holder.shadows.stats['rounds'], 1)
+        self.assertEqual(pipeline.target, holder.current_target)
+        for row in range(2):
+            self.assertEqual(pipeline.adjustments[row], holder.stats['adjustments'])
+            self.assertAlmostEqual(pipeline.holding[row], holder.get_holding_mb(), delta=1)
+
+    def test_promotion(self):
+        """测试得分优势超过margin时提升，否则不提升"""
+        holder, clock = self._holder(4, window=60)
+        self._run(holder, clock, 40)
+        pool = holder.shadows
+        now = clock.time()
+        best = dict(holder.optimizer.params, response_base=0.123)
+
+        def results(scores):
+            return lambda records: [{'score': score, 'params': best} for score in scores]
+
+        pool.pipeline.results = results([70.0, 71.0, 72.0, 72.9])
+        self.assertIsNone(pool.maybe_promote(now))
+        self.assertIsNone(pool.pipeline)
+
+        pool.observe(holder.memory_history[-1][1])
+        pool.pipeline.records = 40
+        pool.started -= 60
+        pool.pipeline.results = results([70.0, 71.0, 75.0, 72.0])
+        promotion = pool.maybe_promote(now)
+        self.assertEqual(promotion['baseline'], 70.0)
+        self.assertEqual(promotion['score'], 75.0)
+        self.assertEqual(promotion['params']['response_base'], 0.123)
+        self.assertEqual(set(promotion['params']), set(ParameterOptimizer.PARAM_LIMITS))
+
+    def test_simulation_shadows(self):
+        """测试模拟中影子模式运行并报告状态"""
+        simulation = Simulation(seed=0, fixed_target=60, shadows=8)
+        result = simulation.run(2 * 3600)
+        simulation.close()
+
+        shadows = result['shadows']
+        self.assertEqual(shadows['count'], 8)
+        self.assertGreaterEqual(shadows['rounds'], 4)
+        self.assertGreater(shadows['ticks'], 100)
+        self.assertLess(result['mean_abs_error'], 2)
+
+    def test_simulation_dynamic_range(self):
+        """测试动态范围下每轮仍满 window（目标每3~6分钟变化）"""
+        simulation = Simulation(seed=1, dynamic_range=(55, 65), shadows=8)
+        result = simulation.run(2 * 3600)
+        simulation.close()
+
+        self.assertIn(result['shadows']['rounds'], (4, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+"""测试共享内存状态块"""
+
+import os
+import time
+import struct
+import tempfile
+import threading
+import unittest
+from nerdy_holder.core import NerdyHolderPro
+from nerdy_holder.status import StatusWriter, StatusReader
+from nerdy_holder.status.block import SEQ_OFFSET
+
+
+class TestStatusBlock(unittest.TestCase):
+    """测试状态块读写"""
+
+    def setUp(self):
+        """初始化"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'status')
+
+    def tearDown(self):
+        """清理"""
+        self.tmp.cleanup()
+
+    def _status(self, n):
+        return {
+            'timestamp': time.time(),
+            'current_target': float(n),
+            'holding_mb': n,
+            'backend': 'mmap',
+            'stats': {'decisions': n, 'adjustments': n},
+            'scheduler': {'idle': True},
+            'performance': {'score': float(n)}
+        }
+
+    def test_round_trip(self):
+        """测试写入后读回同结构字典"""
+        writer = StatusWriter(self.path)
+        reader = StatusReader(self.path)
+        self.assertIsNone(reader.read())  # 尚未写入
+
+        writer.write(self._status(42))
+        status = reader.read()
+
+        self.assertEqual(status['holding_mb'], 42)
+        self.assertEqual(status['backend'], 'mmap')
+        self.assertEqual(status['stats']['decisions'], 42)
+        self.assertTrue(status['scheduler']['idle'])
+        # 缺失字段为0
+        self.assertEqual(status['watchdog']['breaches'], 0)
+        reader.close()
+        writer.close()
+
+    def test_missing_block(self):
+        """测试状态块不存在"""
+        reader = StatusReader(os.path.join(self.tmp.name, 'missing'))
+        self.assertIsNone(reader.read())
+
+    def test_write_in_progress(self):
+        """测试写入中（seq为奇数）读者不返回半写快照"""
+        writer = StatusWriter(self.path)
+        writer.write(self._status(1))
+        struct.pack_into('<Q', writer.mm, SEQ_OFFSET, writer.seq + 1)
+
+        reader = StatusReader(self.path)
+        self.assertIsNone(reader.read_values(max_retries=10))
+        self.assertEqual(reader.retries, 10)
+        reader.close()
+        writer.close()
+
+    def test_concurrent_snapshots_consistent(self):
+        """测试并发写入时每次读到的快照各字段一致"""
+        writer = StatusWriter(self.path)
+        writer.write(self._status(0))
+        stop = threading.Event()
+
+        def write():
+            n = 0
+            while not stop.is_set():
+                n += 1
+                writer.write(self._status(n))
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        reader = StatusReader(self.path)
+        reads = 0
+        try:
+            deadline = time.monotonic() + 0.3
+            while time.monotonic() < deadline:
+                status = reader.read()
+                if status is None:
+                    continue
+                n = status['holding_mb']
+                self.assertEqual(status['stats']['decisions'], n)
+                self.assertEqual(status['performance']['score'], n)
+                reads += 1
+        finally:
+            stop.set()
+            thread.join()
+        self.assertGreater(reads, 100)
+        reader.close()
+        writer.close()
+
+    def test_reattach_after_restart(self):
+        """测试写者重启重建状态块后读者重新映射"""
+        writer = StatusWriter(self.path)
+        old = self._status(1)
+        old['timestamp'] = time.time() - 10
+        writer.write(old)
+        reader = StatusReader(self.path)
+        self.assertEqual(reader.read()['holding_mb'], 1)
+
+        writer.close()
+        writer = StatusWriter(self.path)
+        writer.write(self._status(2))
+
+        self.assertEqual(reader.read()['holding_mb'], 2)
+        reader.close()
+        writer.close()
+
+    def test_holder_export(self):
+        """测试holder导出状态块，JSON默认关闭"""
+        holder = NerdyHolderPro(enable_benchmark=True, fixed_target=30, waker='',
+                                status_block=self.path)
+        holder.status_file = os.path.join(self.tmp.name, 'status.json')
+        holder.export_status()
+
+        status = StatusReader(self.path).read()
+        self.assertEqual(status['current_target'], 30)
+        self.assertEqual(status['sensor']['name'], 'used')
+        self.assertFalse(os.path.exists(holder.status_file))
+
+        holder.status_json = True
+        holder.export_status()
+        self.assertTrue(os.path.exists(holder.status_file))
+        holder.status_writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
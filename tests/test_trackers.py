@@ -1,8 +1,10 @@
 """测试追踪器模块"""
 
+import os
 import unittest
+import tempfile
 import time
-from nerdy_holder.trackers import PerformanceTracker
+from nerdy_holder.trackers import PerformanceTracker, MemoryTrace, TraceRecorder
 
 
 class TestPerformanceTracker(unittest.TestCase):
@@ -75,6 +77,70 @@ class TestPerformanceTracker(unittest.TestCase):
         self.assertGreaterEqual(stats['block_rate'], 0)
         self.assertLessEqual(stats['block_rate'], 1)
 
+    def test_release_overshoot(self):
+        """测试释放超出量"""
+        for i in range(10):
+            self.tracker.record(error=2.0, adjustment_size=1000, was_blocked=False)
+        self.tracker.record_release(requested_mb=400, released_mb=450)
+        self.tracker.record_release(requested_mb=400, released_mb=390)
+
+        stats = self.tracker.get_stats()
+
+        self.assertAlmostEqual(stats['release_overshoot'], 30)
+
+
+class TestMemoryTrace(unittest.TestCase):
+    """测试内存轨迹"""
+
+    def setUp(self):
+        """初始化"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'trace.csv')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_load_at(self):
+        """测试插值与端点"""
+        trace = MemoryTrace([100, 110, 120], [40, 60, 50], total_mb=1024)
+
+        self.assertEqual(trace.duration, 20)
+        self.assertEqual(trace.load_at(-5), 40)
+        self.assertEqual(trace.load_at(5), 50)
+        self.assertEqual(trace.load_at(15), 55)
+        self.assertEqual(trace.load_at(30), 50)
+        self.assertEqual(trace.resample(10), [40, 60, 50])
+
+    def test_recorder_subtracts_holding(self):
+        """测试读回时扣除持有量"""
+        with TraceRecorder(self.path, 1024) as recorder:
+            recorder.record(100.0, 75.0, 256)
+            recorder.record(102.0, 50.0, 0)
+
+        trace = MemoryTrace.load_file(self.path)
+
+        self.assertEqual(trace.total_mb, 1024)
+        self.assertEqual(trace.times, [100.0, 102.0])
+        self.assertEqual(trace.load, [50.0, 50.0])
+
+    def test_save_roundtrip(self):
+        """测试保存后读回一致"""
+        trace = MemoryTrace([0.0, 1.0, 2.0], [10.5, 20.25, 30.0], total_mb=2048)
+        trace.save(self.path)
+
+        loaded = MemoryTrace.load_file(self.path)
+
+        self.assertEqual(loaded.times, trace.times)
+        self.assertEqual(loaded.load, trace.load)
+
+    def test_missing_total(self):
+        """测试缺少内存总量时报错"""
+        with open(self.path, 'w') as f:
+            f.write('time,used_percent,holding_mb\n0.000,50.0,0.0\n')
+
+        with self.assertRaises(ValueError):
+            MemoryTrace.load_file(self.path)
+
 
 if __name__ == '__main__':
     unittest.main()
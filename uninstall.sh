@@ -26,6 +26,9 @@ echo -e "${G}Uninstalling...${NC}"
 systemctl stop nerdy-holder.service 2>/dev/null || true
 systemctl disable nerdy-holder.service 2>/dev/null || true
 
+# Remove persistent shm segments
+python3 /opt/nerdy-holder/run_holder.py --cleanup-segments 2>/dev/null || true
+
 # Remove files
 rm -f /etc/systemd/system/nerdy-holder.service
 systemctl daemon-reload